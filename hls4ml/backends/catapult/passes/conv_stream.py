@@ -38,8 +38,8 @@ class GenerateConvStreamingInstructions(OptimizerPass):
             node.get_input_variable().shape[0],
             node.get_input_variable().shape[1],
             node.get_input_variable().shape[2],
-            node.get_attr('filt_height'),
-            node.get_attr('stride_height'),
+            (node.get_attr('filt_height'), node.get_attr('filt_width')),
+            (node.get_attr('stride_height'), node.get_attr('stride_width')),
         )
         instructions_str = ','.join(str(i) for i in instructions)
         node.set_attr('min_height', min_h)
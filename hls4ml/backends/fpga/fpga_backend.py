@@ -3,6 +3,7 @@ import re
 import subprocess
 from bisect import bisect_left
 from collections.abc import Iterable
+from functools import lru_cache
 
 import numpy as np
 
@@ -251,13 +252,7 @@ class FPGABackend(Backend):
         raise Exception(f'Cannot get mult size for layer {layer.name} ({layer.class_name})')
 
     def get_valid_reuse_factors(self, n_in, n_out):
-        max_rf = n_in * n_out
-        valid_reuse_factors = []
-        for rf in range(1, max_rf + 1):
-            _assert = self._validate_reuse_factor(n_in, n_out, rf)
-            if _assert:
-                valid_reuse_factors.append(rf)
-        return valid_reuse_factors
+        return list(_valid_reuse_factors(int(n_in), int(n_out)))
 
     def _validate_reuse_factor(self, n_in, n_out, rf):
         multfactor = min(n_in, rf)
@@ -521,36 +516,9 @@ class FPGABackend(Backend):
         # Current limitations
         assert pad == 0
 
-        if kernel_size >= stride:
-            min_W = (math.ceil(kernel_size / stride) - 1) * stride + kernel_size
-        else:
-            min_W = (math.ceil(stride / kernel_size) - 1) * stride + kernel_size
-
-        # if the standard min_W is smaller than the in_W, then use unscaled
-        if min_W > in_W:
-            min_W = in_W
-
-        min_oW = int((min_W - kernel_size) // stride + 1)
-
-        out_W = int((in_W - kernel_size) // stride + 1)
-        scaled_W = (out_W - 1) * stride + kernel_size
-
-        if scaled_W < in_W:
-            min_W += 1
-
-        windows_bin = [[0 for _ in range(kernel_size)] for _ in range(min_W)]
-
-        for i_ow in range(min_oW):
-            for i_fw in range(kernel_size):
-                index_data = i_ow * stride + i_fw - pad
-                windows_bin[index_data][i_fw] = 1
+        (min_W,), windows_int = _conv_instructions((int(in_W),), (int(kernel_size),), (int(stride),))
 
-        windows_int = []
-
-        for i in range(min_W):
-            windows_int.append(int(''.join(str(p) for p in reversed(windows_bin[i])), 2))
-
-        return (min_W, windows_int)
+        return (min_W, list(windows_int))
 
     def compute_conv2d_instructions(self, in_H, in_W, in_C, kernel_size=3, stride=1, pad=0):
         if isinstance(kernel_size, Iterable):
@@ -568,209 +536,13 @@ class FPGABackend(Backend):
             stride_width = stride
 
         # Current limitations
-        assert kernel_height == kernel_width
-        assert stride_height == stride_width
         assert pad == 0
 
-        if kernel_height >= stride_height:
-            min_H = (math.ceil(kernel_height / stride_height) - 1) * stride_height + kernel_height
-        else:
-            min_H = (math.ceil(stride_height / kernel_height) - 1) * stride_height + kernel_height
-
-        if min_H > in_H:
-            min_H = in_H
-
-        if kernel_width >= stride_width:
-            min_W = (math.ceil(kernel_width / stride_width) - 1) * stride_width + kernel_width
-        else:
-            min_W = (math.ceil(stride_width / kernel_width) - 1) * stride_width + kernel_width
-
-        if min_W > in_W:
-            min_W = in_W
-
-        min_oH = int((min_H - kernel_height) // stride_height + 1)
-        min_oW = int((min_W - kernel_width) // stride_width + 1)
-
-        out_H = int((in_H - kernel_height) // stride_height + 1)
-        out_W = int((in_W - kernel_width) // stride_width + 1)
-        scaled_H = (out_H - 1) * stride_height + kernel_height
-        scaled_W = (out_W - 1) * stride_width + kernel_width
-
-        if scaled_H < in_H:
-            min_H += 1
-        if scaled_W < in_W:
-            min_W += 1
-
-        # Let's hardcode a few common cases:
-        if (
-            min_H == 1
-            and min_W == 1
-            and kernel_height == 1
-            and kernel_width == 1
-            and stride == 1
-            and scaled_H == in_H
-            and scaled_W == in_W
-        ):
-            return (1, 1, map(str, [1]))
-        if (
-            min_H == 5
-            and min_W == 5
-            and kernel_height == 3
-            and kernel_width == 3
-            and stride == 1
-            and scaled_H == in_H
-            and scaled_W == in_W
-        ):
-            return (
-                5,
-                5,
-                map(
-                    str,
-                    [
-                        1,
-                        3,
-                        7,
-                        6,
-                        4,
-                        9,
-                        27,
-                        63,
-                        54,
-                        36,
-                        73,
-                        219,
-                        511,
-                        438,
-                        292,
-                        72,
-                        216,
-                        504,
-                        432,
-                        288,
-                        64,
-                        192,
-                        448,
-                        384,
-                        256,
-                    ],
-                ),
-            )
-        if (
-            min_H == 9
-            and min_W == 9
-            and kernel_height == 5
-            and kernel_width == 5
-            and stride == 1
-            and scaled_H == in_H
-            and scaled_W == in_W
-        ):
-            return (
-                9,
-                9,
-                map(
-                    str,
-                    [
-                        1,
-                        3,
-                        7,
-                        15,
-                        31,
-                        30,
-                        28,
-                        24,
-                        16,
-                        33,
-                        99,
-                        231,
-                        495,
-                        1023,
-                        990,
-                        924,
-                        792,
-                        528,
-                        1057,
-                        3171,
-                        7399,
-                        15855,
-                        32767,
-                        31710,
-                        29596,
-                        25368,
-                        16912,
-                        33825,
-                        101475,
-                        236775,
-                        507375,
-                        1048575,
-                        1014750,
-                        947100,
-                        811800,
-                        541200,
-                        1082401,
-                        3247203,
-                        7576807,
-                        16236015,
-                        33554431,
-                        32472030,
-                        30307228,
-                        25977624,
-                        17318416,
-                        1082400,
-                        3247200,
-                        7576800,
-                        16236000,
-                        33554400,
-                        32472000,
-                        30307200,
-                        25977600,
-                        17318400,
-                        1082368,
-                        3247104,
-                        7576576,
-                        16235520,
-                        33553408,
-                        32471040,
-                        30306304,
-                        25976832,
-                        17317888,
-                        1081344,
-                        3244032,
-                        7569408,
-                        16220160,
-                        33521664,
-                        32440320,
-                        30277632,
-                        25952256,
-                        17301504,
-                        1048576,
-                        3145728,
-                        7340032,
-                        15728640,
-                        32505856,
-                        31457280,
-                        29360128,
-                        25165824,
-                        16777216,
-                    ],
-                ),
-            )
-
-        windows_bin = [[0 for _ in range(kernel_height * kernel_width)] for _ in range(min_H * min_W)]
-
-        for i_oh in range(min_oH):
-            for i_ow in range(min_oW):
-                for i_fh in range(kernel_height):
-                    for i_fw in range(kernel_width):
-                        index_data = (i_oh * stride_height + i_fh - pad) * min_W + (i_ow * stride_width + i_fw - pad)
-                        windows_bin[index_data][i_fh * kernel_width + i_fw] = 1
-
-        windows_int = []
-
-        for i in range(min_H):
-            for j in range(min_W):
-                windows_int.append(int(''.join(str(p) for p in reversed(windows_bin[i * min_W + j])), 2))
+        (min_H, min_W), windows_int = _conv_instructions(
+            (int(in_H), int(in_W)), (int(kernel_height), int(kernel_width)), (int(stride_height), int(stride_width))
+        )
 
-        return (min_H, min_W, windows_int)
+        return (min_H, min_W, list(windows_int))
 
     def _compute_conv1d_im2col(self, input_shape, kernel=3, stride=1, pad=(0, 0), dilation=1):
         W, C = input_shape
@@ -991,3 +763,52 @@ class FPGABackend(Backend):
     def write_hls(self, model):
         self.writer.write_hls(model)
         return True
+
+
+@lru_cache(maxsize=None)
+def _valid_reuse_factors(n_in, n_out):
+    """Valid reuse factors of a layer with n_in x n_out multiplications, see ``FPGABackend._validate_reuse_factor``."""
+    n_mult = n_in * n_out
+    # Only the divisors of the number of multiplications are valid, found in O(sqrt(n_mult))
+    divisors = np.arange(1, math.isqrt(n_mult) + 1, dtype=np.int64)
+    divisors = divisors[n_mult % divisors == 0]
+    rf = np.unique(np.concatenate([divisors, n_mult // divisors]))
+    multiplier_limit = -(-n_mult // np.minimum(n_in, rf))
+    valid = ((multiplier_limit % n_out == 0) | (rf >= n_in)) & ((rf % n_in == 0) | (rf < n_in))
+    return tuple(int(r) for r in rf[valid])
+
+
+def _scaled_window(in_size, kernel, stride):
+    """Smallest input size (along one dimension) that behaves like the original one in the encoded convolution."""
+    if kernel >= stride:
+        min_size = (math.ceil(kernel / stride) - 1) * stride + kernel
+    else:
+        min_size = (math.ceil(stride / kernel) - 1) * stride + kernel
+
+    # if the standard min_size is smaller than the in_size, then use unscaled
+    min_size = min(min_size, in_size)
+    min_out = (min_size - kernel) // stride + 1
+
+    out_size = (in_size - kernel) // stride + 1
+    scaled_size = (out_size - 1) * stride + kernel
+    if scaled_size < in_size:
+        min_size += 1
+
+    return min_size, min_out
+
+
+@lru_cache(maxsize=None)
+def _conv_instructions(in_shape, kernel, stride):
+    """Instructions of the encoded convolution: for each pixel of the scaled input, a bitmask whose bit
+    ``i_fh * kernel_width + i_fw`` is set if the pixel is at that position of one of the convolution windows.
+    """
+    min_shape, min_out = zip(*(_scaled_window(*dims) for dims in zip(in_shape, kernel, stride)))
+    n_dims = len(in_shape)
+
+    grids = np.meshgrid(*[np.arange(n) for n in min_out], *[np.arange(k) for k in kernel], indexing='ij')
+    outputs, filters = grids[:n_dims], grids[n_dims:]
+    windows = np.zeros(min_shape + kernel, dtype=bool)
+    windows[tuple(o * s + f for o, s, f in zip(outputs, stride, filters)) + tuple(filters)] = True
+
+    packed = np.packbits(windows.reshape(math.prod(min_shape), -1), axis=1, bitorder='little')
+    return min_shape, tuple(int.from_bytes(row.tobytes(), 'little') for row in packed)
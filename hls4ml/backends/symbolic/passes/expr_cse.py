@@ -0,0 +1,22 @@
+from hls4ml.model.layers import SymbolicExpression
+from hls4ml.model.optimizer import OptimizerPass
+from hls4ml.utils.symbolic_utils import eliminate_common_subexpressions
+
+
+class EliminateCommonSubexpressions(OptimizerPass):
+    """Hoists the subexpressions shared by the outputs of a SymbolicExpression layer into intermediate variables, so they
+    are computed once. Disabled by the ``eliminate_subexpressions`` attribute of the layer."""
+
+    def match(self, node):
+        return (
+            isinstance(node, SymbolicExpression)
+            and node.get_attr('eliminate_subexpressions', True)
+            and node.get_attr('cse_definitions') is None
+        )
+
+    def transform(self, model, node):
+        definitions, expressions = eliminate_common_subexpressions(node.get_attr('expression'))
+        node.set_attr('cse_definitions', [(str(symbol), str(expr)) for symbol, expr in definitions])
+        node.set_attr('expression', [str(expr) for expr in expressions])
+
+        return False
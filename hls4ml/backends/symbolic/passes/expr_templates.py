@@ -146,6 +146,10 @@ class ExpressionFunctionTemplate(FunctionCallTemplate):
         printer = get_printer()(node, lut_functions=lut_functions, use_built_in_luts=node.attributes['use_built_in_luts'])
 
         fn_templates = []
+        # With auto, the intermediate variables keep the full precision of the subexpressions, as when they are inlined
+        expr_type = 'auto' if node.get_attr('full_precision_subexpressions', True) else node.types['expr_t'].name
+        for name, expr in node.get_attr('cse_definitions', []):
+            fn_templates.append(f'{expr_type} {name} = {printer.doprint(expr)};')
         for i, expr in enumerate(node.attributes['expression']):
             params['expr_str'] = printer.doprint(expr)
             params['y_index'] = str(i)
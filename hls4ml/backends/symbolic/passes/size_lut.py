@@ -0,0 +1,52 @@
+from hls4ml.model.layers import SymbolicExpression
+from hls4ml.model.optimizer import ConfigurableOptimizerPass
+from hls4ml.utils.symbolic_utils import size_lut_function
+
+
+class SizeUserLookupTable(ConfigurableOptimizerPass):
+    """Picks the smallest power-of-two size and range of user-defined LUTs meeting a maximum absolute error under the
+    output precision, and reports the memory used by the LUTs.
+
+    The error bound is given per LUT function (``max_error``), or for all of them with ``configure(max_error=...)``.
+    """
+
+    def __init__(self):
+        self.max_error = None
+
+    def match(self, node):
+        return (
+            isinstance(node, SymbolicExpression)
+            and len(node.get_attr('lut_functions', [])) > 0
+            and node.get_attr('lut_memory') is None
+        )
+
+    def transform(self, model, node):
+        precision = node.get_output_variable().type.precision
+
+        lut_functions = []
+        sized = False
+        for lut_fn in node.get_attr('lut_functions'):
+            max_error = lut_fn.max_error if lut_fn.max_error is not None else self.max_error
+            if max_error is not None:
+                sized = True
+                sized_fn, error = size_lut_function(lut_fn, precision, max_error)
+                if sized_fn is None:
+                    print(
+                        f'WARNING: No LUT for function {lut_fn.name} is within the maximum error {max_error} '
+                        f'(smallest error {error:.3g}), using the given table.'
+                    )
+                else:
+                    print(
+                        f'LUT function {lut_fn.name}: {sized_fn.table_size} entries in '
+                        f'[{sized_fn.range_start}, {sized_fn.range_end}), maximum error {error:.3g}.'
+                    )
+                    lut_fn = sized_fn
+            lut_functions.append(lut_fn)
+
+        node.set_attr('lut_functions', lut_functions)
+        lut_memory = sum(lut_fn.table_size for lut_fn in lut_functions) * precision.width
+        node.set_attr('lut_memory', lut_memory)
+        if sized:
+            print(f'LUT memory of {node.name}: {lut_memory} bits.')
+
+        return False
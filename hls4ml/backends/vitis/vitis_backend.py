@@ -6,6 +6,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
+
 from hls4ml.backends import VivadoBackend
 from hls4ml.model.flow import get_flow, register_flow
 from hls4ml.report import aggregate_graph_reports, parse_vivado_report
@@ -13,6 +15,7 @@ from hls4ml.utils.simulation_utils import (
     annotate_axis_stream_widths,
     prepare_tb_inputs,
     read_testbench_log,
+    write_tb_inputs,
     write_verilog_testbench,
 )
 
@@ -205,9 +208,10 @@ class VitisBackend(VivadoBackend):
             json.dump(nn_config, file, indent=4)
 
         if sim_stitched_design:
-            write_verilog_testbench(nn_config, testbench_path)
             tb_inputs = prepare_tb_inputs(simulation_input_data, nn_config['inputs'])
-            model.write_tb_inputs(tb_inputs, stitched_design_dir)
+            n_samples = len(tb_inputs if isinstance(tb_inputs, np.ndarray) else tb_inputs[0])
+            write_verilog_testbench(nn_config, testbench_path, n_samples=n_samples)
+            write_tb_inputs(tb_inputs, nn_config['inputs'], stitched_design_dir)
             print('Verilog testbench and its input data were generated.')
 
         print('Running build process of stitched IP...\n')
@@ -242,7 +246,7 @@ class VitisBackend(VivadoBackend):
             stitched_report = aggregate_graph_reports(graph_reports)
 
         if sim_stitched_design:
-            testbench_output = read_testbench_log(testbench_log_path, nn_config['outputs'])
+            testbench_output = read_testbench_log(testbench_log_path, nn_config['outputs'], n_samples=n_samples)
             stitched_report['BehavSimResults'] = testbench_output['BehavSimResults']
             stitched_report['StitchedDesignReport']['BestLatency'] = testbench_output['BestLatency']
             stitched_report['StitchedDesignReport']['WorstLatency'] = testbench_output['WorstLatency']
@@ -7,7 +7,7 @@ import numpy as np
 
 from hls4ml.model.layers import Conv1D, Conv2D, DACombinational, Dense, EinsumDense, Layer
 from hls4ml.model.optimizer import OptimizerPass
-from hls4ml.model.optimizer.passes.bit_exact import get_input_layers, get_output_layers, im2col, pad_arrs, stride_arrs
+from hls4ml.model.optimizer.passes.bit_exact import get_input_layers, get_output_layers, get_strides, im2col, pad_arrs
 from hls4ml.model.optimizer.passes.hgq_proxy_model import FixedPointQuantizer
 from hls4ml.model.types import FixedPrecisionType, Source
 from hls4ml.utils.dependency import requires
@@ -68,8 +68,7 @@ def _(layer: Conv1D | Conv2D):
     kernel = layer.attributes['weight'].data
     k_in, i_in, f_in = _get_input_kif(layer)
     k_in, i_in, f_in = pad_arrs(layer, 0, k_in, i_in, f_in)
-    k_in, i_in, f_in = im2col(kernel.shape, k_in, i_in, f_in)
-    k_in, i_in, f_in = stride_arrs(layer, k_in, i_in, f_in)
+    k_in, i_in, f_in = im2col(kernel.shape, k_in, i_in, f_in, strides=get_strides(layer))
     n_ker_in: int = k_in.shape[-1]
     return (
         k_in.reshape(-1, n_ker_in).max(axis=0),
@@ -0,0 +1,166 @@
+import math
+
+import numpy as np
+
+from hls4ml.model.layers import Conv1D, Conv2D, Dense
+from hls4ml.model.optimizer import ConfigurableOptimizerPass, ModelOptimizerPass
+from hls4ml.report.resource_estimator import ResourceEstimator
+
+_budget_keys = ('DSP', 'LUT', 'FF', 'BRAM_18K')
+
+
+class ReuseFactorSearch(ConfigurableOptimizerPass, ModelOptimizerPass):
+    """Chooses the reuse factors of all Dense and Conv layers at once, to minimize the initiation interval (or the
+    latency) of the model under a resource budget.
+
+    The cost of every valid reuse factor of each layer is predicted with a ``ResourceEstimator``. With the 'II' objective,
+    the smallest II for which the cheapest choices fit the budget is found first, and the latency is then minimized for
+    that II. Minimizing the latency under the budget is a multiple-choice knapsack problem, solved by dynamic programming
+    over the budget (normalized to the most used resource of each choice, and discretized in ``resolution`` steps).
+
+    The search is enabled by a 'ReuseFactorSearch' entry in the 'Model' section of the HLS configuration, e.g.,
+    ``{'Budget': {'DSP': 1000}, 'Objective': 'II'}``, or by configuring the pass with the ``budget``, ``objective``,
+    ``resolution`` and ``estimator`` (a calibrated ``ResourceEstimator``) attributes.
+    """
+
+    def __init__(self):
+        self.budget = None
+        self.objective = 'II'
+        self.resolution = 1000
+        self.estimator = None
+
+    def _get_settings(self, model):
+        search_config = model.config.reuse_factor_search or {}
+        budget = search_config.get('Budget', self.budget)
+        objective = str(search_config.get('Objective', self.objective)).lower()
+        resolution = int(search_config.get('Resolution', self.resolution))
+        if budget is not None:
+            unknown = set(budget) - set(_budget_keys)
+            if unknown:
+                raise ValueError(f'Unsupported resources in the reuse factor search budget: {unknown}')
+        if objective not in ('ii', 'latency'):
+            raise ValueError(f'Unsupported reuse factor search objective "{objective}", valid values: II, Latency.')
+        return budget, objective, resolution
+
+    def _is_searchable(self, layer):
+        return isinstance(layer, (Dense, Conv1D, Conv2D)) and layer.get_attr('strategy', '').lower() in (
+            'latency',
+            'resource',
+        )
+
+    def _get_options(self, model, layer, estimator):
+        n_in, n_out = model.config.backend.get_layer_mult_size(layer)
+        reuse_factor = layer.get_attr('reuse_factor')
+        options = []
+        for rf in model.config.backend.get_valid_reuse_factors(n_in, n_out):
+            layer.set_attr('reuse_factor', rf)
+            options.append((rf, estimator.estimate_layer(layer)))
+        layer.set_attr('reuse_factor', reuse_factor)
+        return options
+
+    def transform(self, model):
+        budget, objective, resolution = self._get_settings(model)
+        if budget is None:
+            return False
+
+        estimator = self.estimator if self.estimator is not None else ResourceEstimator()
+        stream = model.config.get_config_value('IOType') == 'io_stream'
+
+        layers = []
+        options = []
+        remaining = dict(budget)
+        fixed_interval = 0
+        for layer in model.get_layers():
+            if self._is_searchable(layer):
+                layers.append(layer)
+                options.append(self._get_options(model, layer, estimator))
+            else:
+                estimate = estimator.estimate_layer(layer)
+                for key in remaining:
+                    remaining[key] -= estimate[key]
+                fixed_interval = max(fixed_interval, estimate['II'])
+        if len(layers) == 0:
+            return False
+
+        # Cost of each choice as the fraction of the most used resource of the remaining budget, in resolution steps
+        costs = [
+            np.array(
+                [
+                    max(math.ceil(resolution * estimate[key] / max(remaining[key], 1e-9)) for key in remaining)
+                    for _, estimate in layer_options
+                ]
+            )
+            for layer_options in options
+        ]
+        intervals = [np.array([estimate['II'] for _, estimate in layer_options]) for layer_options in options]
+        latencies = [
+            np.array([estimate['Latency'] - (estimate['II'] if stream else 0) for _, estimate in layer_options])
+            for layer_options in options
+        ]
+
+        def min_cost(max_interval):
+            return sum(
+                cost[interval <= max_interval].min() if (interval <= max_interval).any() else np.inf
+                for cost, interval in zip(costs, intervals)
+            )
+
+        candidates = np.unique(np.concatenate(intervals))
+        feasible = [t for t in candidates if min_cost(t) <= resolution]
+        if min(remaining.values()) <= 0 or len(feasible) == 0:
+            print('WARNING: The reuse factor search found no configuration within the budget, using the cheapest one.')
+            choices = [int(np.argmin(cost)) for cost in costs]
+        elif objective == 'ii' or not stream:
+            if objective == 'ii':
+                # Layers faster than the slowest fixed layer don't reduce the II, so they may as well be slower
+                threshold = max(feasible[0], fixed_interval)
+                max_interval = max(t for t in feasible if t <= threshold)
+            else:
+                # The latency of io_parallel models doesn't depend on the intervals
+                max_interval = candidates[-1]
+            choices, _ = _min_latency_choices(costs, intervals, latencies, max_interval, resolution)
+        else:
+            # The latency of io_stream (dataflow) models is the sum of the pipeline depths plus the largest interval
+            best = None
+            for max_interval in feasible:
+                choices, depth = _min_latency_choices(costs, intervals, latencies, max_interval, resolution)
+                total = depth + max(max_interval, fixed_interval)
+                if best is None or total < best[0]:
+                    best = (total, choices)
+            choices = best[1]
+
+        changed = False
+        for layer, layer_options, choice in zip(layers, options, choices):
+            rf = layer_options[choice][0]
+            if rf != layer.get_attr('reuse_factor'):
+                layer.set_attr('reuse_factor', rf)
+                changed = True
+
+        return changed
+
+
+def _min_latency_choices(costs, intervals, latencies, max_interval, resolution):
+    # Multiple-choice knapsack: best[b] is the smallest total latency of the layers processed so far with cost b
+    best = np.full(resolution + 1, np.inf)
+    best[0] = 0
+    picks = []
+    for cost, interval, latency in zip(costs, intervals, latencies):
+        new_best = np.full(resolution + 1, np.inf)
+        pick = np.full(resolution + 1, -1)
+        for i in np.flatnonzero((interval <= max_interval) & (cost <= resolution)):
+            c = int(cost[i])
+            candidate = np.full(resolution + 1, np.inf)
+            candidate[c:] = best[: resolution + 1 - c] + latency[i]
+            better = candidate < new_best
+            new_best[better] = candidate[better]
+            pick[better] = i
+        best = new_best
+        picks.append(pick)
+
+    b = int(np.argmin(best))
+    total = best[b]
+    choices = []
+    for cost, pick in zip(reversed(costs), reversed(picks)):
+        i = int(pick[b])
+        choices.append(i)
+        b -= int(cost[i])
+    return choices[::-1], total
@@ -170,6 +170,7 @@ class VivadoBackend(FPGABackend):
             'vivado:skip_softmax',
             'vivado:fix_softmax_table_size',
             'infer_precision_types',
+            'vivado:reuse_factor_search',
             'vivado:distributed_arithmetic_codegen',
             'vivado:distributed_arithmetic_einsum_codegen',
             'vivado:fuse_quantizer_into_d_a_layers',
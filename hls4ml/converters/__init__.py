@@ -399,6 +399,8 @@ def convert_from_symbolic_expression(
     input_data_tb=None,
     output_data_tb=None,
     precision='ap_fixed<16,6>',
+    eliminate_subexpressions=True,
+    expr_precision=None,
     **kwargs,
 ):
     """Converts a given (SymPy or string) expression to hls4ml model.
@@ -418,13 +420,15 @@ def convert_from_symbolic_expression(
                         'table_size': <table_size>,
                         'range_start': <start>,
                         'range_end': <end>,
+                        'max_error': <max_error>,  # Optional
                     }
                 }
 
             where ``<func_name>`` is a given name that can be used with PySR, ``<func>`` is the math function to
             approximate (`sin`, `cos`, `log`,...), ``<table_size>`` is the size of the lookup table, and ``<start>`` and
             ``<end>`` are the ranges in which the function will be approximated. It is **strongly** recommended to use a
-            power-of-two as a range.
+            power-of-two as a range. If ``<max_error>`` is given, the table size is instead the smallest power of two
+            approximating the function within this absolute error, and the range is widened to a power of two.
         use_built_in_lut_functions (bool, optional): Use built-in sin/cos LUT functions. Defaults to False.
         output_dir (str, optional): Output directory of the generated HLS
             project. Defaults to 'my-hls-test'.
@@ -435,6 +439,11 @@ def convert_from_symbolic_expression(
         output_data_tb (str, optional): String representing the path of output data in .npy or .dat format that will be
             used during csim and cosim.
         precision (str, optional): Precision to use. Defaults to 'ap_fixed<16,6>'.
+        eliminate_subexpressions (bool, optional): Compute the subexpressions shared by the expressions (or repeated
+            within one) once, in intermediate variables. Defaults to True.
+        expr_precision (str, optional): Precision of the intermediate variables. If not provided, they keep the full
+            precision of the subexpressions, and the outputs are the same as without the elimination. Otherwise they are
+            rounded to this precision. Defaults to None.
         part (str, optional): The FPGA part. If set to `None` a default part of a backend will be used.
         clock_period (int, optional): Clock period of the design.
             Defaults to 5.
@@ -469,7 +478,14 @@ def convert_from_symbolic_expression(
     else:
         if isinstance(lut_functions, dict):
             lut_functions = [
-                LUTFunction(name, params['math_func'], params['range_start'], params['range_end'], params['table_size'])
+                LUTFunction(
+                    name,
+                    params['math_func'],
+                    params['range_start'],
+                    params['range_end'],
+                    params.get('table_size', 1024),
+                    params.get('max_error'),
+                )
                 for name, params in lut_functions.items()
             ]
 
@@ -488,6 +504,8 @@ def convert_from_symbolic_expression(
     expr_layer['n_symbols'] = n_symbols
     expr_layer['lut_functions'] = lut_functions
     expr_layer['use_built_in_luts'] = use_built_in_lut_functions
+    expr_layer['eliminate_subexpressions'] = eliminate_subexpressions
+    expr_layer['full_precision_subexpressions'] = expr_precision is None
     layer_list.append(expr_layer)
 
     config = create_config(output_dir=output_dir, project_name=project_name, backend='SymbolicExpression', **kwargs)
@@ -497,6 +515,8 @@ def convert_from_symbolic_expression(
     config['InputData'] = input_data_tb
     config['OutputPredictions'] = output_data_tb
 
+    if expr_precision is not None:
+        precision = {'default': precision, 'expr': expr_precision}
     config['HLSConfig'] = {'Model': {'Precision': precision, 'ReuseFactor': 1}}
 
     hls_model = ModelGraph.from_layer_list(config, layer_list)
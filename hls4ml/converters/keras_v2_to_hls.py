@@ -1,6 +1,9 @@
 import json
+import weakref
 
 import h5py
+import numpy as np
+from h5py import h5d, h5o, h5s
 
 from hls4ml.model import ModelGraph
 
@@ -10,73 +13,121 @@ class KerasReader:
         raise NotImplementedError
 
 
-class KerasFileReader(KerasReader):
-    def __init__(self, config):
-        self.config = config
-        self.h5file = h5py.File(config['KerasH5'], mode='r')
+class KerasH5Index:
+    """Index of the weights stored in a Keras h5 file, built with a single walk over the file.
 
-    def __del__(self):
-        if self.h5file:
-            self.h5file.close()
+    The weights of a layer are found by the path of its group in the file and the name of the variable (e.g., 'kernel' or
+    'forward_lstm/lstm_cell/bias'). A variable matches the datasets whose path ends with its name, ignoring the ':0'
+    suffix added by TF, so that 'kernel' doesn't match 'recurrent_kernel' or datasets in a group named 'kernel_model'.
+    If no dataset matches, the first dataset that contains the name is used.
 
-    def _find_data(self, layer_name, var_name):
-        def h5_visitor_func(name):
-            if var_name in name:
-                return name
+    Args:
+        path (str): Path to the h5 file.
+    """
 
-        if 'model_weights' in list(self.h5file.keys()):  # h5 file comes from model.save()
-            layer_path = f'model_weights/{layer_name}'
-        else:
-            layer_path = layer_name
+    def __init__(self, path):
+        self.h5file = h5py.File(path, mode='r')
+        # Closes the file when the index is no longer used by any reader (or at exit)
+        weakref.finalize(self, self.h5file.close)
+        self._datasets = {}
+        self._variables = {}
+
+        def h5_visitor_func(name, info):
+            if info.type == h5o.TYPE_DATASET:
+                parts = name.decode().split('/')
+                for i in range(1, len(parts)):
+                    self._datasets.setdefault('/'.join(parts[:i]), []).append('/'.join(parts[i:]))
+
+        # The low-level walk doesn't open the objects of the file, only their type is needed
+        h5o.visit(self.h5file.id, h5_visitor_func, info=True)
+
+    def __contains__(self, group_path):
+        return group_path.strip('/') in self._datasets
+
+    def find_path(self, group_path, var_name):
+        """Returns the path of the dataset of a variable in a group of the file, or ``None`` if there is no such variable.
+
+        Args:
+            group_path (str): Path of the group of the layer, e.g., 'model_weights/dense'.
+            var_name (str): Name of the variable.
+
+        Returns:
+            str: The path of the dataset of the variable.
+        """
+        group_path = group_path.strip('/')
+        variables = self._variables.get(group_path)
+        if variables is None:
+            # All the variables of a layer are resolved at once, the first time one of them is needed
+            variables = {}
+            for data_path in self._datasets.get(group_path, []):
+                parts = data_path.split('/')
+                parts[-1] = parts[-1].rsplit(':', 1)[0]
+                for i in range(len(parts)):
+                    variables.setdefault('/'.join(parts[i:]), data_path)
+            self._variables[group_path] = variables
+
+        data_path = variables.get(var_name)
+        if data_path is None:
+            data_path = next((x for x in self._datasets.get(group_path, []) if var_name in x), None)
+        if data_path is None:
+            return None
+        return f'{group_path}/{data_path}'
 
-        data_path = self.h5file[layer_path].visit(h5_visitor_func)
-        if data_path:
-            return self.h5file[f'/{layer_path}/{data_path}']
-        else:
+    def read(self, group_path, var_name):
+        """Reads the value of a variable in a group of the file, see ``find_path``.
+
+        Returns:
+            ndarray: The value of the variable, or ``None`` if there is no such variable.
+        """
+        data_path = self.find_path(group_path, var_name)
+        if data_path is None:
             return None
+        dataset = h5d.open(self.h5file.id, data_path.encode())
+        if dataset.shape == () or dataset.dtype.kind not in 'biuf':
+            return h5py.Dataset(dataset)[()]
+        # Reading the whole dataset with the low-level API skips the selection logic of h5py
+        data = np.empty(dataset.shape, dtype=dataset.dtype)
+        dataset.read(h5s.ALL, h5s.ALL, data)
+        return data
 
-    def get_weights_data(self, layer_name, var_name):
-        data = self._find_data(layer_name, var_name)
-        if data:
-            return data[()]
+
+class KerasFileReader(KerasReader):
+    def __init__(self, config, index=None):
+        self.config = config
+        # The index (and the open file) is shared by the readers of the nested models
+        self.index = index if index is not None else KerasH5Index(config['KerasH5'])
+        self.h5file = self.index.h5file
+
+    def _layer_path(self, layer_name):
+        if 'model_weights' in self.index:  # h5 file comes from model.save()
+            return f'model_weights/{layer_name}'
         else:
-            return None
+            return layer_name
+
+    def _find_data(self, layer_name, var_name):
+        data_path = self.index.find_path(self._layer_path(layer_name), var_name)
+        return self.h5file[data_path] if data_path is not None else None
+
+    def get_weights_data(self, layer_name, var_name):
+        return self.index.read(self._layer_path(layer_name), var_name)
 
 
 class KerasNestedFileReader(KerasFileReader):
     def __init__(self, data_reader, nested_path):
-        super().__init__(data_reader.config)
+        super().__init__(data_reader.config, index=data_reader.index)
         self.nested_path = nested_path
 
-    def _find_data(self, layer_name, var_name):
-        def h5_visitor_func(name):
-            if var_name in name:
-                return name
-
-        layer_path = f'model_weights/{self.nested_path}/{layer_name}'
-
-        data_path = self.h5file[layer_path].visit(h5_visitor_func)
-        if data_path:
-            return self.h5file[f'/{layer_path}/{data_path}']
-        else:
-            return None
+    def _layer_path(self, layer_name):
+        return f'model_weights/{self.nested_path}/{layer_name}'
 
 
 class KerasWrappedLayerFileReader(KerasFileReader):
     def __init__(self, data_reader, layer_path):
-        super().__init__(data_reader.config)
+        super().__init__(data_reader.config, index=data_reader.index)
         self.layer_path = f'model_weights/{layer_path}'
 
-    def _find_data(self, layer_name, var_name):
-        def h5_visitor_func(name):
-            if var_name in name:
-                return name
-
-        data_path = self.h5file[self.layer_path].visit(h5_visitor_func)
-        if data_path:
-            return self.h5file[f'/{self.layer_path}/{data_path}']
-        else:
-            return None
+    def _layer_path(self, layer_name):
+        return self.layer_path
 
 
 class KerasModelReader(KerasReader):
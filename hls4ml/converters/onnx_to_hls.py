@@ -1,3 +1,10 @@
+import math
+import mmap
+import os
+from functools import cached_property
+
+import numpy as np
+
 from hls4ml.model import ModelGraph
 from hls4ml.utils.dependency import requires
 
@@ -31,20 +38,136 @@ def get_onnx_attribute(operation, name, default=None):
     return value
 
 
+class OnnxGraphIndex:
+    """Read-only view of an ONNX graph with name lookups in constant time.
+
+    The value infos and initializers of the graph are indexed by name the first time they are needed, so the parsing of a
+    graph scales linearly with its size. All other attributes (e.g., ``node``) are forwarded to the wrapped graph, so the
+    index can be passed to the layer handlers in place of the graph.
+
+    Args:
+        graph: The ONNX graph (``onnx_model.graph``).
+        base_dir (str, optional): Directory of the model file, where the external data files of the tensors are looked
+            up. Defaults to the current directory.
+    """
+
+    def __init__(self, graph, base_dir=None):
+        self.graph = graph
+        self.base_dir = base_dir
+        self._mapped_files = {}
+
+    def __getattr__(self, name):
+        if name == 'graph':
+            raise AttributeError(name)
+        return getattr(self.graph, name)
+
+    @cached_property
+    def inputs(self):
+        """dict: The global inputs of the graph, by name."""
+        return _first_by_name(self.graph.input)
+
+    @cached_property
+    def value_info(self):
+        """dict: The value info of every tensor of the graph, by name.
+
+        The intermediate tensors take precedence over the outputs, and the outputs over the global inputs.
+        """
+        value_info = _first_by_name(self.graph.value_info)
+        for x in list(self.graph.output) + list(self.graph.input):
+            value_info.setdefault(x.name, x)
+        return value_info
+
+    @cached_property
+    def initializers(self):
+        """dict: The initializers of the graph, by name."""
+        return _first_by_name(self.graph.initializer)
+
+    @cached_property
+    def channels_last(self):
+        """bool: Whether the graph was converted to the channels-last data format by QONNX."""
+        return any(node.domain == 'qonnx.custom_op.channels_last' for node in self.graph.node)
+
+    def tensor_value(self, tensor):
+        """Returns the value of a tensor as a read-only array, without copying its data when possible.
+
+        Tensors stored in external data files (if the model was loaded with ``load_external_data=False``) are
+        memory-mapped and tensors stored as raw bytes are viewed in place, so the weights are only read from the disk
+        when they are used. Other tensors are converted with ``numpy_helper.to_array``.
+
+        Args:
+            tensor (TensorProto): The tensor, e.g., an initializer of the graph.
+
+        Returns:
+            ndarray: The value of the tensor.
+        """
+        from onnx import TensorProto, helper, numpy_helper
+
+        base_dir = self.base_dir if self.base_dir is not None else ''
+        viewable_types = {
+            TensorProto.FLOAT,
+            TensorProto.DOUBLE,
+            TensorProto.FLOAT16,
+            TensorProto.INT8,
+            TensorProto.INT16,
+            TensorProto.INT32,
+            TensorProto.INT64,
+            TensorProto.UINT8,
+            TensorProto.UINT16,
+            TensorProto.UINT32,
+            TensorProto.UINT64,
+            TensorProto.BOOL,
+        }
+        if tensor.data_type not in viewable_types:
+            return numpy_helper.to_array(tensor, base_dir=base_dir)
+
+        if tensor.data_location == TensorProto.EXTERNAL:
+            info = {entry.key: entry.value for entry in tensor.external_data}
+            buffer = self._map_file(os.path.join(base_dir, info['location']))
+            offset = int(info.get('offset', 0))
+        elif tensor.HasField('raw_data'):
+            buffer = tensor.raw_data
+            offset = 0
+        else:
+            return numpy_helper.to_array(tensor)
+
+        # The data of ONNX tensors is stored in little-endian byte order
+        dtype = np.dtype(helper.tensor_dtype_to_np_dtype(tensor.data_type)).newbyteorder('<')
+        shape = tuple(tensor.dims)
+        return np.frombuffer(buffer, dtype=dtype, count=math.prod(shape), offset=offset).reshape(shape)
+
+    def _map_file(self, path):
+        if path not in self._mapped_files:
+            with open(path, 'rb') as f:
+                self._mapped_files[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapped_files[path]
+
+
+def _first_by_name(values):
+    by_name = {}
+    for x in values:
+        by_name.setdefault(x.name, x)
+    return by_name
+
+
+def get_graph_index(graph):
+    """Returns an ``OnnxGraphIndex`` of the graph, or the graph itself if it is already indexed."""
+    return graph if isinstance(graph, OnnxGraphIndex) else OnnxGraphIndex(graph)
+
+
 def get_global_input_shape(graph, inp):
     """Return the global input shape of the graph with name inp
 
     Arguments:
-        graph:  the onnx graph
+        graph:  the onnx graph (or its ``OnnxGraphIndex``)
         inp (str):  the global input name
 
     Returns:
         list: The shape
 
     Raises:
-        StopIteration:  If the global input name is not found
+        KeyError:  If the global input name is not found
     """
-    inp_shape = next(x.type.tensor_type.shape.dim for x in graph.input if x.name == inp)
+    inp_shape = get_graph_index(graph).inputs[inp].type.tensor_type.shape.dim
     return list(x.dim_value for x in inp_shape)
 
 
@@ -52,38 +175,31 @@ def get_input_shape(graph, node):
     """Return the input shapes of the node in the model
 
     Arguments:
-        graph:  the onnx graph
+        graph:  the onnx graph (or its ``OnnxGraphIndex``)
         node:  the onnx node for which the input is desired
 
     Returns:
         list of lists: The shapes of all the inputs
 
     Raises:
-        StopIteration:  If the an input name is not found in the graph
+        RuntimeError:  If the an input name is not found in the graph
     """
+    value_info = get_graph_index(graph).value_info
     rv = []
     for inp in node.input:
-        # first try regular variables
-        vals = [x for x in graph.value_info if x.name == inp]
-        if not vals:
-            # then try outputs (possible if an output is intermediate)
-            vals = [x for x in graph.output if x.name == inp]
-        if not vals:
-            # then try global input.
-            vals = [x for x in graph.input if x.name == inp]
-        if not vals:
+        # regular variables, then outputs (possible if an output is intermediate), then global inputs
+        val = value_info.get(inp)
+        if val is None:
             raise RuntimeError(f'Could not find the shape for input {inp}')
-        dim = list(d.dim_value for d in vals[0].type.tensor_type.shape.dim)
+        dim = list(d.dim_value for d in val.type.tensor_type.shape.dim)
         if dim:
             rv.append(dim)
     return rv
 
 
 def get_constant_value(graph, constant_name):
-    tensor = next((x for x in graph.initializer if x.name == constant_name), None)
-    from onnx import numpy_helper
-
-    return numpy_helper.to_array(tensor)
+    index = get_graph_index(graph)
+    return index.tensor_value(index.initializers[constant_name])
 
 
 def compute_pads_1d(operation, layer):
@@ -165,15 +281,20 @@ def get_out_layer_name(graph):
     Get the output layer's name for the model.
     graph.output only returns the output's node index
     """
-    output_index_list = [x.name for x in graph.output]
+    output_index_list = {x.name for x in graph.output}
     return [node.name for node in graph.node if node.output[0] in output_index_list]
 
 
-def parse_onnx_model(onnx_model):
+def parse_onnx_model(onnx_model, base_dir=None):
     """Parses the onnx model, both for configuration building and general processing.
 
+    The values of the initializers are read-only views of the data of the model. If the model is given as a path, it is
+    loaded without its external data, which is memory-mapped instead, so that large models don't need to fit in memory.
+
     Args:
-        onnx_model: an ONNX model object.
+        onnx_model: an ONNX model object, or the path to an ONNX file.
+        base_dir (str, optional): Directory of the external data files of the model, if it was loaded with
+            ``load_external_data=False``. Defaults to the directory of the model file, or the current directory.
 
     Raises:
         Exception: Raised if an unsupported operation is found in the ONNX model.
@@ -188,12 +309,21 @@ def parse_onnx_model(onnx_model):
 
     # We don't infer the shapes because the qonnx package preprocessing does it.
 
+    if isinstance(onnx_model, (str, os.PathLike)):
+        import onnx
+
+        if base_dir is None:
+            base_dir = os.path.dirname(os.path.abspath(onnx_model))
+        onnx_model = onnx.load(onnx_model, load_external_data=False)
+
+    # All lookups by name go through the index, built once for the whole graph
+    graph = OnnxGraphIndex(onnx_model.graph, base_dir=base_dir)
+
     # Obtain list of input/ouput layers
-    all_inputs = [x.name for x in onnx_model.graph.input]
-    all_initializers = [x.name for x in onnx_model.graph.initializer]
-    input_layers = [x for x in all_inputs if x not in all_initializers]
-    constant_layers = all_initializers  # no need to copy it even though we change it
-    output_layers = get_out_layer_name(onnx_model.graph)
+    all_inputs = list(graph.inputs)
+    input_layers = [x for x in all_inputs if x not in graph.initializers]
+    constant_layers = list(graph.initializers)
+    output_layers = get_out_layer_name(graph)
 
     print('Output layers: ', output_layers)
 
@@ -201,7 +331,7 @@ def parse_onnx_model(onnx_model):
         input_layer = {}
         input_layer['name'] = replace_char_inconsitency(inp)
         input_layer['class_name'] = 'InputLayer'
-        inp_shape = get_global_input_shape(onnx_model.graph, inp)
+        inp_shape = get_global_input_shape(graph, inp)
         # We only support ONNX where the first dimension is the batch dimension.
         # Remove the batch dimension in all subsequnt use
         input_layer['input_shape'] = inp_shape[1:]
@@ -217,7 +347,7 @@ def parse_onnx_model(onnx_model):
         constant_layer = {}
         constant_layer['name'] = replace_char_inconsitency(constant)
         constant_layer['class_name'] = 'Constant'
-        constant_layer['value'] = get_constant_value(onnx_model.graph, constant)
+        constant_layer['value'] = get_constant_value(graph, constant)
 
         # Clean the layer name for specific models
         sanitize_layer_name(constant_layer)
@@ -234,13 +364,13 @@ def parse_onnx_model(onnx_model):
     supported_layers = get_supported_onnx_layers() + skip_layers
 
     print('Topology:')
-    for node in onnx_model.graph.node:
+    for node in graph.node:
         if node.op_type not in supported_layers:
             raise Exception(f'ERROR: Unsupported operation type: {node.op_type}')
 
         # Note that at this point, input shape still contains batch dimension
         # in cases where it appears. That is not filtered out till later.
-        input_shapes = get_input_shape(onnx_model.graph, node)
+        input_shapes = get_input_shape(graph, node)
 
         if node.op_type in skip_layers:
             # Currently supported skipped layers have only one input and output
@@ -255,7 +385,7 @@ def parse_onnx_model(onnx_model):
         input_names = [inputs_map.get(x, x) for x in node.input]
 
         # Process the layer
-        layer = layer_handlers[node.op_type](node, input_names, input_shapes, onnx_model.graph)
+        layer = layer_handlers[node.op_type](node, input_names, input_shapes, graph)
 
         sanitize_layer_name(layer)
         print(f'Layer name: {layer["name"]}, layer type: {layer["class_name"]}, current shape: {input_shapes}')
@@ -281,11 +411,8 @@ def onnx_to_hls(config):
     # Extract model architecture
     print('Interpreting Model ...')
 
-    import onnx
-
-    onnx_model = onnx.load(config['OnnxModel']) if isinstance(config['OnnxModel'], str) else config['OnnxModel']
-
-    layer_list, input_layers, output_layers = parse_onnx_model(onnx_model)
+    # A model file is loaded without its external data, which is memory-mapped by the parser
+    layer_list, input_layers, output_layers = parse_onnx_model(config['OnnxModel'])
 
     #################
     # Generate HLS
@@ -1,3 +1,6 @@
+import copy
+import weakref
+
 import numpy as np
 
 from hls4ml.model import ModelGraph
@@ -20,7 +23,8 @@ class PyTorchModelReader:
         tensorName = layer_name + '.' + var_name
 
         if tensorName in self.state_dict:
-            data = self.state_dict[tensorName].numpy()
+            # A view of the tensor, which is only copied if it is not on the CPU
+            data = self.state_dict[tensorName].detach().cpu().numpy()
 
         return data
 
@@ -106,11 +110,80 @@ layer_name_map = {
 # ----------------------------------------------------------------
 
 
-def parse_pytorch_model(config, verbose=True):
+_missing = object()
+
+
+class _RecordingConfig(dict):
+    """Copy of the conversion config that records the entries read by the layer handlers."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.used = {}
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.used[key] = value
+        return value
+
+    def get(self, key, default=None):
+        self.used[key] = super().get(key, _missing)
+        return super().get(key, default)
+
+
+# The parsing of a model kept by config_from_pytorch_model for its conversion, used at most once and only if the model and
+# the config entries read while parsing it are unchanged. Maps the model to a tuple (key, used config entries, parsing
+# result, logged topology).
+_parse_cache = weakref.WeakKeyDictionary()
+
+# Types of the module attributes that are part of the key, e.g., flags that forward(...) branches on
+_plain_types = (bool, int, float, str, type(None))
+
+
+def _model_fingerprint(model, input_shapes):
+    """Identifies the structure and state of the model and the storage and version of its parameters and buffers.
+
+    In-place updates of the tensors (e.g., by an optimizer or ``load_state_dict``) increase their version, assigning new
+    tensors changes their storage and changing the modules changes their representation. The plain attributes of the
+    modules, including the training flag, are part of the key as well.
+    """
+    modules = tuple(
+        (
+            name,
+            type(module).__name__,
+            module.extra_repr(),
+            tuple(sorted((k, v) for k, v in vars(module).items() if not k.startswith('_') and isinstance(v, _plain_types))),
+        )
+        for name, module in model.named_modules()
+    )
+    tensors = tuple(
+        (name, tensor.data_ptr(), tuple(tensor.shape), tensor.dtype, tensor._version)
+        for name, tensor in model.state_dict(keep_vars=True).items()
+    )
+    return modules, tensors, tuple(tuple(shape) for shape in input_shapes)
+
+
+def _copy_parsed_model(parsed):
+    """Copies the parsed layers, sharing the weight arrays (views of the model tensors) with the cached ones."""
+    memo = {}
+    for layer in parsed[0]:
+        for value in layer.values():
+            if isinstance(value, np.ndarray):
+                memo[id(value)] = value
+    return copy.deepcopy(parsed, memo)
+
+
+def parse_pytorch_model(config, verbose=True, keep_parsed=False):
     """Convert PyTorch model to hls4ml ModelGraph.
 
+    The parsed layers can be kept for the next parsing of the same model instance, so converting a model after creating
+    its config with :py:func:`~hls4ml.utils.config.config_from_pytorch_model` traces it only once. The kept layers are
+    used at most once, and only if the parameters, the modules and their attributes, and the input shape of the model are
+    unchanged. The weights of the layers are views of the tensors of the model.
+
     Args:
         config (dict): The conversion config
+        verbose (bool, optional): Print the topology of the model. Defaults to True.
+        keep_parsed (bool, optional): Keep the parsed layers for the next parsing of the model. Defaults to False.
 
     Raises:
         Exception: On unsupported features of the model.
@@ -118,13 +191,6 @@ def parse_pytorch_model(config, verbose=True):
     Returns:
         ModelGraph: hls4ml model object.
     """
-    import torch
-
-    from hls4ml.utils.torch import CustomFXTracer
-
-    # This is a list of dictionaries to hold all the layer info we need to generate HLS
-    layer_list = []
-
     if verbose:
         print('Interpreting Model ...')
     reader = PyTorchFileReader(config) if isinstance(config['PytorchModel'], str) else PyTorchModelReader(config)
@@ -135,6 +201,37 @@ def parse_pytorch_model(config, verbose=True):
     # first element needs to 'None' as placeholder for the batch size, insert it if not present
     input_shapes = [[None] + list(shape) if shape[0] is not None else list(shape) for shape in input_shapes]
 
+    model = reader.torch_model
+    key = _model_fingerprint(model, input_shapes)
+    cached = _parse_cache.pop(model, None)
+    if cached is None or cached[0] != key or any(config.get(k, _missing) != v for k, v in cached[1].items()):
+        messages = []
+
+        def log(message):
+            messages.append(message)
+            if verbose:
+                print(message)
+
+        handler_config = _RecordingConfig(config)
+        parsed = _parse_traced_model(handler_config, reader, input_shapes, log)
+        if keep_parsed:
+            _parse_cache[model] = (key, handler_config.used, parsed, messages)
+    else:
+        if verbose:
+            print('\n'.join(cached[3]))
+        parsed = cached[2]
+
+    return _copy_parsed_model(parsed)
+
+
+def _parse_traced_model(config, reader, input_shapes, log):
+    import torch
+
+    from hls4ml.utils.torch import CustomFXTracer
+
+    # This is a list of dictionaries to hold all the layer info we need to generate HLS
+    layer_list = []
+
     model = reader.torch_model
 
     # dict of layer objects in non-traced form for access later on
@@ -172,8 +269,7 @@ def parse_pytorch_model(config, verbose=True):
     output_shape = None
 
     # Loop through layers
-    if verbose:
-        print('Topology:')
+    log('Topology:')
     layer_counter = 0
 
     n_inputs = 0
@@ -287,14 +383,13 @@ def parse_pytorch_model(config, verbose=True):
             )
 
             if isinstance(layer, dict):
-                if verbose:
-                    print(
-                        'Layer name: {}, layer type: {}, input shape: {}'.format(
-                            layer['name'],
-                            layer['class_name'],
-                            input_shapes,
-                        )
+                log(
+                    'Layer name: {}, layer type: {}, input shape: {}'.format(
+                        layer['name'],
+                        layer['class_name'],
+                        input_shapes,
                     )
+                )
                 layer_list.append(layer)
 
                 assert output_shape is not None
@@ -304,14 +399,13 @@ def parse_pytorch_model(config, verbose=True):
 
             else:
                 for lay, out_shape in zip(layer, output_shape):
-                    if verbose:
-                        print(
-                            'Layer name: {}, layer type: {}, input shape: {}'.format(
-                                lay['name'],
-                                lay['class_name'],
-                                input_shapes,
-                            )
+                    log(
+                        'Layer name: {}, layer type: {}, input shape: {}'.format(
+                            lay['name'],
+                            lay['class_name'],
+                            input_shapes,
                         )
+                    )
                     layer_list.append(lay)
 
                     assert out_shape is not None
@@ -384,12 +478,7 @@ def parse_pytorch_model(config, verbose=True):
                 operation, layer_name, input_names, input_shapes, node, None, reader, config
             )
 
-            if verbose:
-                print(
-                    'Layer name: {}, layer type: {}, input shape: {}'.format(
-                        layer['name'], layer['class_name'], input_shapes
-                    )
-                )
+            log('Layer name: {}, layer type: {}, input shape: {}'.format(layer['name'], layer['class_name'], input_shapes))
             layer_list.append(layer)
 
             assert output_shape is not None
@@ -443,12 +532,7 @@ def parse_pytorch_model(config, verbose=True):
                 operation, layer_name, input_names, input_shapes, node, None, reader, config
             )
 
-            if verbose:
-                print(
-                    'Layer name: {}, layer type: {}, input shape: {}'.format(
-                        layer['name'], layer['class_name'], input_shapes
-                    )
-                )
+            log('Layer name: {}, layer type: {}, input shape: {}'.format(layer['name'], layer['class_name'], input_shapes))
             layer_list.append(layer)
 
             assert output_shape is not None
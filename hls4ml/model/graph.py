@@ -4,8 +4,10 @@ import ctypes
 import importlib.util
 import os
 import platform
+import queue
 import shutil
 import threading
+import time
 import uuid
 from collections import OrderedDict
 
@@ -16,7 +18,8 @@ from hls4ml.backends import get_backend
 from hls4ml.model.flow import get_flow
 from hls4ml.model.layers import Layer, layer_map
 from hls4ml.model.optimizer import get_available_passes, optimize_model
-from hls4ml.model.types import Serializable
+from hls4ml.model.types import Serializable, Source, WeightVariable
+from hls4ml.utils.simulation_utils import write_tb_inputs
 from hls4ml.utils.string_utils import convert_to_snake_case
 
 
@@ -59,6 +62,7 @@ class HLSConfig(Serializable):
 
         self.pipeline_style = 'auto'
         self.pipeline_ii = None
+        self.reuse_factor_search = None
 
         if 'WriterConfig' in self.config:
             self.writer_config = self.config['WriterConfig']
@@ -279,6 +283,7 @@ class HLSConfig(Serializable):
             self.model_compression = bool(model_cfg.get('Compression', 0))
             self.pipeline_style = model_cfg.get('PipelineStyle', 'auto')
             self.pipeline_ii = model_cfg.get('PipelineInterval', None)
+            self.reuse_factor_search = model_cfg.get('ReuseFactorSearch', None)
 
         layer_type_cfg = hls_config.get('LayerType')
         if layer_type_cfg is not None:
@@ -352,6 +357,7 @@ class HLSConfig(Serializable):
         state['trace_output'] = self.trace_output
         state['pipeline_style'] = self.pipeline_style
         state['pipeline_ii'] = self.pipeline_ii
+        state['reuse_factor_search'] = self.reuse_factor_search
         state['writer_config'] = self.writer_config.copy()
         state['flows'] = self.flows.copy()
         state['optimizers'] = self.optimizers.copy() if self.optimizers is not None else None
@@ -390,6 +396,7 @@ class HLSConfig(Serializable):
         config.trace_output = state['trace_output']
         config.pipeline_style = state['pipeline_style']
         config.pipeline_ii = state['pipeline_ii']
+        config.reuse_factor_search = state.get('reuse_factor_search')
         config.writer_config = state['writer_config']
         config.flows = state['flows']
         config.optimizers = state['optimizers']
@@ -398,6 +405,14 @@ class HLSConfig(Serializable):
         return config
 
 
+def _copy_layer_list(layer_list):
+    """Copies the layer dictionaries and their lists and dictionaries, keeping the other values (e.g., weights) shared."""
+    return [
+        {key: copy.copy(value) if isinstance(value, (list, dict)) else value for key, value in layer.items()}
+        for layer in layer_list
+    ]
+
+
 class ModelGraph(Serializable):
     """The ModelGraph represents the network that is being processed by hls4ml.
 
@@ -417,6 +432,9 @@ class ModelGraph(Serializable):
         self.index = initial_index
         self.output_vars = {}
         self._top_function_lib = None
+        self._top_function_lib_traced = False
+        self._unoptimized_snapshot = None
+        self._unoptimized_model = None
 
     @classmethod
     def from_layer_list(cls, config_dict, layer_list, inputs=None, outputs=None, initial_index=0):
@@ -446,7 +464,18 @@ class ModelGraph(Serializable):
         output_names = _find_output_variable_names(layer_list, output_layers)
 
         model = cls(config, input_names, output_names, initial_index)
+        # Snapshot of the graph before optimization. The layers are copied, as the optimizers modify the lists of their
+        # inputs and outputs in place, but the weight arrays are shared with the model
+        snapshot_layer_list = _copy_layer_list(layer_list)
         model._make_graph(layer_list)
+        hls_config = copy.deepcopy(config_dict['HLSConfig'])
+        model._unoptimized_snapshot = (
+            {**config_dict, 'HLSConfig': hls_config},
+            snapshot_layer_list,
+            input_names,
+            output_names,
+            initial_index,
+        )
         for flow in model.config.flows:
             model.apply_flow(flow)
 
@@ -467,6 +496,74 @@ class ModelGraph(Serializable):
 
         return model
 
+    def get_unoptimized_model(self):
+        """Returns the model as it was after conversion, before any optimizer flow was applied.
+
+        The unoptimized model is built on first use from a snapshot of the converted layers taken during conversion,
+        without reading the original model again, and cached. It is not meant to be compiled.
+
+        Returns:
+            ModelGraph: The unoptimized model, or ``None`` if no snapshot is available (e.g., for loaded models).
+        """
+        if self._unoptimized_model is None and self._unoptimized_snapshot is not None:
+            config_dict, layer_list, inputs, outputs, initial_index = self._unoptimized_snapshot
+            model = ModelGraph(HLSConfig(config_dict), list(inputs), list(outputs), initial_index)
+            model._make_graph(_copy_layer_list(layer_list))
+            self._unoptimized_model = model
+        return self._unoptimized_model
+
+    def clone(self, output_dir=None):
+        """Creates a copy of the model that can be modified independently, e.g., to try a different configuration.
+
+        The graph structure, layer attributes, types and configuration are copied, while the weight arrays and the
+        generated source code are shared between the two models, so cloning is fast even for large models. Shared
+        weight arrays are copy-on-write in the clone: they are exposed as read-only arrays, and modifying the weights
+        of the clone requires assigning a new array (``weight.data = new_data``), as the optimizers do. This model is
+        left unchanged, but its weights should also be replaced rather than modified in place to leave the clone
+        untouched. The compiled library is not shared, so the clone must be compiled before running predictions.
+
+        Args:
+            output_dir (str, optional): Output directory of the clone. If not specified, the output directory of this
+                model is used, and the clone will overwrite its project when written.
+
+        Returns:
+            ModelGraph: The cloned model.
+        """
+        memo = {id(self.config.backend): self.config.backend}
+        for key in ['KerasModel', 'PytorchModel', 'OnnxModel']:
+            if key in self.config.config:
+                memo[id(self.config.config[key])] = self.config.config[key]
+        for obj in [self._top_function_lib, self._unoptimized_snapshot, self._unoptimized_model]:
+            if obj is not None:
+                memo[id(obj)] = None if obj is self._top_function_lib else obj
+
+        def _share_array(array):
+            # The clone gets a read-only view of the array, this model keeps the array itself
+            view = array.view()
+            view.flags.writeable = False
+            memo[id(array)] = view
+
+        for layer in self.graph.values():
+            for value in layer.attributes.attributes.values():
+                if isinstance(value, np.ndarray):
+                    _share_array(value)
+                elif isinstance(value, WeightVariable):
+                    if isinstance(value.data, np.ndarray):
+                        _share_array(value.data)
+                    if value.quantizer is not None:
+                        memo[id(value.quantizer)] = value.quantizer
+                    if value._iterator is not None:
+                        memo[id(value._iterator)] = None
+                elif isinstance(value, Source):
+                    memo[id(value)] = value
+
+        model = copy.deepcopy(self, memo)
+        model._top_function_lib_traced = False
+        if output_dir is not None:
+            model.config.config['OutputDir'] = output_dir
+
+        return model
+
     def _make_graph(self, layer_list):
         for layer in layer_list:
             kind = layer['class_name']
@@ -819,6 +916,7 @@ class ModelGraph(Serializable):
             dlclose_func.restype = ctypes.c_int
             dlclose_func(self._top_function_lib._handle)
         self._top_function_lib = ctypes.cdll.LoadLibrary(lib_name)
+        self._top_function_lib_traced = self.config.trace_output
 
     def _get_top_function(self, x):
         if self._top_function_lib is None:
@@ -915,9 +1013,21 @@ class ModelGraph(Serializable):
         return self._predict(x)
 
     def trace(self, x):
-        print(f'Recompiling {self.config.get_project_name()} with tracing')
-        self.config.trace_output = True
-        self.compile()
+        """Runs the compiled model on the input data and returns the outputs of the traced layers.
+
+        The model is (re)compiled with tracing enabled, unless the currently loaded library has already been compiled
+        with tracing, in which case it is reused. Call ``compile()`` to pick up changes made to the model afterwards.
+
+        Args:
+            x (ndarray or list of ndarray): The input data.
+
+        Returns:
+            tuple: The model output and the dictionary of the outputs of the traced layers.
+        """
+        if self._top_function_lib is None or not self._top_function_lib_traced:
+            print(f'Recompiling {self.config.get_project_name()} with tracing')
+            self.config.trace_output = True
+            self.compile()
 
         top_function, ctype = self._get_top_function(x)
         n_samples = self._compute_n_samples(x)
@@ -1163,6 +1273,7 @@ class MultiModelGraph:
     def _initialize_io_attributes(self, graphs):
         self.graph_reports = None
         self._top_function_lib = None
+        self.pipeline_report = None
         self.inputs = graphs[0].inputs
         self.outputs = graphs[-1].outputs
         self.output_vars = {k: v for graph in graphs for k, v in graph.output_vars.items()}
@@ -1203,6 +1314,8 @@ class MultiModelGraph:
                             'integer_bits': int(precision.integer),
                             'fractional_bits': int(precision.fractional),
                             'signed': int(precision.signed),
+                            'rounding_mode': str(precision.rounding_mode),
+                            'saturation_mode': str(precision.saturation_mode),
                             'fifo_depth': int(fifo_depth),
                             'batch_size': int(batch_size),
                         }
@@ -1310,15 +1423,34 @@ class MultiModelGraph:
     def compile(self):
         self.write()
         self._compile()
+        # Keep the libraries of the subgraphs loaded by a pipelined prediction in sync with the new sources
+        for g in self.graphs:
+            if g._top_function_lib is not None:
+                g._compile()
+
+    def predict(self, x, sim='csim', pipelined=False, batch_size=64, queue_size=2):
+        """Runs the forward pass of the stitched model.
 
-    def predict(self, x, sim='csim'):
+        Args:
+            x (ndarray or list of ndarray): The input data.
+            sim (str, optional): The simulation to run, ``'csim'`` for the C simulation or ``'rtl'`` for the RTL
+                simulation of the stitched design. Defaults to ``'csim'``.
+            pipelined (bool, optional): If True, the C simulation runs each subgraph in its own thread, passing batches of
+                samples through bounded queues, as in the dataflow of the stitched design. Throughput statistics are
+                stored in ``pipeline_report``. Defaults to False.
+            batch_size (int, optional): The number of samples per batch in the pipelined C simulation. Defaults to 64.
+            queue_size (int, optional): The maximum number of batches waiting between two subgraphs in the pipelined C
+                simulation. Defaults to 2.
+
+        Returns:
+            ndarray or list of ndarray: The predictions.
+        """
         if sim == 'csim':
+            if pipelined:
+                return self._predict_pipelined(x, batch_size, queue_size)
             return self._predict(x)
         elif sim == 'rtl':
             self.nn_config = self.parse_nn_config()
-            assert (
-                np.prod(x.shape) == self.nn_config['inputs'][0]['fifo_depth'] * self.nn_config['inputs'][0]['batch_size']
-            ), 'Only single batch supported for stitched simulation.'
             stitched_report = self.backend.build_stitched_design(
                 self,
                 stitch_design=False,
@@ -1341,48 +1473,99 @@ class MultiModelGraph:
         else:
             print('Unknown simulation option given.')
 
-    def trace(self, x):
-        raise NotImplementedError('Trace function has not been implemented yet for MultiModelGraph.')
-
-    def write_tb_inputs(self, x, folder_path):
-        """
-        Dump inputs (for Verilog testbench) via the C++ bridge functions:
-        dump_tb_inputs_float
-        dump_tb_inputs_double
-        """
-        if self._top_function_lib is None:
-            self.compile()
+    def _predict_pipelined(self, x, batch_size, queue_size):
+        n_samples = self._compute_n_samples(x)
+        xlist = [x] if len(self.get_input_variables()) == 1 else x
+        xlist = [np.ascontiguousarray(np.reshape(xi, (n_samples, -1))) for xi in xlist]
 
-        if isinstance(x, (list, tuple)):
-            xlist = list(x)
-        else:
-            xlist = [x]
+        # Each subgraph runs from its own library, loaded on first use
+        for g in self.graphs:
+            if g._top_function_lib is None:
+                g._compile()
+
+        batches = ([xi[start : start + batch_size] for xi in xlist] for start in range(0, n_samples, batch_size))
+        queues = [queue.Queue(maxsize=queue_size) for _ in self.graphs]
+        getters = [lambda: next(batches, None)] + [q.get for q in queues[:-1]]
+        stats = {f'graph{idx}': {'Samples': 0, 'BusyTime': 0.0, 'WaitTime': 0.0} for idx in range(1, len(self.graphs) + 1)}
+
+        def run_stage(g, get_batch, out_queue, stage_stats):
+            error = None
+            while True:
+                start = time.perf_counter()
+                batch = get_batch()
+                stage_stats['WaitTime'] += time.perf_counter() - start
+                if batch is None:
+                    break
+                if error is not None:
+                    # Keep consuming the batches, so that the previous subgraphs do not block on a full queue
+                    continue
+                try:
+                    start = time.perf_counter()
+                    outputs = self._run_subgraph(g, batch)
+                    stage_stats['BusyTime'] += time.perf_counter() - start
+                    stage_stats['Samples'] += len(batch[0])
+                except Exception as exc:
+                    error = exc
+                    out_queue.put(None)
+                    continue
+                start = time.perf_counter()
+                out_queue.put(outputs)
+                stage_stats['WaitTime'] += time.perf_counter() - start
+            if error is not None:
+                raise error
+            out_queue.put(None)
+
+        start = time.perf_counter()
+        results = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(self.graphs)) as executor:
+            futures = [
+                executor.submit(run_stage, g, get_batch, out_queue, stage_stats)
+                for g, get_batch, out_queue, stage_stats in zip(self.graphs, getters, queues, stats.values())
+            ]
+            while (outputs := queues[-1].get()) is not None:
+                results.append(outputs)
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        for stage_stats in stats.values():
+            busy_time = stage_stats['BusyTime']
+            stage_stats['Throughput'] = stage_stats['Samples'] / busy_time if busy_time > 0 else float('inf')
+        self.pipeline_report = {
+            'Stages': stats,
+            'ElapsedTime': elapsed,
+            'Throughput': n_samples / elapsed if elapsed > 0 else float('inf'),
+        }
 
-        first = xlist[0]
-        if first.dtype in [np.single, np.float32]:
-            fn_name = 'dump_tb_inputs_float'
-            ctype = ctypes.c_float
-        elif first.dtype in [np.double, np.float64]:
-            fn_name = 'dump_tb_inputs_double'
-            ctype = ctypes.c_double
+        n_outputs = len(self.get_output_variables())
+        output = [np.concatenate([outputs[i] for outputs in results]) for i in range(n_outputs)]
+        if n_samples == 1 and n_outputs == 1:
+            return output[0][0]
+        elif n_outputs == 1:
+            return output[0]
+        elif n_samples == 1:
+            return [output_i[0] for output_i in output]
         else:
-            raise Exception(
-                'Invalid type ({}) of numpy array. Supported types are: single, float32, double, float64, float_.'.format(
-                    first.dtype
-                )
-            )
+            return output
 
-        for arr in xlist:
-            if arr.dtype != first.dtype:
-                raise ValueError('All inputs must have same dtype')
-            if not arr.flags['C_CONTIGUOUS']:
-                raise ValueError('Input arrays must be C_CONTIGUOUS')
+    @staticmethod
+    def _run_subgraph(g, batch):
+        """Runs the C simulation of a subgraph on a batch, given and returned as one 2D array per input/output."""
+        top_function, ctype = g._get_top_function(batch[0] if len(batch) == 1 else batch)
+        outputs = [np.zeros((len(batch[0]), var.size()), dtype=ctype) for var in g.get_output_variables()]
+        for i in range(len(batch[0])):
+            top_function(*[xi[i] for xi in batch], *[yi[i] for yi in outputs])
+        return outputs
 
-        fn = getattr(self._top_function_lib, fn_name)
-        fn.restype = None
-        fn.argtypes = [ctypes.c_char_p] + [npc.ndpointer(ctype, flags='C_CONTIGUOUS') for _ in xlist]
+    def trace(self, x):
+        raise NotImplementedError('Trace function has not been implemented yet for MultiModelGraph.')
 
-        fn(folder_path.encode('ascii'), *xlist)
+    def write_tb_inputs(self, x, folder_path):
+        """
+        Dump inputs (for Verilog testbench) as the bits of the fixed-point input types, see
+        :py:func:`hls4ml.utils.simulation_utils.write_tb_inputs`.
+        """
+        write_tb_inputs(x, self.parse_nn_config()['inputs'], folder_path)
 
     def get_input_variables(self):
         variables = []
@@ -1845,6 +1845,8 @@ class SymbolicExpression(Layer):
         Attribute('expression', value_type=list),
         Attribute('n_symbols'),
         Attribute('lut_functions', value_type=list, default=[]),
+        Attribute('eliminate_subexpressions', value_type=bool, default=True),
+        Attribute('full_precision_subexpressions', value_type=bool, default=True),
     ]
 
     def initialize(self):
@@ -10,6 +10,7 @@ from math import ceil, log2, prod
 from warnings import warn
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
 from quantizers import get_fixed_quantizer_np
 
@@ -247,13 +248,17 @@ def _(layer: Input):
 
 
 def get_input_kifs(layer: Layer):
-    return [_produce_kif(l) for l in get_input_layers(layer)]
+    return [produce_kif(l) for l in get_input_layers(layer)]
 
 
 @_produce_kif.register
 def _(layer: FixedPointQuantizer):
     assert layer.mask_kbi is not None
 
+    # mask_kbi is replaced by the derived masks below, the masks set by the user are kept for incremental updates
+    if getattr(layer, 'user_mask_kbi', None) is None:
+        layer.user_mask_kbi = layer.mask_kbi
+
     _k, _B, _I = layer.mask_kbi
     shape0 = _k.shape[1:]
     k, i, f = _k, _I - _k, _B - _I
@@ -412,39 +417,44 @@ def _(layer: Transpose):
     return k, i, f
 
 
-def r_im2col(kernel_size: Sequence[int], arr: np.ndarray, buffer: np.ndarray, axis: int):
-    w = kernel_size[0]
-    if len(kernel_size) == 3:  # 1D
-        for i in range(arr.shape[axis] - w + 1):
-            patch = np.take(arr, range(i, i + w), axis=axis)
-            buffer[i] = patch.flatten()
-    else:  # 2D+
-        for i in range(arr.shape[axis] - w + 1):
-            patch = arr[i : i + w]
-            r_im2col(kernel_size[1:], patch, buffer[i], axis + 1)
-
-
-def _im2col(kernel_size: Sequence[int], arr: np.ndarray):
+def _im2col(
+    kernel_size: Sequence[int], arr: np.ndarray, strides: Sequence[int] | None = None, dilation: Sequence[int] | None = None
+):
     if len(kernel_size) < 3:
         return arr
-    shape = [inp_d - ker_d + 1 for inp_d, ker_d in zip(arr.shape, kernel_size[:-2])]
-    shape.append(np.prod(kernel_size[:-1]))  # type: ignore
-    buf = np.empty(shape, dtype=arr.dtype)
-    r_im2col(kernel_size, arr, buf, 0)
-    return buf
-
-
-def im2col(kernel_size: Sequence[int], *arrs: np.ndarray):
+    n_dim = len(kernel_size) - 2
+    strides = strides or (1,) * n_dim
+    dilation = dilation or (1,) * n_dim
+    window = [d * (k - 1) + 1 for k, d in zip(kernel_size[:n_dim], dilation)]
+    # (*out_shape, ch, *window) view of arr, nothing is copied until the final reshape
+    patches = sliding_window_view(arr, window, axis=tuple(range(n_dim)))
+    patches = patches[tuple(slice(None, None, s) for s in strides) + (...,) + tuple(slice(None, None, d) for d in dilation)]
+    # Flatten each patch in the (*kernel_shape, ch) order of the reshaped kernel
+    patches = np.moveaxis(patches, n_dim, -1)
+    return patches.reshape(*patches.shape[:n_dim], -1)
+
+
+def im2col(
+    kernel_size: Sequence[int],
+    *arrs: np.ndarray,
+    strides: Sequence[int] | None = None,
+    dilation: Sequence[int] | None = None,
+):
     """im2col for multidimensional arrays. Assumes Channel Last format.
 
+    The patches are gathered from a strided view of the input, so only the patches at the strided output positions are
+    materialized.
+
     Args:
         kernel_size (Sequence[int]): The size of the kernel, in the form (*kernel_shape, ch_in, ch_out).
         *arrs (np.ndarray): The input arrays to be transformed.
+        strides (Sequence[int], optional): The strides along each spatial dimension. Defaults to 1.
+        dilation (Sequence[int], optional): The dilation rate along each spatial dimension. Defaults to 1.
 
     Returns:
-        list[np.ndarray]: The transformed arrays.
+        list[np.ndarray]: The transformed arrays, of shape (*out_shape, prod(kernel_shape) * ch_in).
     """
-    return [_im2col(kernel_size, arr) for arr in arrs]
+    return [_im2col(kernel_size, arr, strides, dilation) for arr in arrs]
 
 
 def pad_arrs(node: Layer, pad_val: float = 0, *arrs: np.ndarray):
@@ -468,15 +478,17 @@ def pad_arrs(node: Layer, pad_val: float = 0, *arrs: np.ndarray):
     return tuple(out_arrs)
 
 
-def stride_arrs(node: Layer, *arrs: np.ndarray):
+def get_strides(node: Layer) -> tuple[int, ...]:
     if node.class_name.endswith('2D'):
-        st_h = node.attributes['stride_height']
-        st_w = node.attributes['stride_width']
-        return tuple(arr[::st_h, ::st_w] for arr in arrs)
+        return node.attributes['stride_height'], node.attributes['stride_width']
     if node.class_name.endswith('1D'):
-        st_w = node.attributes['stride_width']
-        return tuple(arr[::st_w] for arr in arrs)
-    raise ValueError(f'Layer {node.class_name} is not supported for stride_arrs')
+        return (node.attributes['stride_width'],)
+    raise ValueError(f'Layer {node.class_name} is not supported for get_strides')
+
+
+def stride_arrs(node: Layer, *arrs: np.ndarray):
+    strides = get_strides(node)
+    return tuple(arr[tuple(slice(None, None, st) for st in strides)] for arr in arrs)
 
 
 @_produce_kif.register(Conv1D)
@@ -488,8 +500,7 @@ def _(layer: Conv1D | Conv2D):
     bias = _bias.data if _bias is not None else 0
     k_in, i_in, f_in = get_input_kifs(layer)[0]
     k_in, i_in, f_in = pad_arrs(layer, 0, k_in, i_in, f_in)
-    k_in, i_in, f_in = im2col(kernel.shape, k_in, i_in, f_in)
-    k_in, i_in, f_in = stride_arrs(layer, k_in, i_in, f_in)
+    k_in, i_in, f_in = im2col(kernel.shape, k_in, i_in, f_in, strides=get_strides(layer))
     kernel = kernel.reshape(-1, kernel.shape[-1])
     qint_in = QIntervalArray.from_kif(k_in, i_in, f_in)
     qint_out = qint_in @ kernel
@@ -509,11 +520,11 @@ def _(layer: Pooling1D | Pooling2D | GlobalPooling1D | GlobalPooling2D):
     im2col_shape = *px_shape, ch_in, ch_out  # conv kernel shape
     k_in, i_in, f_in = get_input_kifs(layer)[0]
     count = np.ones_like(k_in, dtype=np.uint32)
+    strides = None
     if isinstance(layer, (Pooling1D, Pooling2D)):
         k_in, i_in, f_in, count = pad_arrs(layer, 0, k_in, i_in, f_in, count)
-    k_in, i_in, f_in, count = im2col(im2col_shape, k_in, i_in, f_in, count)
-    if isinstance(layer, (Pooling1D, Pooling2D)):
-        k_in, i_in, f_in, count = stride_arrs(layer, k_in, i_in, f_in, count)
+        strides = get_strides(layer)
+    k_in, i_in, f_in, count = im2col(im2col_shape, k_in, i_in, f_in, count, strides=strides)
 
     k_out = k_in.reshape(*k_in.shape[:-1], -1, ch_in).max(axis=-2).astype(np.int16)
     i_out = i_in.reshape(*i_in.shape[:-1], -1, ch_in).max(axis=-2).astype(np.int16)
@@ -713,20 +724,32 @@ def kif_arrs_to_ints(arr: tuple[np.ndarray, np.ndarray, np.ndarray]):
     return tuple(int(np.max(a)) for a in arr)
 
 
-def produce_kif(layer: Layer, force_reset=False) -> KIF_t:
-    if layer.attributes.get('_produce_kif') and not force_reset:
-        return layer.attributes['_produce_kif']
-    kif = _produce_kif(layer)
-    layer.attributes['_produce_kif'] = kif
+def _kif_cache(model: 'ModelGraph') -> dict[str, dict[str, tuple[Layer, typing.Any]]]:
+    """Per-model cache of the produced and requested kifs of each layer, kept between runs of the bit-exact flow."""
+    cache = getattr(model, '_bit_exact_kif_cache', None)
+    if cache is None:
+        cache = {'produce': {}, 'request': {}}
+        model._bit_exact_kif_cache = cache
+    return cache
+
+
+def _cached(kind: str, layer: Layer, fn, force_reset=False):
+    cache = _kif_cache(layer.model)[kind]
+    entry = cache.get(layer.name)
+    # The layer is stored along with the result, so a replaced layer reusing the name is not served a stale result
+    if entry is not None and entry[0] is layer and not force_reset:
+        return entry[1]
+    kif = fn(layer)
+    cache[layer.name] = (layer, kif)
     return kif
 
 
+def produce_kif(layer: Layer, force_reset=False) -> KIF_t:
+    return _cached('produce', layer, _produce_kif, force_reset)
+
+
 def request_kif(layer: Layer) -> tuple[KIF_t, ...]:
-    if layer.attributes.get('_request_kif'):
-        return layer.attributes['_request_kif']
-    kif = _request_kif(layer)
-    layer.attributes['_request_kif'] = kif
-    return kif
+    return _cached('request', layer, _request_kif)
 
 
 def requested_by_non_saturating_quantizer(layer: Layer) -> bool:
@@ -966,12 +989,13 @@ class BitExact(ModelOptimizerPass):
                     if len(get_output_layers(get_input_layers(v)[0])) == 1:
                         model.remove_node(v)
 
+        # The graph may have been modified since the last run, start from a clean cache
+        model._bit_exact_kif_cache = None
+
         for node in model.graph.values():
             if node.attributes.get('bit_exact_transformed'):
                 continue
-            produce_kif(
-                node, force_reset=True
-            )  # Shrink FixedPointQuantizer bits when possible to be used in backward flow (requested_kif).
+            produce_kif(node)  # Shrink FixedPointQuantizer bits when possible to be used in backward flow (requested_kif).
 
         for node in model.graph.values():
             if node.attributes.get('bit_exact_transformed'):
@@ -979,15 +1003,84 @@ class BitExact(ModelOptimizerPass):
             register_precision(node)
             node.attributes['bit_exact_transformed'] = True
 
-        for node in model.graph.values():
-            if '_produce_kif' in node.attributes:
-                del node.attributes['_produce_kif']
-            if '_request_kif' in node.attributes:
-                del node.attributes['_request_kif']
-
+        # The cache is kept for incremental updates with update_bit_exact_precision
         return True
 
 
+# Layers whose requested input kif is derived from the kif requested from their output
+_request_pass_through = (Reshape, Activation, Concatenate, Transpose)
+
+
+def update_bit_exact_precision(model: 'ModelGraph', changed: typing.Iterable[Layer | str]) -> list[str]:
+    """Re-propagates the bit-exact precisions after local edits, e.g., of the ``mask_kbi`` of some
+    ``FixedPointQuantizer`` or of the precision of a trusted layer, without re-running the analysis of the whole model.
+    The ``mask_kbi`` of the changed quantizers is taken as set by the user, while the other quantizers downstream start
+    again from their original masks, as the masks derived for the previous inputs may be too narrow for the new ones.
+
+    The produced kifs are recomputed for the changed layers and the layers downstream of them. The requested kifs are
+    recomputed for the same layers, and backward through the layers passing the requests of their outputs to their
+    inputs (e.g., ``Reshape``). The precisions are then registered again only for the affected layers, while the
+    interval results of the rest of the model are reused from the previous run.
+
+    Args:
+        model (ModelGraph): The model, to which the bit-exact flow was already applied.
+        changed (Iterable[Layer | str]): The edited layers, or their names.
+
+    Returns:
+        list[str]: The names of the layers whose precisions were updated, in graph order.
+    """
+    changed = [node if isinstance(node, str) else node.name for node in changed]
+    input_names = {
+        name: [] if isinstance(node, Input) else [inp.name for inp in get_input_layers(node)]
+        for name, node in model.graph.items()
+    }
+    output_names = {name: [] for name in model.graph}
+    for name, inputs in input_names.items():
+        for inp in inputs:
+            output_names[inp].append(name)
+
+    cache = _kif_cache(model)
+
+    # Forward frontier: the kif produced by the changed layers and all layers downstream may change
+    forward, stack = set(), list(changed)
+    while stack:
+        name = stack.pop()
+        if name in forward:
+            continue
+        forward.add(name)
+        stack.extend(output_names[name])
+    for name in forward:
+        cache['produce'].pop(name, None)
+        cache['request'].pop(name, None)
+        node = model.graph[name]
+        if isinstance(node, FixedPointQuantizer):
+            if name in changed:
+                node.user_mask_kbi = node.mask_kbi
+            elif getattr(node, 'user_mask_kbi', None) is not None:
+                node.mask_kbi = node.user_mask_kbi
+
+    # Backward frontier: the inputs of the affected layers see different requested kifs
+    backward, stack = set(), [inp for name in forward for inp in input_names[name]]
+    while stack:
+        name = stack.pop()
+        if name in forward or name in backward:
+            continue
+        backward.add(name)
+        node = model.graph[name]
+        if isinstance(node, _request_pass_through):
+            cache['request'].pop(name, None)
+            stack.extend(input_names[name])
+
+    affected = [name for name in model.graph if name in forward or name in backward]
+    for name in affected:
+        produce_kif(model.graph[name])
+    for name in affected:
+        register_precision(model.graph[name])
+        model.graph[name].attributes['bit_exact_transformed'] = True
+
+    return affected
+
+
 def get_output_layers_and_quantizers(
     node: Layer, layers: list | None = None, quantizers: list | None = None
 ) -> tuple[list[Layer], list[FixedPointQuantizer]]:
@@ -73,7 +73,11 @@ class FuseBatchNormalization(OptimizerPass):
         ):
             return False
 
-        fused_weight = bn_scale.data * parent_weight.data
+        # A unit scale (e.g., from a bias addition) keeps the weights, which may be a read-only view of the model file
+        if np.all(bn_scale.data == 1):
+            fused_weight = parent_weight.data
+        else:
+            fused_weight = bn_scale.data * parent_weight.data
         fused_bias = bn_scale.data * parent_bias.data + bn_bias.data
 
         w_quantizer = (
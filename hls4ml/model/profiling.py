@@ -11,6 +11,8 @@ import seaborn as sb
 
 from hls4ml.model.graph import ModelGraph
 from hls4ml.model.layers import GRU, LSTM, SeparableConv1D, SeparableConv2D
+from hls4ml.model.types import UnspecifiedPrecisionType
+from hls4ml.utils.streaming_stats import StreamingSummary, iter_batches
 
 try:
     import keras
@@ -41,6 +43,21 @@ if __qkeras_profiling_enabled__:
 
 
 def get_unoptimized_hlsmodel(model):
+    """Get the model before optimization.
+
+    The snapshot taken during conversion is used if available (see ``ModelGraph.get_unoptimized_model``), otherwise the
+    model is converted again from its configuration into a temporary output directory.
+
+    Args:
+        model (ModelGraph): The (optimized) model.
+
+    Returns:
+        tuple: The unoptimized model and the temporary output directory (``None`` if no reconversion was needed).
+    """
+    unoptimized_model = model.get_unoptimized_model()
+    if unoptimized_model is not None:
+        return unoptimized_model, None
+
     from hls4ml.converters import convert_from_config
 
     new_config = model.config.config.copy()
@@ -61,6 +78,8 @@ def get_unoptimized_hlsmodel(model):
 
 
 def array_to_summary(x, fmt='boxplot'):
+    if isinstance(x, StreamingSummary):
+        return x.summary(fmt=fmt)
     if fmt == 'boxplot':
         y = {'med': np.median(x), 'q1': np.percentile(x, 25), 'q3': np.percentile(x, 75), 'whislo': min(x), 'whishi': max(x)}
     elif fmt == 'histogram':
@@ -75,6 +94,42 @@ def array_to_summary(x, fmt='boxplot'):
     return y
 
 
+class _ExactSummary:
+    """Keeps all the non-zero magnitudes of a tensor, for the exact summaries of :py:func:`array_to_summary`."""
+
+    def __init__(self):
+        self.values = []
+
+    @property
+    def count(self):
+        return sum(len(y) for y in self.values)
+
+    def update(self, x):
+        y = np.asarray(x).flatten()
+        self.values.append(abs(y[y != 0]))
+
+    def summary(self, fmt='boxplot'):
+        return array_to_summary(np.concatenate(self.values), fmt=fmt)
+
+
+def _make_accumulator(batch_size):
+    """The summaries are exact if the data is processed in a single batch, and streaming (approximate quantiles) if not."""
+    return _ExactSummary() if batch_size is None else StreamingSummary()
+
+
+def _summarize_accumulators(accumulators, plot):
+    """Turn ``(name, accumulator)`` pairs into the summary data used by the plots."""
+    data = []
+    for name, acc in accumulators:
+        print(f'   {name}')
+        if acc.count == 0:
+            print(f'Activations for {name} are only zeros, ignoring.')
+            continue
+        data.append(acc.summary(fmt=plot))
+        data[-1]['weight'] = name
+    return data
+
+
 def boxplot(data, fmt='longform'):
     if fmt == 'longform':
         f = plt.figure()  # figsize=(3, 3))
@@ -211,7 +266,7 @@ def types_hlsmodel(model):
         for iw, weight in enumerate(layer.get_weights()):
             wname = f'{layer.name}/{suffix[iw]}'
             T = weight.type
-            if T.name != 'model':
+            if T.name != 'model' and not isinstance(T.precision, UnspecifiedPrecisionType):
                 W, I, F, S = ap_fixed_WIFS(T.precision)
                 data['layer'].append(wname)
                 data['low'].append(-F)
@@ -230,6 +285,9 @@ def activation_types_hlsmodel(model):
     data['high'].append(I - 1 if S else I)
     for layer in model.get_layers():
         T = layer.get_output_variable().type.precision
+        if isinstance(T, UnspecifiedPrecisionType):
+            # Not inferred yet in unoptimized models
+            continue
         W, I, F, S = ap_fixed_WIFS(T)
         data['layer'].append(layer.name)
         data['low'].append(-F)
@@ -321,32 +379,21 @@ keras_process_layer_map = defaultdict(
 )
 
 
-def activations_hlsmodel(model, X, fmt='summary', plot='boxplot'):
+def activations_hlsmodel(model, X, fmt='summary', plot='boxplot', batch_size=None):
     if fmt == 'longform':
         raise NotImplementedError
-    elif fmt == 'summary':
-        data = []
-
-    _, trace = model.trace(np.ascontiguousarray(X))
-
-    if len(trace) == 0:
-        raise RuntimeError('ModelGraph must have tracing on for at least 1 layer (this can be set in its config)')
-
-    for layer in trace.keys():
-        print(f'   {layer}')
 
-        if fmt == 'summary':
-            y = trace[layer].flatten()
-            y = abs(y[y != 0])
+    accumulators = {}
+    for x in iter_batches(X, batch_size):
+        _, trace = model.trace(np.ascontiguousarray(x))
 
-            if len(y) == 0:
-                print(f'Activations for {layer} are only zeros, ignoring.')
-                continue
+        if len(trace) == 0:
+            raise RuntimeError('ModelGraph must have tracing on for at least 1 layer (this can be set in its config)')
 
-            data.append(array_to_summary(y, fmt=plot))
-            data[-1]['weight'] = layer
+        for layer, y in trace.items():
+            accumulators.setdefault(layer, _make_accumulator(batch_size)).update(y)
 
-    return data
+    return _summarize_accumulators(accumulators.items(), plot)
 
 
 def weights_keras(model, fmt='longform', plot='boxplot'):
@@ -380,20 +427,24 @@ def weights_keras(model, fmt='longform', plot='boxplot'):
     return data
 
 
-def activations_keras(model, X, fmt='longform', plot='boxplot'):
+def activations_keras(model, X, fmt='longform', plot='boxplot', batch_size=None):
     # test layer by layer on data
-    if fmt == 'longform':
-        # return long form pandas dataframe for
-        # seaborn boxplot
-        data = {'x': [], 'weight': []}
-    elif fmt == 'summary':
+    layers = [layer for layer in model.layers if not isinstance(layer, keras.layers.InputLayer)]
+    if fmt == 'summary':
         # return summary statistics for matplotlib.axes.Axes.bxp
-        # or histogram bin edges and heights
-        data = []
-    outputs = _get_outputs(
-        [layer for layer in model.layers if not isinstance(layer, keras.layers.InputLayer)], X, model.input
-    )
-    outputs = dict(zip([layer.name for layer in model.layers if not isinstance(layer, keras.layers.InputLayer)], outputs))
+        # or histogram bin edges and heights, accumulated batch by batch
+        accumulators = {layer.name: _make_accumulator(batch_size) for layer in layers}
+        for x in iter_batches(X, batch_size):
+            outputs = _get_outputs(layers, x, model.input)
+            for layer, y in zip(layers, outputs):
+                accumulators[layer.name].update(y)
+        return _summarize_accumulators(accumulators.items(), plot)
+
+    # return long form pandas dataframe for
+    # seaborn boxplot
+    data = {'x': [], 'weight': []}
+    outputs = _get_outputs(layers, X, model.input)
+    outputs = dict(zip([layer.name for layer in layers], outputs))
     for layer_name, y in outputs.items():
         print(f'   {layer_name}')
         y = y.flatten()
@@ -401,15 +452,10 @@ def activations_keras(model, X, fmt='longform', plot='boxplot'):
         if len(y) == 0:
             print(f'Activations for {layer_name} are only zeros, ignoring.')
             continue
-        if fmt == 'longform':
-            data['x'].extend(y.tolist())
-            data['weight'].extend([layer_name for i in range(len(y))])
-        elif fmt == 'summary':
-            data.append(array_to_summary(y, fmt=plot))
-            data[-1]['weight'] = layer_name
+        data['x'].extend(y.tolist())
+        data['weight'].extend([layer_name for i in range(len(y))])
 
-    if fmt == 'longform':
-        data = pandas.DataFrame(data)
+    data = pandas.DataFrame(data)
     return data
 
 
@@ -420,12 +466,21 @@ def weights_torch(model, fmt='longform', plot='boxplot'):
     return wt.get_weights()
 
 
-def activations_torch(model, X, fmt='longform', plot='boxplot'):
+def activations_torch(model, X, fmt='longform', plot='boxplot', batch_size=None):
+    if fmt == 'summary':
+        # Run the layers one after the other on each batch, accumulating the outputs of every layer
+        layers = list(model.children())
+        accumulators = [(layer.__class__.__name__, _make_accumulator(batch_size)) for layer in layers]
+        with torch.no_grad():
+            for x in iter_batches(X, batch_size):
+                y = torch.Tensor(x)
+                for layer, (_, acc) in zip(layers, accumulators):
+                    y = layer(y)
+                    acc.update(y.numpy())
+        return _summarize_accumulators(accumulators, plot)
+
     X = torch.Tensor(X)
-    if fmt == 'longform':
-        data = {'x': [], 'weight': []}
-    elif fmt == 'summary':
-        data = []
+    data = {'x': [], 'weight': []}
 
     partial_model = torch.nn.Sequential
     layers = []
@@ -439,19 +494,14 @@ def activations_torch(model, X, fmt='longform', plot='boxplot'):
         if len(y) == 0:
             print(f'Activations for {lname} are only zeros, ignoring.')
             continue
-        if fmt == 'longform':
-            data['x'].extend(y.tolist())
-            data['weight'].extend([lname for _ in range(len(y))])
-        elif fmt == 'summary':
-            data.append(array_to_summary(y, fmt=plot))
-            data[-1]['weight'] = lname
+        data['x'].extend(y.tolist())
+        data['weight'].extend([lname for _ in range(len(y))])
 
-    if fmt == 'longform':
-        data = pandas.DataFrame(data)
+    data = pandas.DataFrame(data)
     return data
 
 
-def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
+def numerical(model=None, hls_model=None, X=None, plot='boxplot', batch_size=None):
     """Perform numerical profiling of a model.
 
     Args:
@@ -461,6 +511,10 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
             Must be formatted suitably for the ``model.predict(X)``. Defaults to None.
         plot (str, optional): The type of plot to produce. Options are: 'boxplot' (default), 'violinplot', 'histogram',
             'FacetGrid'. Defaults to 'boxplot'.
+        batch_size (int, optional): If specified, the activations are profiled by feeding ``X`` in batches of this
+            size and accumulating streaming summaries, so the activations of the whole dataset are never held in
+            memory at once. The quartiles of the boxplots are then estimated with a quantile sketch. Defaults to None
+            (single batch, exact summaries).
 
     Returns:
         tuple: The quadruple of produced figures. First weights and biases
@@ -498,7 +552,7 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
     if data is None:
         print('Only keras, PyTorch and ModelGraph models ' + 'can currently be profiled')
 
-        if hls_model_present and os.path.exists(tmp_output_dir):
+        if tmp_output_dir is not None and os.path.exists(tmp_output_dir):
             shutil.rmtree(tmp_output_dir)
 
         return wp, wph, ap, aph
@@ -529,9 +583,9 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
         print('Profiling activations' + before)
         data = None
         if __keras_profiling_enabled__ and isinstance(model, keras.Model):
-            data = activations_keras(model, X, fmt='summary', plot=plot)
+            data = activations_keras(model, X, fmt='summary', plot=plot, batch_size=batch_size)
         elif __torch_profiling_enabled__ and isinstance(model, torch.nn.Sequential):
-            data = activations_torch(model, X, fmt='summary', plot=plot)
+            data = activations_torch(model, X, fmt='summary', plot=plot, batch_size=batch_size)
 
         if data is not None:
             ap = plots[plot](data, fmt='summary')  # activation plot
@@ -543,7 +597,7 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
 
         if hls_model_present:
             print('Profiling activations' + after)
-            data = activations_hlsmodel(hls_model, X, fmt='summary', plot=plot)
+            data = activations_hlsmodel(hls_model, X, fmt='summary', plot=plot, batch_size=batch_size)
             aph = plots[plot](data, fmt='summary')
 
             t_data = activation_types_hlsmodel(hls_model)
@@ -552,7 +606,7 @@ def numerical(model=None, hls_model=None, X=None, plot='boxplot'):
             plt.title('Distribution of (non-zero) activations (final / after optimization)')
             plt.tight_layout()
 
-    if hls_model_present and os.path.exists(tmp_output_dir):
+    if tmp_output_dir is not None and os.path.exists(tmp_output_dir):
         shutil.rmtree(tmp_output_dir)
 
     return wp, wph, ap, aph
@@ -677,7 +731,8 @@ def _dist_diff(ymodel, ysim):
 
 
 def compare(keras_model, hls_model, X, plot_type='dist_diff'):
-    """Compare each layer's output in keras and hls model. Note that the hls_model should not be compiled before using this.
+    """Compare each layer's output in keras and hls model. The hls_model is compiled with tracing on first use, and the
+    compiled library is reused by subsequent calls.
 
     Args:
         keras_model: Original keras model.
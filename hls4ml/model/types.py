@@ -677,6 +677,61 @@ class StructWrapperVariable(TensorVariable):
         return cls(tv)
 
 
+class SparseWeights:
+    """Weights stored in the coordinate (COO) format, i.e., only the non-zero values and their indices.
+
+    The indices use the smallest unsigned integer type that can address every dimension of the dense array, and are
+    ordered as the values of the dense array in C order.
+
+    Args:
+        indices (ndarray): The indices of the non-zero values, of shape ``(nnz, ndim)``.
+        values (ndarray): The non-zero values, of shape ``(nnz,)``.
+        shape (tuple): Shape of the dense array.
+    """
+
+    def __init__(self, indices, values, shape):
+        self.indices = indices
+        self.values = values
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_dense(cls, data):
+        data = np.asarray(data)
+        index_dtype = np.min_scalar_type(max(max(data.shape, default=1) - 1, 0))
+        flat = data.ravel()
+        nonzero = np.flatnonzero(flat)
+        indices = np.empty((nonzero.size, data.ndim), dtype=index_dtype)
+        for axis, index in enumerate(np.unravel_index(nonzero, data.shape)):
+            indices[:, axis] = index
+        return cls(indices, flat[nonzero], data.shape)
+
+    @property
+    def nnz(self):
+        return self.values.size
+
+    @property
+    def density(self):
+        size = int(np.prod(self.shape))
+        return self.nnz / size if size > 0 else 0.0
+
+    def count_nonzero(self, axis):
+        """Number of non-zero values in each slice of the dense array along an axis, e.g., ``axis=1`` counts the
+        non-zero weights of each output (column) of a ``Dense`` layer, and the zero entries are the pruned outputs.
+
+        Args:
+            axis (int): The axis to count along.
+
+        Returns:
+            ndarray: The number of non-zero values, of shape ``(shape[axis],)``.
+        """
+        return np.bincount(self.indices[:, axis], minlength=self.shape[axis])
+
+    def to_dense(self):
+        data = np.zeros(self.shape, dtype=self.values.dtype)
+        data[tuple(self.indices.T)] = self.values
+        return data
+
+
 class WeightVariable(Variable):
     """Class representing a tensor containing the weights of a layer.
 
@@ -704,17 +759,45 @@ class WeightVariable(Variable):
         self.update_precision(precision)
         self.quantizer = quantizer
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._sparse = None
+
+    @property
+    def sparse(self):
+        """The non-zero weights in the COO format (see ``SparseWeights``), computed on first access.
+
+        Assigning a new array to ``data`` (as the optimizers do) invalidates it, modifying ``data`` in place doesn't.
+        """
+        if self._sparse is None:
+            self._sparse = SparseWeights.from_dense(self.data)
+        return self._sparse
+
+    def _format_data(self):
+        # Only the non-zero values are formatted, the zeros share a single string. Negative zeros are kept apart, as they
+        # may be formatted with a sign.
+        flat = np.asarray(self.data).ravel()
+        fmt = self.precision_fmt.format
+        if flat.dtype.kind not in 'iuf':
+            return [fmt(value) for value in flat]
+        formatted = np.full(flat.size, fmt(flat.dtype.type(0)), dtype=object)
+        nonzero = flat != 0
+        if flat.dtype.kind == 'f':
+            nonzero |= np.signbit(flat)
+        formatted[nonzero] = [fmt(value) for value in flat[nonzero].tolist()]
+        return formatted.tolist()
+
     def __iter__(self):
-        self._iterator = np.nditer(self.data, order='C')
+        self._iterator = iter(self._format_data())
         return self
 
     def __next__(self):
-        if not self._iterator.finished:
-            value = self._iterator[0]
-            self._iterator.iternext()
-            return self.precision_fmt.format(value)
-        else:
-            raise StopIteration
+        return next(self._iterator)
 
     next = __next__
 
@@ -774,23 +857,18 @@ class CompressedWeightVariable(WeightVariable):
             self.data_length += 1
         self.nonzeros = np.prod(data.shape) - self.nzeros + self.extra_zeros
 
-        # Compress the array
-        weights = []
-        extra_nzero_cnt = self.extra_zeros
-        it = np.nditer(data, order='C', flags=['multi_index'])
-        max_idx = 0
-        while not it.finished:
-            val = it[0]
-            if not (val == 0 and extra_nzero_cnt < 1):
-                if val == 0:
-                    extra_nzero_cnt -= 1
-                if it.multi_index[0] > max_idx:
-                    max_idx = it.multi_index[0]
-                if it.multi_index[1] > max_idx:
-                    max_idx = it.multi_index[1]
-                weights.append([it.multi_index[1], it.multi_index[0], val])
-            it.iternext()
-        weights.sort()
+        # Compress the array, keeping the first extra zeros (in C order) as padding
+        sparse = self.sparse
+        flat = np.asarray(data).ravel()
+        selected = np.flatnonzero(flat)
+        if self.extra_zeros > 0:
+            selected = np.sort(np.concatenate([selected, np.flatnonzero(flat == 0)[: self.extra_zeros]]))
+        index = np.unravel_index(selected, data.shape)
+        rows, cols = index[0], index[1]
+        order = np.lexsort((rows, cols))
+        rows, cols, values = rows[order], cols[order], flat[selected[order]]
+        weights = [list(entry) for entry in zip(cols.tolist(), rows.tolist(), values)]
+        max_idx = int(max(rows.max(), cols.max())) if selected.size > 0 else 0
 
         index_precision = 32
         if max_idx > 0:
@@ -798,6 +876,7 @@ class CompressedWeightVariable(WeightVariable):
         self.type = CompressedType(type_name, precision, IntegerPrecisionType(width=index_precision, signed=False), **kwargs)
 
         self.data = weights
+        self._sparse = sparse
 
     def __iter__(self):
         self._iterator = iter(self.data)
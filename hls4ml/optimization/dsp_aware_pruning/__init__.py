@@ -32,6 +32,8 @@ def optimize_keras_model_for_hls4ml(
     tuner='Bayesian',
     knapsack_solver='CBC_MIP',
     regularization_range=default_regularization_range,
+    n_jobs=None,
+    max_trials=10,
 ):
     """
     Top-level function for optimizing a Keras model, given hls4ml config and a hardware objective(s)
@@ -66,10 +68,12 @@ def optimize_keras_model_for_hls4ml(
         cutoff_bad_trials (int): After how many bad trials (performance below threshold),
             should model pruning / weight sharing stop
         directory (string): Directory to store temporary results
-        tuner (str): Tuning algorithm, choose between Bayesian, Hyperband and Manual
+        tuner (str): Tuning algorithm, choose between Bayesian, Hyperband, Parallel and Manual
         knapsack_solver (str): Algorithm to solve Knapsack problem when optimizing;
             default usually works well; for very large networks, greedy algorithm might be more suitable
         regularization_range (list): List of suitable hyperparameters for weight decay
+        n_jobs (int): Number of worker processes of the Parallel tuner; defaults to the number of CPUs
+        max_trials (int): Number of trials of the Bayesian and Parallel tuners
 
     Returns:
         keras.Model: Optimized model
@@ -105,4 +109,6 @@ def optimize_keras_model_for_hls4ml(
         tuner=tuner,
         knapsack_solver=knapsack_solver,
         regularization_range=regularization_range,
+        n_jobs=n_jobs,
+        max_trials=max_trials,
     )
@@ -41,6 +41,8 @@ def optimize_model(
     tuner='Bayesian',
     knapsack_solver='CBC_MIP',
     regularization_range=default_regularization_range,
+    n_jobs=None,
+    max_trials=10,
 ):
     """
     Top-level function for optimizing a Keras model, given objectives
@@ -76,10 +78,12 @@ def optimize_model(
         cutoff_bad_trials (int): After how many bad trials (performance below threshold),
             should model pruning / weight sharing stop
         directory (string): Directory to store temporary results
-        tuner (str): Tuning algorithm, choose between Bayesian, Hyperband and Manual
+        tuner (str): Tuning algorithm, choose between Bayesian, Hyperband, Parallel and Manual
         knapsack_solver (str): Algorithm to solve Knapsack problem when optimizing;
             default usually works well; for very large networks, greedy algorithm might be more suitable
         regularization_range (list): List of suitable hyperparameters for weight decay
+        n_jobs (int): Number of worker processes of the Parallel tuner; defaults to the number of CPUs
+        max_trials (int): Number of trials of the Bayesian and Parallel tuners
 
     Returns:
         keras.Model: Optimized model
@@ -151,6 +155,7 @@ def optimize_model(
             model_attributes[layer.name].optimization_attributes = None
 
     # Add regularization loss to optimizable layers
+    # The Parallel tuner trains from shared-memory views of the arrays, rather than from the datasets
     optimizable_model = build_optimizable_model(
         model,
         model_attributes,
@@ -158,14 +163,16 @@ def optimize_model(
         loss_fn,
         validation_metric,
         increasing,
-        train_dataset,
-        validation_dataset,
+        (X_train, y_train) if tuner == 'Parallel' else train_dataset,
+        (X_val, y_val) if tuner == 'Parallel' else validation_dataset,
         batch_size,
-        epochs // 2,
+        max(epochs // 2, 1),
         verbose=verbose,
         directory=directory,
         tuner=tuner,
         regularization_range=regularization_range,
+        n_jobs=n_jobs,
+        max_trials=max_trials,
     )
 
     # Create class for masked backprop (weight freezing)
@@ -1,4 +1,9 @@
+import concurrent.futures
+import copy
+import multiprocessing
+import os
 import re
+from multiprocessing import shared_memory
 
 import keras_tuner as kt
 import numpy as np
@@ -39,57 +44,75 @@ class HyperOptimizationModel(kt.HyperModel):
         self.regularization_range = regularization_range
 
     def build(self, hp):
-        model_to_prune = tf.keras.models.clone_model(self.model)
         default_regularizaton = self.regularization_range[len(self.regularization_range) // 2]
 
         # Make regularization loss a tunable hyperparameter
-        for layer in model_to_prune.layers:
-            if isinstance(layer, SUPPORTED_LAYERS) and self.attributes[layer.name].optimizable:
-                structure_type = self.attributes[layer.name].optimization_attributes.structure_type
-                block_shape = self.attributes[layer.name].optimization_attributes.block_shape
-                pattern_offset = self.attributes[layer.name].optimization_attributes.pattern_offset
-                consecutive_patterns = self.attributes[layer.name].optimization_attributes.consecutive_patterns
-
-                pruning = self.attributes[layer.name].optimization_attributes.pruning
-                weight_sharing = self.attributes[layer.name].optimization_attributes.weight_sharing
-
-                alpha = (
-                    hp.Choice(f'{layer.name}_alpha', values=self.regularization_range, default=default_regularizaton)
-                    if pruning
-                    else 0
+        return build_regularized_model(
+            self.model,
+            self.attributes,
+            self.optimizer,
+            self.loss_fn,
+            self.validation_metric,
+            lambda name: hp.Choice(name, values=self.regularization_range, default=default_regularizaton),
+        )
+
+
+def build_regularized_model(model, attributes, optimizer, loss_fn, validation_metric, regularization):
+    """
+    Function adding the regularization loss to the optimizable layers of a model
+
+    Args:
+        model (keras.Model): Baseline model
+        attributes (dict): Layer-wise dictionary of attributes
+        optimizer (keras.optimizers.Optimizer or equivalent string description): Model optimizer
+        loss_fn (keras.losses.Loss or equivalent string description): Model loss function
+        validation_metric (keras.metrics.Metric or equivalent string description): Model validation metric
+        regularization (callable): Function returning the regularization factor, given the name of the hyperparameter;
+            <layer>_alpha for pruning and <layer>_beta for weight sharing
+
+    Returns:
+        keras.Model: Compiled model, with the weights of the baseline model
+    """
+    model_to_prune = tf.keras.models.clone_model(model)
+    for layer in model_to_prune.layers:
+        if isinstance(layer, SUPPORTED_LAYERS) and attributes[layer.name].optimizable:
+            structure_type = attributes[layer.name].optimization_attributes.structure_type
+            block_shape = attributes[layer.name].optimization_attributes.block_shape
+            pattern_offset = attributes[layer.name].optimization_attributes.pattern_offset
+            consecutive_patterns = attributes[layer.name].optimization_attributes.consecutive_patterns
+
+            pruning = attributes[layer.name].optimization_attributes.pruning
+            weight_sharing = attributes[layer.name].optimization_attributes.weight_sharing
+
+            alpha = regularization(f'{layer.name}_alpha') if pruning else 0
+            beta = regularization(f'{layer.name}_beta') if weight_sharing else 0
+
+            if isinstance(layer, (Dense, QDense)):
+                layer.kernel_regularizer = DenseRegularizer(
+                    alpha,
+                    beta,
+                    norm=1,
+                    structure_type=structure_type,
+                    block_shape=block_shape,
+                    pattern_offset=pattern_offset,
+                    consecutive_patterns=consecutive_patterns,
                 )
-                beta = (
-                    hp.Choice(f'{layer.name}_beta', values=self.regularization_range, default=default_regularizaton)
-                    if weight_sharing
-                    else 0
+            elif isinstance(layer, (Conv2D, QConv2D)):
+                layer.kernel_regularizer = Conv2DRegularizer(
+                    alpha,
+                    beta,
+                    norm=1,
+                    structure_type=structure_type,
+                    pattern_offset=pattern_offset,
+                    consecutive_patterns=consecutive_patterns,
                 )
 
-                if isinstance(layer, (Dense, QDense)) and self.attributes[layer.name].optimizable:
-                    layer.kernel_regularizer = DenseRegularizer(
-                        alpha,
-                        beta,
-                        norm=1,
-                        structure_type=structure_type,
-                        block_shape=block_shape,
-                        pattern_offset=pattern_offset,
-                        consecutive_patterns=consecutive_patterns,
-                    )
-                elif isinstance(layer, (Conv2D, QConv2D)) and self.attributes[layer.name].optimizable:
-                    layer.kernel_regularizer = Conv2DRegularizer(
-                        alpha,
-                        beta,
-                        norm=1,
-                        structure_type=structure_type,
-                        pattern_offset=pattern_offset,
-                        consecutive_patterns=consecutive_patterns,
-                    )
-
-        # Rebuild model graph
-        model_to_prune = tf.keras.models.model_from_json(model_to_prune.to_json(), custom_objects=co)
-        model_to_prune.set_weights(self.model.get_weights())
-        model_to_prune.compile(optimizer=self.optimizer, loss=self.loss_fn, metrics=[self.validation_metric])
-
-        return model_to_prune
+    # Rebuild model graph
+    model_to_prune = tf.keras.models.model_from_json(model_to_prune.to_json(), custom_objects=co)
+    model_to_prune.set_weights(model.get_weights())
+    model_to_prune.compile(optimizer=optimizer, loss=loss_fn, metrics=[validation_metric])
+
+    return model_to_prune
 
 
 default_regularization_range = np.logspace(-6, -2, num=16).tolist()
@@ -110,6 +133,8 @@ def build_optimizable_model(
     directory=TMP_DIRECTORY,
     tuner='Bayesian',
     regularization_range=default_regularization_range,
+    n_jobs=None,
+    max_trials=10,
 ):
     """
     Function identifying optimizable layers and adding a regularization loss
@@ -122,6 +147,8 @@ def build_optimizable_model(
     it performs quite well, fast. However, older version of Keras Tuner had a crashing bug with it.
     - In general, the directory does not need to be specified. However, if pruning several models simultaneously,
     to avoid conflicting intermediate results, it is useful to specify directory.
+    - The Parallel tuner trains randomly sampled hyperparameters in separate CPU processes, see ParallelTrialExecutor.
+    It requires the training and validation data as (inputs, labels) tuples of NumPy arrays, instead of TF Datasets.
 
     Args:
         model (keras.Model): Model to be optimized
@@ -129,15 +156,17 @@ def build_optimizable_model(
         optimizer (keras.optimizers.Optimizer): Optimizer used during training
         loss_fn (keras.losses.Loss): Loss function used during training
         validation_metric (keras.metrics.Metric): Validation metric, used as a baseline
-        train_dataset (tf.Dataset): Training inputs and labels, in the form of an iterable TF Dataset
-        validation_dataset (tf.Dataset): Validation inputs and labels, in the form of an iterable TF Dataset
+        train_dataset (tf.Dataset or tuple): Training inputs and labels, in the form of an iterable TF Dataset
+        validation_dataset (tf.Dataset or tuple): Validation inputs and labels, in the form of an iterable TF Dataset
         batch_size (int): Batch size during training
         epochs (int): Maximum number of epochs to fine-tune model, in one iteration of pruning
         verbose (bool): Whether to log tuner outputs to the console
         directory (string): Directory to store tuning results
-        tuner (str): Tuning algorithm, choose between Bayesian and Hyperband
+        tuner (str): Tuning algorithm, choose between Bayesian, Hyperband, Parallel and Manual
         regularization_range (list): List of suitable hyperparameters for weight decay
         learning_rate_range (list): List of suitable hyperparameters for learning rate
+        n_jobs (int): Number of worker processes of the Parallel tuner; defaults to the number of CPUs
+        max_trials (int): Number of trials of the Bayesian and Parallel tuners
 
     Returns:
         keras.Model: Model prepared for optimization
@@ -146,46 +175,24 @@ def build_optimizable_model(
     # TODO - Maybe we could extend this to be hyper-parameters per layer? or layer-type?
     # Currently, the same (manually-set) hyper-parameter is set for every layer
     if tuner == 'Manual':
-        model_to_prune = tf.keras.models.clone_model(model)
-        for layer in model_to_prune.layers:
-            if isinstance(layer, SUPPORTED_LAYERS) and attributes[layer.name].optimizable:
-                structure_type = attributes[layer.name].optimization_attributes.structure_type
-                block_shape = attributes[layer.name].optimization_attributes.block_shape
-                pattern_offset = attributes[layer.name].optimization_attributes.pattern_offset
-                consecutive_patterns = attributes[layer.name].optimization_attributes.consecutive_patterns
-
-                pruning = attributes[layer.name].optimization_attributes.pruning
-                weight_sharing = attributes[layer.name].optimization_attributes.weight_sharing
-
-                alpha = regularization_range[0] if pruning else 0
-                beta = regularization_range[0] if weight_sharing else 0
-
-                if isinstance(layer, (Dense, QDense)) and attributes[layer.name].optimizable:
-                    layer.kernel_regularizer = DenseRegularizer(
-                        alpha,
-                        beta,
-                        norm=1,
-                        structure_type=structure_type,
-                        block_shape=block_shape,
-                        pattern_offset=pattern_offset,
-                        consecutive_patterns=consecutive_patterns,
-                    )
-                elif isinstance(layer, (Conv2D, QConv2D)) and attributes[layer.name].optimizable:
-                    layer.kernel_regularizer = Conv2DRegularizer(
-                        alpha,
-                        beta,
-                        norm=1,
-                        structure_type=structure_type,
-                        pattern_offset=pattern_offset,
-                        consecutive_patterns=consecutive_patterns,
-                    )
-
-        # Rebuild model graph
-        model_to_prune = tf.keras.models.model_from_json(model_to_prune.to_json(), custom_objects=co)
-        model_to_prune.set_weights(model.get_weights())
-        model_to_prune.compile(optimizer=optimizer, loss=loss_fn, metrics=[validation_metric])
-
-        return model_to_prune
+        return build_regularized_model(
+            model, attributes, optimizer, loss_fn, validation_metric, lambda name: regularization_range[0]
+        )
+
+    # User opted for hyper-parameter tuning, with independent trials in parallel processes
+    elif tuner == 'Parallel':
+        executor = ParallelTrialExecutor(
+            model,
+            attributes,
+            optimizer,
+            loss_fn,
+            validation_metric,
+            increasing,
+            regularization_range,
+            n_jobs=n_jobs,
+            max_trials=max_trials,
+        )
+        return executor.search(train_dataset, validation_dataset, batch_size, epochs, verbose=verbose)
 
     # User opted for hyper-parameter tuning
     else:
@@ -200,7 +207,7 @@ def build_optimizable_model(
                     model, attributes, optimizer, loss_fn, validation_metric, regularization_range
                 ),
                 objective=kt.Objective(objective_name, objective_direction),
-                max_trials=10,
+                max_trials=max_trials,
                 overwrite=True,
                 directory=directory + '/tuning',
             )
@@ -256,3 +263,262 @@ def remove_custom_regularizers(model):
     model = tf.keras.models.model_from_json(model.to_json(), custom_objects=co)
     model.set_weights(weights)
     return model
+
+
+class ParallelTrialExecutor:
+    """
+    Helper class for tuning the regularization hyperparameters with independent trials, trained in parallel processes
+
+    Every trial fine-tunes the model with randomly sampled regularization factors (the first trial uses the default,
+    middle value of the range for every layer), in a pool of CPU worker processes. The training and validation data are
+    copied once to shared memory, and every worker trains from NumPy views of it, instead of its own copy.
+    Losing trials are stopped early, with the median stopping rule: after each epoch, a trial stops if its best
+    validation metric is worse than the median of the best validation metrics of the other trials, up to that epoch.
+
+    Notes:
+    - The workers are started with the 'spawn' method, as TensorFlow is not fork-safe. Therefore, scripts using this
+    executor need an ``if __name__ == '__main__':`` guard.
+    - The workers share the CPU threads evenly, so the total number of threads stays the same as with serial tuning.
+
+    Args:
+        model (keras.Model): Baseline model
+        attributes (dict): Layer-wise dictionary of attributes
+        optimizer (keras.optimizers.Optimizer or equivalent string description): Model optimizer
+        loss_fn (keras.losses.Loss or equivalent string description): Model loss function
+        validation_metric (keras.metrics.Metric or equivalent string description): Model validation metric
+        increasing (boolean): If the metric improves with increased values
+        regularization_range (list): List of suitable hyperparameters for weight decay
+        n_jobs (int): Number of worker processes; defaults to the number of CPUs
+        max_trials (int): Number of trials
+        seed (int): Seed for sampling the hyperparameters and shuffling the training data
+    """
+
+    def __init__(
+        self,
+        model,
+        attributes,
+        optimizer,
+        loss_fn,
+        validation_metric,
+        increasing,
+        regularization_range=default_regularization_range,
+        n_jobs=None,
+        max_trials=10,
+        seed=0,
+    ):
+        self.model = model
+        self.attributes = attributes
+        self.optimizer = optimizer
+        self.loss_fn = loss_fn
+        self.validation_metric = validation_metric
+        self.increasing = increasing
+        self.regularization_range = regularization_range
+        self.n_jobs = n_jobs if n_jobs is not None else os.cpu_count()
+        self.max_trials = max_trials
+        self.seed = seed
+
+    def sample_hyperparameters(self):
+        """
+        Samples the regularization factors of every trial
+
+        Returns:
+            list: List of dictionaries, mapping the hyperparameter names (<layer>_alpha, <layer>_beta) to their values
+        """
+        names = []
+        for layer in self.model.layers:
+            if isinstance(layer, SUPPORTED_LAYERS) and self.attributes[layer.name].optimizable:
+                if self.attributes[layer.name].optimization_attributes.pruning:
+                    names.append(f'{layer.name}_alpha')
+                if self.attributes[layer.name].optimization_attributes.weight_sharing:
+                    names.append(f'{layer.name}_beta')
+
+        rng = np.random.default_rng(self.seed)
+        default_regularizaton = self.regularization_range[len(self.regularization_range) // 2]
+        trials = [dict.fromkeys(names, default_regularizaton)]
+        for _ in range(self.max_trials - 1):
+            values = rng.choice(self.regularization_range, size=len(names))
+            trials.append({name: float(value) for name, value in zip(names, values)})
+        return trials
+
+    def search(self, train_data, validation_data, batch_size, epochs, verbose=False):
+        """
+        Runs the trials and returns the model of the best one
+
+        Args:
+            train_data (tuple): Training inputs and labels, as NumPy arrays
+            validation_data (tuple): Validation inputs and labels, as NumPy arrays
+            batch_size (int): Batch size during training
+            epochs (int): Maximum number of epochs to fine-tune the model, in every trial; at least one
+            verbose (bool): Whether to log the result of every trial to the console
+
+        Returns:
+            keras.Model: Model with the regularization factors and the fine-tuned weights of the best trial
+        """
+        if not all(isinstance(data, tuple) and len(data) == 2 for data in (train_data, validation_data)):
+            raise Exception('Parallel tuning requires the training and validation data as (inputs, labels) tuples')
+        if epochs < 1:
+            raise ValueError(f'Parallel tuning requires at least one epoch per trial, got {epochs}')
+
+        trials = self.sample_hyperparameters()
+        arrays = [np.ascontiguousarray(array) for array in (*train_data, *validation_data)]
+        scores = np.full((len(trials), epochs), np.nan)
+
+        blocks = []
+        try:
+            for array in (*arrays, scores):
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                blocks.append(block)
+            specs = [(block.name, array.shape, array.dtype.str) for block, array in zip(blocks, (*arrays, scores))]
+
+            state = {
+                'model': self.model.to_json(),
+                'weights': self.model.get_weights(),
+                'attributes': _worker_attributes(self.attributes),
+                'optimizer': _serialize(self.optimizer, tf.keras.optimizers),
+                'loss_fn': _serialize(self.loss_fn, tf.keras.losses),
+                'validation_metric': _serialize(self.validation_metric, tf.keras.metrics),
+                'data': specs[:-1],
+                'scores': specs[-1],
+                'threads': max(1, os.cpu_count() // self.n_jobs),
+            }
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_trial_worker,
+                initargs=(state,),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_trial, trial, hyperparameters, batch_size, epochs, self.increasing, self.seed)
+                    for trial, hyperparameters in enumerate(trials)
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        best = None
+        for trial, (score, weights, trained_epochs) in enumerate(results):
+            if verbose:
+                print(f'Trial {trial}: {trials[trial]} - epochs: {trained_epochs} - performance on validation set: {score}')
+            if best is None or (score > results[best][0] if self.increasing else score < results[best][0]):
+                best = trial
+
+        best_model = build_regularized_model(
+            self.model, self.attributes, self.optimizer, self.loss_fn, self.validation_metric, trials[best].__getitem__
+        )
+        best_model.set_weights(results[best][1])
+        return best_model
+
+
+def _worker_attributes(attributes):
+    """
+    Copies the layer attributes read by build_regularized_model(...), for pickling to the workers
+    The inbound layers (Keras layers) and the additional information (e.g. hls4mlAttributes) are left out
+    """
+    worker_attributes = {}
+    for name, layer_attributes in attributes.items():
+        worker_attributes[name] = copy.copy(layer_attributes)
+        worker_attributes[name].inbound_layers = []
+        worker_attributes[name].args = {}
+    return worker_attributes
+
+
+def _serialize(obj, module):
+    return obj if isinstance(obj, str) else module.serialize(obj)
+
+
+def _deserialize(obj, module):
+    # String descriptions are passed to compile(...) as they are, since their meaning can depend on the loss function
+    return obj if isinstance(obj, str) else module.get(obj)
+
+
+_trial_worker = {}
+
+
+def _init_trial_worker(state):
+    tf.config.threading.set_intra_op_parallelism_threads(state['threads'])
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # Attach to the shared memory, the blocks are kept open for the lifetime of the worker
+    blocks = []
+    arrays = []
+    for name, shape, dtype in [*state['data'], state['scores']]:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype, buffer=block.buf))
+
+    _trial_worker.update(state)
+    _trial_worker['blocks'] = blocks
+    _trial_worker['data'] = arrays[:-1]
+    _trial_worker['scores'] = arrays[-1]
+
+
+def _dataset(X, y, batch_size, rng=None):
+    """
+    Dataset of batches sliced from the (shared) arrays, so the complete arrays are never copied into tensors
+    """
+
+    def batches():
+        indices = rng.permutation(X.shape[0]) if rng is not None else np.arange(X.shape[0])
+        for start in range(0, X.shape[0], batch_size):
+            batch = np.sort(indices[start : start + batch_size])
+            yield X[batch], y[batch]
+
+    signature = (
+        tf.TensorSpec((None,) + X.shape[1:], tf.as_dtype(X.dtype)),
+        tf.TensorSpec((None,) + y.shape[1:], tf.as_dtype(y.dtype)),
+    )
+    dataset = tf.data.Dataset.from_generator(batches, output_signature=signature)
+    return dataset.apply(tf.data.experimental.assert_cardinality(-(-X.shape[0] // batch_size)))
+
+
+def _is_losing(scores, trial, epoch, increasing):
+    """
+    Median stopping rule - a trial is losing if its best score so far is worse than the median of the best scores
+    Of the other trials, up to the same epoch; at least two other trials need to have reached the epoch
+    """
+    reported = ~np.isnan(scores[:, epoch])
+    reported[trial] = False
+    if np.count_nonzero(reported) < 2:
+        return False
+
+    history = scores[:, : epoch + 1]
+    best = np.nanmax if increasing else np.nanmin
+    median = np.median(best(history[reported], axis=1))
+    return best(history[trial]) < median if increasing else best(history[trial]) > median
+
+
+def _run_trial(trial, hyperparameters, batch_size, epochs, increasing, seed):
+    state = _trial_worker
+    model = tf.keras.models.model_from_json(state['model'], custom_objects=co)
+    model.set_weights(state['weights'])
+    model = build_regularized_model(
+        model,
+        state['attributes'],
+        _deserialize(state['optimizer'], tf.keras.optimizers),
+        _deserialize(state['loss_fn'], tf.keras.losses),
+        _deserialize(state['validation_metric'], tf.keras.metrics),
+        hyperparameters.__getitem__,
+    )
+
+    X_train, y_train, X_val, y_val = state['data']
+    train_dataset = _dataset(X_train, y_train, batch_size, rng=np.random.default_rng([seed, trial]))
+    validation_dataset = _dataset(X_val, y_val, batch_size)
+    scores = state['scores']
+
+    best_score = None
+    best_weights = None
+    for epoch in range(epochs):
+        model.fit(train_dataset, epochs=1, shuffle=False, verbose=0)
+        score = model.evaluate(validation_dataset, verbose=0, return_dict=False)[-1]
+        scores[trial, epoch] = score
+        if best_score is None or (score > best_score if increasing else score < best_score):
+            best_score = score
+            best_weights = model.get_weights()
+
+        if _is_losing(scores, trial, epoch, increasing):
+            break
+
+    return best_score, best_weights, epoch + 1
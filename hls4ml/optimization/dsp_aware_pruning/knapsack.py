@@ -247,16 +247,14 @@ def __solve_knapsack_equal_weights(values, weights, capacity):
     # Find items with the highest value
     indices = np.argsort(values)
 
-    # Greedily select item with the highest ratio
-    optimal = 0
-    selected = []
-    accum = np.zeros_like(capacity)
-    for i in reversed(indices):
-        if np.all((accum + weights[:, i]) <= capacity):
-            selected.append(i)
-            optimal += values[i]
-            accum += weights[:, i]
-        else:
-            break
-
-    return optimal, selected
+    # Greedily select items with the highest value; since all the items have the same weight,
+    # The number of selected items is the largest one for which the accumulated weight satisfies every constraint
+    n_selected = values.shape[0]
+    for weight, limit in zip(weights[:, 0], capacity):
+        if weight > 0:
+            n_selected = min(n_selected, max(int(limit // weight), 0))
+        elif limit < 0:
+            n_selected = 0
+
+    selected = indices[::-1][:n_selected]
+    return np.sum(values[selected]), selected.tolist()
@@ -1,5 +1,7 @@
+import copy
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 import numpy as np
 
@@ -83,6 +85,89 @@ class ObjectiveEstimator(ABC):
         """
         pass
 
+    @classmethod
+    def cached_layer_resources(self, layer_attributes):
+        """
+        Memoized layer_resources(...), computed once for every layer configuration
+        A layer configuration includes all the layer attributes, e.g. weight shape, structure type, pattern offset
+        And hls4ml attributes (reuse factor, precision etc.), so the estimate is recomputed if any of them changes
+
+        Args:
+            layer_attributes (hls4ml.optimization.attributes.LayerAttributes): Layer attributes
+
+        Returns:
+            resources (np.array, int): total resources (w.r.t every dimension of the objective) used
+        """
+        return _get_estimate(self, self.layer_resources, layer_attributes)
+
+    @classmethod
+    def structure_savings(self, layer_attributes, n_structures):
+        """
+        Vectorized layer_savings(...), for all the structures of a layer at once
+        All the structures of a layer have the same savings; they are memoized like in cached_layer_resources(...)
+
+        Args:
+            layer_attributes (hls4ml.optimization.attributes.LayerAttributes): Layer attributes
+            n_structures (int): Number of structures (weights, filters, patterns, blocks) in the layer
+
+        Returns:
+            savings (np.array, int): Read-only matrix of savings,
+                With one row for every dimension of the objective and one column for every structure
+        """
+        savings = _get_estimate(self, self.layer_savings, layer_attributes)
+        return np.broadcast_to(savings[:, np.newaxis], (savings.shape[0], n_structures))
+
+
+# Bound on the number of memoized estimates, i.e. layer configurations, shared by all the objectives
+ESTIMATE_CACHE_SIZE = 4096
+
+
+def _freeze(value):
+    """
+    Helper function converting (nested) attributes into a hashable key
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(v) for v in value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return (type(value).__name__, _freeze(vars(value)))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return str(value)
+
+
+class _AttributesKey:
+    """
+    Hashable view of the layer attributes, compared by value
+    The inbound layers are Keras layers (not needed by the estimates), whose attributes reference the whole model;
+    they are left out of the key and of the copy of the attributes kept by the cache
+    """
+
+    def __init__(self, layer_attributes):
+        self.layer_attributes = copy.copy(layer_attributes)
+        self.layer_attributes.inbound_layers = []
+        self.key = _freeze(vars(self.layer_attributes))
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, _AttributesKey) and self.key == other.key
+
+
+@lru_cache(maxsize=ESTIMATE_CACHE_SIZE)
+def _cached_estimate(estimator, method_name, attributes_key):
+    estimate = np.asarray(getattr(estimator, method_name)(attributes_key.layer_attributes))
+    estimate.setflags(write=False)
+    return estimate
+
+
+def _get_estimate(estimator, method, layer_attributes):
+    return _cached_estimate(estimator, method.__name__, _AttributesKey(layer_attributes))
+
 
 class ParameterEstimator(ObjectiveEstimator):
     """
@@ -0,0 +1,256 @@
+import concurrent.futures
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import warnings
+
+import yaml
+
+from hls4ml.report.catapult_report import parse_catapult_report
+from hls4ml.report.libero_report import parse_libero_report
+from hls4ml.report.oneapi_report import parse_oneapi_report
+from hls4ml.report.quartus_report import parse_quartus_report
+from hls4ml.report.vivado_report import aggregate_graph_reports, parse_vivado_report
+
+# Files read by the report parsers of each backend (relative to the output directory of the project). A build is
+# re-parsed only if one of these files was added, removed or modified since it was last indexed.
+_vivado_report_files = [
+    'project.tcl',
+    '*.rpt',
+    'tb_data/*.log',
+    '*_prj/*.app',
+    '*_prj/*/syn/report/*_csynth.xml',
+    '*_prj/*/sim/report/*_cosim.rpt',
+    '*_prj/*/sim/*/*.transaction.xml',
+    '*_vivado_accelerator/project_1.runs/impl_1/*_timing_summary_routed.rpt',
+]
+
+_report_files = {
+    'vivado': _vivado_report_files,
+    'vitis': _vivado_report_files,
+    'vivadoaccelerator': _vivado_report_files,
+    'quartus': ['build_lib.sh', '*.prj/reports/lib/*.js'],
+    'oneapi': ['*/*.prj/reports/resources/json/*.ndjson'],
+    'catapult': ['hls4ml_config.yml', 'tb_data/*.log', '*/*/vivado_concat_v/*.rpt', '*/*/nnet_layer_results.txt'],
+    'libero': ['hls_output/reports/summary.results.rpt'],
+}
+
+
+def _parse_quartus_report(hls_dir):
+    return parse_quartus_report(hls_dir, write_to_file=False)
+
+
+_report_parsers = {
+    'vivado': parse_vivado_report,
+    'vitis': parse_vivado_report,
+    'vivadoaccelerator': parse_vivado_report,
+    'quartus': _parse_quartus_report,
+    'oneapi': parse_oneapi_report,
+    'catapult': parse_catapult_report,
+    'libero': parse_libero_report,
+}
+
+
+def _detect_backend(build_dir):
+    config_file = os.path.join(build_dir, 'hls4ml_config.yml')
+    if not os.path.isfile(config_file):
+        return None
+    # The config may contain custom tags (e.g., for the Keras model), only the top-level 'Backend' key is needed
+    with open(config_file) as f:
+        for line in f:
+            if line.startswith('Backend:'):
+                return str(yaml.safe_load(line)['Backend']).lower()
+    return None
+
+
+def _report_signature(build_dir, backend):
+    """Hash of the paths, sizes and modification times of the report files of a build."""
+    entries = []
+    for pattern in _report_files[backend]:
+        for path in glob.glob(os.path.join(glob.escape(build_dir), pattern)):
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append(f'{os.path.relpath(path, build_dir)}:{stat.st_size}:{stat.st_mtime_ns}')
+    return hashlib.sha1('\n'.join(sorted(entries)).encode()).hexdigest()
+
+
+def _parse_build(build_dir, backend):
+    """Parses the reports of a build, returning ``None`` if the parser failed."""
+    # The parsers report missing files on stdout, which is too verbose for thousands of builds
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            report = _report_parsers[backend](build_dir)
+        except Exception:
+            return None
+    return report if report is not None else {}
+
+
+class ReportIndex:
+    """Persistent index of the parsed reports of many build directories.
+
+    The parsed report of each build is stored in an SQLite database, together with a signature of the report files
+    it was parsed from (their paths, sizes and modification times). Updating the index only re-parses the builds whose
+    report files changed since they were last indexed, in parallel, so indexing thousands of builds is done once and
+    re-scans are incremental.
+
+    Example::
+
+        with ReportIndex('reports.db') as index:
+            index.update(glob.glob('builds/*'))
+            reports = index.reports()
+
+    Args:
+        db_path (str): Path to the database file, created if it doesn't exist.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS reports '
+            '(build_dir TEXT PRIMARY KEY, backend TEXT NOT NULL, signature TEXT NOT NULL, report TEXT NOT NULL)'
+        )
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0]
+
+    def __contains__(self, build_dir):
+        return self._conn.execute('SELECT 1 FROM reports WHERE build_dir = ?', (_key(build_dir),)).fetchone() is not None
+
+    def close(self):
+        """Closes the connection to the database."""
+        self._conn.close()
+
+    def update(self, build_dirs, backend=None, n_jobs=None, prune=False):
+        """Indexes the given build directories, parsing only the new builds and the ones whose reports changed.
+
+        Args:
+            build_dirs (list(str)): The output directories of the projects to index.
+            backend (str, optional): Backend used for all the builds. If not specified, it is read from the
+                ``hls4ml_config.yml`` of each build and the builds without it are skipped.
+            n_jobs (int, optional): Number of worker processes used for parsing. If not specified, the number of CPUs
+                is used. With ``n_jobs=1``, the reports are parsed in the current process.
+            prune (bool, optional): If ``True``, builds that are in the index but not in ``build_dirs`` are removed
+                from the index. Defaults to ``False``.
+
+        Returns:
+            list(str): The build directories that were (re-)parsed. The builds whose reports failed to parse are not
+            indexed, with a warning, and are parsed again on the next update.
+        """
+        indexed = {
+            build_dir: (build_backend, signature)
+            for build_dir, build_backend, signature in self._conn.execute(
+                'SELECT build_dir, backend, signature FROM reports'
+            )
+        }
+
+        pending = []
+        seen = set()
+        for build_dir in build_dirs:
+            build_dir = _key(build_dir)
+            seen.add(build_dir)
+            build_backend = backend.lower() if backend is not None else _detect_backend(build_dir)
+            if build_backend not in _report_parsers:
+                continue
+            signature = _report_signature(build_dir, build_backend)
+            if indexed.get(build_dir) != (build_backend, signature):
+                pending.append((build_dir, build_backend, signature))
+
+        if n_jobs == 1 or len(pending) <= 1:
+            parsed = [_parse_build(build_dir, build_backend) for build_dir, build_backend, _ in pending]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                parsed = list(executor.map(_parse_build, *zip(*[(d, b) for d, b, _ in pending]), chunksize=16))
+
+        failed = [build_dir for (build_dir, _, _), report in zip(pending, parsed) if report is None]
+        if failed:
+            warnings.warn(f'Failed to parse the reports of {len(failed)} build(s), e.g., {failed[0]}', stacklevel=2)
+
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?)',
+                [(d, b, s, json.dumps(report)) for (d, b, s), report in zip(pending, parsed) if report is not None],
+            )
+            # A stale entry of a failed build would otherwise be returned as if it was up to date
+            self._conn.executemany('DELETE FROM reports WHERE build_dir = ?', [(d,) for d in failed])
+            if prune:
+                self._conn.executemany('DELETE FROM reports WHERE build_dir = ?', [(d,) for d in indexed if d not in seen])
+
+        return [build_dir for (build_dir, _, _), report in zip(pending, parsed) if report is not None]
+
+    def get(self, build_dir):
+        """Returns the indexed report of a build, or ``None`` if the build is not indexed.
+
+        Args:
+            build_dir (str): The output directory of the project.
+
+        Returns:
+            dict: The report, as returned by the ``parse_<backend>_report`` function of the backend.
+        """
+        row = self._conn.execute('SELECT report FROM reports WHERE build_dir = ?', (_key(build_dir),)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def reports(self, build_dirs=None):
+        """Returns the indexed reports.
+
+        Args:
+            build_dirs (list(str), optional): The builds to return. If not specified, all indexed builds are returned.
+
+        Returns:
+            dict: Dictionary of the reports, keyed by build directory.
+        """
+        if build_dirs is None:
+            rows = self._conn.execute('SELECT build_dir, report FROM reports ORDER BY build_dir')
+            return {build_dir: json.loads(report) for build_dir, report in rows}
+        reports = {}
+        for build_dir in build_dirs:
+            report = self.get(build_dir)
+            if report is not None:
+                reports[build_dir] = report
+        return reports
+
+    def aggregate(self, build_dirs):
+        """Aggregates the indexed reports of the builds of the subgraphs of a design, see ``aggregate_graph_reports``.
+
+        The builds without a synthesis report (e.g., not synthesized yet, or not indexed) can't be aggregated. They are
+        listed, with a warning, under ``MissingBuilds`` in the result, and the totals cover only the other builds.
+
+        Args:
+            build_dirs (list(str)): The output directories of the subgraphs, in order.
+
+        Returns:
+            dict: The aggregated report.
+        """
+        indexed = self.reports(build_dirs)
+        reports = {}
+        missing = []
+        for build_dir in build_dirs:
+            report = indexed.get(build_dir)
+            if report is not None and ('CSynthesisReport' in report or 'VivadoSynthReport' in report):
+                reports[build_dir] = report
+            else:
+                missing.append(build_dir)
+        if missing:
+            warnings.warn(
+                f'The aggregated report covers only part of the design, no synthesis report for: {", ".join(missing)}',
+                stacklevel=2,
+            )
+
+        aggregated = aggregate_graph_reports(reports)
+        aggregated['MissingBuilds'] = missing
+        return aggregated
+
+
+def _key(build_dir):
+    return os.path.abspath(build_dir)
@@ -0,0 +1,395 @@
+"""Analytic estimates of the resources and latency of a model, without running the HLS tools.
+
+The estimates are first-order models of the ``nnet_utils`` implementations, computed from the attributes of the layers
+(strategy, reuse and parallelization factors, precisions, IOType, and the number of non-zero weights). Each estimate is
+a weighted sum of a few terms (e.g., the number of multipliers mapped to DSPs, or the width of the adder trees), and the
+weights can be calibrated against the reports of synthesized models, so a sweep can be pruned before any HLS run.
+"""
+
+import math
+
+import numpy as np
+
+from hls4ml.model.layers import (
+    GRU,
+    LSTM,
+    Activation,
+    BatchNormalization,
+    Conv1D,
+    Conv2D,
+    Dense,
+    GlobalPooling1D,
+    GlobalPooling2D,
+    Merge,
+    Pooling1D,
+    Pooling2D,
+    SimpleRNN,
+    Softmax,
+)
+from hls4ml.model.types import ExponentPrecisionType, XnorPrecisionType
+
+# Keys of the estimates, and the corresponding keys of the 'CSynthesisReport' of parse_vivado_report
+_report_keys = {
+    'DSP': 'DSP',
+    'LUT': 'LUT',
+    'FF': 'FF',
+    'BRAM_18K': 'BRAM_18K',
+    'Latency': 'WorstLatency',
+    'II': 'IntervalMax',
+}
+
+_default_coefficients = {
+    'DSP': {'multiplier': 1.0, 'offset': 0.0},
+    'LUT': {'multiplier': 0.5, 'adder': 1.0, 'logic': 1.0, 'rom': 1.0, 'buffer': 1.0, 'offset': 0.0},
+    'FF': {'register': 1.0, 'offset': 0.0},
+    'BRAM_18K': {'weights': 1.0, 'table': 1.0, 'buffer': 1.0, 'offset': 0.0},
+    'Latency': {'pipeline': 1.0, 'interval': 1.0, 'offset': 0.0},
+    'II': {'interval': 1.0, 'offset': 0.0},
+}
+
+# Activations implemented with lookup tables
+_table_activations = {'sigmoid', 'tanh', 'softmax', 'elu', 'selu', 'softplus', 'softsign', 'sigmoid_hls4ml'}
+
+_dsp_a_width = 27  # Width of the inputs of the multiplier of a DSP48E2
+_dsp_b_width = 18
+_bram_width = 36  # An 18K BRAM holds 512 words of 36 bits
+_bram_depth = 512
+_srl_depth = 32  # Depth of a shift register in one LUT
+
+
+def _width(precision, default=16):
+    return getattr(precision, 'width', default)
+
+
+def _type_width(layer, type_name, default=16):
+    named_type = layer.types.get(type_name)
+    if named_type is None:
+        return default
+    return _width(named_type.precision, default)
+
+
+def _brams(width, depth):
+    return math.ceil(width / _bram_width) * math.ceil(depth / _bram_depth)
+
+
+class ResourceEstimator:
+    """Estimates the resources (DSP, LUT, FF and BRAM) and the latency and initiation interval (in clock cycles) of a
+    model from its attributes, in the order of milliseconds.
+
+    The estimates target the Vivado/Vitis implementations and are meant for ranking configurations rather than as exact
+    predictions, so they should be calibrated (see ``calibrate``) against synthesized models of the same family.
+
+    Example::
+
+        estimator = ResourceEstimator()
+        estimator.calibrate([model_a, model_b], [parse_vivado_report('prj_a'), parse_vivado_report('prj_b')])
+        estimate = estimator.estimate(model_c)
+        print(estimate['Total']['DSP'], estimate['Layers']['dense']['Latency'])
+
+    Args:
+        coefficients (dict, optional): The weight of each term of each estimate, as ``{key: {term: weight}}``. Missing
+            weights use the default values. Defaults to ``None``.
+        dsp_threshold (int, optional): Multiplications with both operands wider than this are mapped to DSPs, the
+            narrower ones to LUTs. Defaults to 9.
+    """
+
+    def __init__(self, coefficients=None, dsp_threshold=9):
+        self.coefficients = {key: dict(terms) for key, terms in _default_coefficients.items()}
+        for key, terms in (coefficients or {}).items():
+            self.coefficients[key].update(terms)
+        self.dsp_threshold = dsp_threshold
+
+    def _multiplier_terms(self, a, b, weight_precision):
+        # DSPs and LUTs (before weighting) of one a x b multiplier, and its pipeline depth
+        if isinstance(weight_precision, (XnorPrecisionType, ExponentPrecisionType)) or min(a, b) <= 1:
+            # Multiplications by binary weights or powers of 2 are sign flips and shifts
+            return 0, 2 * max(a, b), 1
+        if min(a, b) > self.dsp_threshold:
+            a, b = max(a, b), min(a, b)
+            return math.ceil(a / _dsp_a_width) * math.ceil(b / _dsp_b_width), 0, 3
+        return 0, a * b, 2
+
+    def _mult_layer_terms(self, layer, io_type, terms):
+        if isinstance(layer, (SimpleRNN, LSTM, GRU)):
+            n_gates = 4 if isinstance(layer, LSTM) else 3 if isinstance(layer, GRU) else 1
+            n_out = layer.get_attr('n_out') * n_gates
+            n_in = layer.get_attr('n_in') + layer.get_attr('n_out')
+            iterations = layer.get_attr('n_timesteps', 1)
+            copies = 1
+        elif isinstance(layer, Dense):
+            n_in, n_out = layer.get_attr('n_in'), layer.get_attr('n_out')
+            iterations, copies = 1, 1
+        else:
+            n_chan, n_filt = layer.get_attr('n_chan'), layer.get_attr('n_filt')
+            filt_size = layer.get_attr('filt_width') * layer.get_attr('filt_height', 1)
+            in_pixels = layer.get_attr('in_width') * layer.get_attr('in_height', 1)
+            out_pixels = layer.get_attr('out_width') * layer.get_attr('out_height', 1)
+            n_in, n_out = n_chan * filt_size, n_filt
+            if io_type == 'io_stream':
+                # The line buffer implementation consumes one input pixel per iteration
+                iterations, copies = in_pixels, 1
+                line_bits = (layer.get_attr('filt_height', 1) - 1) * layer.get_attr('in_width') * n_chan
+                line_bits *= _width(layer.get_input_variable().type.precision)
+                self._add_buffer(terms, line_bits + filt_size * n_chan * _type_width(layer, 'result_t'))
+            else:
+                copies = layer.get_attr('parallelization_factor', 1)
+                iterations = layer.get_attr('n_partitions', out_pixels // copies)
+
+        strategy = str(layer.get_attr('strategy', 'latency')).lower()
+        reuse_factor = layer.get_attr('reuse_factor', 1)
+        n_mult = n_in * n_out
+        weights = layer.weights.get('weight')
+        if weights is not None and isinstance(weights.data, np.ndarray) and strategy == 'latency':
+            # Multiplications by zero are optimized away in the fully unrolled implementation
+            n_mult = min(n_mult, weights.sparse.nnz)
+
+        a = _width(layer.get_input_variable().type.precision)
+        weight_precision = layer.types['weight_t'].precision if 'weight_t' in layer.types else None
+        b = _width(weight_precision)
+        accum_width = _type_width(layer, 'accum_t', a + b)
+        n_parallel = math.ceil(n_mult / reuse_factor) * copies
+
+        if strategy == 'distributed_arithmetic':
+            # Constant multiplications are decomposed in shift-and-add trees, without multipliers
+            dsp, lut, mult_depth = 0, 0, 1
+            n_adders = n_mult * b // 2
+        else:
+            dsp, lut, mult_depth = self._multiplier_terms(a, b, weight_precision)
+            n_adders = n_parallel
+        terms['DSP']['multiplier'] += n_parallel * dsp
+        terms['LUT']['multiplier'] += n_parallel * lut
+        terms['LUT']['adder'] += n_adders * accum_width
+        terms['FF']['register'] += n_parallel * (a + b) + n_out * copies * accum_width
+
+        if strategy.startswith('resource') and reuse_factor > 1 and weights is not None:
+            # The weights are reshaped to words of block_factor weights, read one per cycle
+            word_width = math.ceil(n_in * n_out / reuse_factor) * b
+            if reuse_factor > _srl_depth:
+                terms['BRAM_18K']['weights'] += _brams(word_width, reuse_factor) * copies
+            else:
+                terms['LUT']['rom'] += word_width * math.ceil(reuse_factor / 64) * copies
+
+        depth = mult_depth + math.ceil(math.log2(max(n_in, 2))) + 1
+        return depth + reuse_factor * iterations, reuse_factor * iterations
+
+    def _add_buffer(self, terms, bits):
+        if bits > _bram_width * _srl_depth * 2:
+            terms['BRAM_18K']['buffer'] += math.ceil(bits / (_bram_width * _bram_depth))
+        else:
+            terms['LUT']['buffer'] += math.ceil(bits / _srl_depth)
+
+    def _elementwise_terms(self, layer, io_type, terms):
+        elementwise_layers = (Activation, Pooling1D, Pooling2D, GlobalPooling1D, GlobalPooling2D, Merge, BatchNormalization)
+        if not isinstance(layer, elementwise_layers):
+            # Inputs, reshapes, paddings, etc. only move data around
+            return 0, 0
+
+        input_var = layer.get_input_variable()
+        n_elem = input_var.size()
+        pixels = n_elem // input_var.shape[-1] if io_type == 'io_stream' and len(input_var.shape) > 0 else 1
+        n_parallel = n_elem // pixels
+        out_width = _type_width(layer, 'result_t')
+        in_width = _width(input_var.type.precision)
+        # Only the batch normalization shares its multipliers, the other layers are pipelined with II=1
+        reuse_factor = layer.get_attr('reuse_factor', 1) if isinstance(layer, BatchNormalization) else 1
+        depth = 1
+
+        if isinstance(layer, Activation):
+            activation = str(layer.get_attr('activation', '')).lower()
+            terms['LUT']['logic'] += n_parallel * out_width
+            if isinstance(layer, Softmax) or activation in _table_activations:
+                n_tables = 2 if isinstance(layer, Softmax) else 1
+                table_width = max(_type_width(layer, t, 18) for t in ('table_t', 'exp_table_t', 'inv_table_t'))
+                table_bits = layer.get_attr('table_size', 1024) * table_width
+                # Tables are dual-port, hence replicated for every pair of parallel reads
+                copies = math.ceil(n_parallel / 2)
+                terms['BRAM_18K']['table'] += n_tables * copies * math.ceil(table_bits / (_bram_width * _bram_depth))
+                depth = 3
+                if isinstance(layer, Softmax):
+                    dsp, lut, _ = self._multiplier_terms(table_width, table_width, None)
+                    terms['DSP']['multiplier'] += n_parallel * dsp
+                    terms['LUT']['multiplier'] += n_parallel * lut
+                    terms['LUT']['adder'] += n_parallel * table_width
+                    depth += 2 * math.ceil(math.log2(max(layer.get_attr('n_in', n_parallel), 2))) + 3
+        elif isinstance(layer, (Pooling1D, Pooling2D, GlobalPooling1D, GlobalPooling2D)):
+            pool_size = layer.get_attr('pool_width', 1) * layer.get_attr('pool_height', 1)
+            if isinstance(layer, (GlobalPooling1D, GlobalPooling2D)):
+                pool_size = n_elem // max(layer.get_attr('n_filt', 1), 1)
+            terms['LUT']['adder'] += n_parallel * in_width * max(pool_size - 1, 1) // max(pool_size, 1)
+            depth = math.ceil(math.log2(max(pool_size, 2))) + 1
+            if io_type == 'io_stream' and isinstance(layer, (Pooling1D, Pooling2D)):
+                line_bits = (layer.get_attr('pool_height', 1) - 1) * layer.get_attr('in_width') * input_var.shape[-1]
+                self._add_buffer(terms, line_bits * in_width)
+        elif isinstance(layer, Merge):
+            op = str(layer.get_attr('op', '')).lower()
+            if op == 'multiply':
+                dsp, lut, depth = self._multiplier_terms(in_width, in_width, None)
+                terms['DSP']['multiplier'] += n_parallel * dsp
+                terms['LUT']['multiplier'] += n_parallel * lut
+            elif op != 'concatenate':
+                terms['LUT']['adder'] += n_parallel * out_width
+        else:
+            scale_precision = layer.types['scale_t'].precision if 'scale_t' in layer.types else None
+            dsp, lut, depth = self._multiplier_terms(in_width, _width(scale_precision), scale_precision)
+            terms['DSP']['multiplier'] += math.ceil(n_parallel / reuse_factor) * dsp
+            terms['LUT']['multiplier'] += math.ceil(n_parallel / reuse_factor) * lut
+            terms['LUT']['adder'] += math.ceil(n_parallel / reuse_factor) * out_width
+
+        terms['FF']['register'] += n_parallel * out_width
+        return depth + pixels * reuse_factor - 1, pixels * reuse_factor
+
+    def _layer_terms(self, layer, io_type):
+        terms = {key: dict.fromkeys(key_terms, 0.0) for key, key_terms in self.coefficients.items()}
+        if isinstance(layer, (Dense, Conv1D, Conv2D, SimpleRNN, LSTM, GRU)):
+            latency, interval = self._mult_layer_terms(layer, io_type, terms)
+        else:
+            latency, interval = self._elementwise_terms(layer, io_type, terms)
+
+        output_var = layer.get_output_variable() if layer.outputs else None
+        pragma = getattr(output_var, 'pragma', None)
+        if io_type == 'io_stream' and isinstance(pragma, tuple) and pragma[0] == 'stream':
+            # The FIFO between this layer and the next one
+            fifo_width = _width(output_var.type.precision) * output_var.shape[-1]
+            self._add_buffer(terms, int(pragma[1]) * fifo_width)
+
+        terms['Latency']['pipeline'] = latency
+        terms['II']['interval'] = interval
+        return terms, latency, interval
+
+    def _weighted(self, terms):
+        return {
+            key: sum(self.coefficients[key][term] * value for term, value in key_terms.items())
+            for key, key_terms in terms.items()
+        }
+
+    def _model_terms(self, model):
+        io_type = model.config.get_config_value('IOType')
+        layer_terms = {}
+        latencies = {}
+        for layer in model.get_layers():
+            terms, latency, interval = self._layer_terms(layer, io_type)
+            layer_terms[layer.name] = terms
+            latencies[layer.name] = (latency, interval)
+
+        total = {key: dict.fromkeys(key_terms, 0.0) for key, key_terms in self.coefficients.items()}
+        for terms in layer_terms.values():
+            for key in ('DSP', 'LUT', 'FF', 'BRAM_18K'):
+                for term, value in terms[key].items():
+                    total[key][term] += value
+        max_interval = max((interval for _, interval in latencies.values()), default=0)
+        if io_type == 'io_stream':
+            # The layers run concurrently (dataflow), so only the pipeline depth of each layer adds to the latency
+            total['Latency']['pipeline'] = sum(latency - interval for latency, interval in latencies.values())
+            total['Latency']['interval'] = max_interval
+        else:
+            total['Latency']['pipeline'] = sum(latency for latency, _ in latencies.values())
+        total['II']['interval'] = max_interval
+        for key_terms in total.values():
+            key_terms['offset'] = 1.0
+
+        return layer_terms, total
+
+    def estimate(self, model):
+        """Estimates the resources and latency of a model.
+
+        Args:
+            model (ModelGraph): The model to estimate, after conversion (the optimizers must have been applied).
+
+        Returns:
+            dict: The estimates, with keys 'DSP', 'LUT', 'FF', 'BRAM_18K', 'Latency' and 'II', of every layer under
+            'Layers' (as ``{layer_name: estimate}``) and of the whole model under 'Total'.
+        """
+        layer_terms, total = self._model_terms(model)
+        return {
+            'Layers': {name: self._weighted(terms) for name, terms in layer_terms.items()},
+            'Total': self._weighted(total),
+        }
+
+    def estimate_layer(self, layer):
+        """Estimates the resources and latency of a single layer, e.g., to compare its possible configurations.
+
+        Args:
+            layer (Layer): The layer to estimate.
+
+        Returns:
+            dict: The estimate, with keys 'DSP', 'LUT', 'FF', 'BRAM_18K', 'Latency' and 'II'.
+        """
+        terms, _, _ = self._layer_terms(layer, layer.model.config.get_config_value('IOType'))
+        return self._weighted(terms)
+
+    def calibrate(self, models, reports, regularization=1e-3):
+        """Fits the weights of the terms of the estimates to the reports of synthesized models.
+
+        The weights are fitted with a non-negative least squares regression of the reported totals, regularized towards
+        the current weights, so that a few reports are enough to correct the scale of the estimates. Estimates for
+        which the reports don't have a value are left unchanged.
+
+        Args:
+            models (list(ModelGraph)): The synthesized models.
+            reports (list(dict)): The reports of the models, as returned by ``parse_vivado_report`` (or its
+                'CSynthesisReport' section, or the output of ``aggregate_graph_reports``).
+            regularization (float, optional): Strength of the regularization towards the current weights. Defaults to
+                1e-3.
+
+        Returns:
+            dict: The calibrated coefficients.
+        """
+        if len(models) != len(reports):
+            raise ValueError(f'Got {len(models)} models but {len(reports)} reports')
+
+        totals = [self._model_terms(model)[1] for model in models]
+        reports = [report.get('CSynthesisReport', report) for report in reports]
+        for key, report_key in _report_keys.items():
+            rows, targets = [], []
+            for total, report in zip(totals, reports):
+                try:
+                    targets.append(float(report[report_key]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+                rows.append([total[key][term] for term in self.coefficients[key]])
+            if len(rows) == 0:
+                continue
+            prior = np.array(list(self.coefficients[key].values()))
+            coefficients = _fit(np.array(rows, dtype=np.float64), np.array(targets), prior, regularization)
+            self.coefficients[key] = dict(zip(self.coefficients[key], coefficients.tolist()))
+
+        return self.coefficients
+
+
+def _fit(X, y, prior, regularization):
+    # Non-negative ridge regression towards the prior, with the columns scaled to unit maximum
+    scale = np.abs(X).max(axis=0)
+    used = scale > 0
+    coefficients = prior.astype(np.float64)
+    Xs = X[:, used] / scale[used]
+    prior_s = prior[used] * scale[used]
+    reg = regularization * max(float(np.sum(y**2)), 1.0) / max(float(np.sum(prior_s**2)), 1.0)
+    active = np.ones(Xs.shape[1], dtype=bool)
+    solution = np.zeros(Xs.shape[1])
+    while active.any():
+        A = Xs[:, active]
+        lhs = A.T @ A + reg * np.eye(A.shape[1])
+        rhs = A.T @ y + reg * prior_s[active]
+        fitted = np.linalg.solve(lhs, rhs)
+        if (fitted >= 0).all():
+            solution[:] = 0
+            solution[active] = fitted
+            break
+        active[np.flatnonzero(active)[fitted < 0]] = False
+    coefficients[used] = solution / scale[used]
+    return coefficients
+
+
+def estimate_resources(model, estimator=None):
+    """Estimates the resources and latency of a model without running the HLS tools, see ``ResourceEstimator``.
+
+    Args:
+        model (ModelGraph): The model to estimate.
+        estimator (ResourceEstimator, optional): A (calibrated) estimator. If not given, the default one is used.
+
+    Returns:
+        dict: The estimates of every layer under 'Layers' and of the whole model under 'Total'.
+    """
+    if estimator is None:
+        estimator = ResourceEstimator()
+    return estimator.estimate(model)
@@ -15,7 +15,6 @@ void depthwise_conv_2d_encoded_cl(
     typename CONFIG_T::weight_t weights[CONFIG_T::filt_height * CONFIG_T::filt_width * CONFIG_T::n_chan],
     typename CONFIG_T::bias_t biases[CONFIG_T::n_chan]) {
     assert(CONFIG_T::pad_top == 0 && CONFIG_T::pad_bottom == 0 && CONFIG_T::pad_left == 0 && CONFIG_T::pad_right == 0);
-    assert(CONFIG_T::filt_height == CONFIG_T::filt_width);
 
     static ac_channel<typename data_T::value_type>
         data_window[CONFIG_T::filt_height * CONFIG_T::filt_width * CONFIG_T::n_chan];
@@ -3,6 +3,19 @@ from datetime import datetime
 import numpy as np
 from pynq import Overlay, allocate
 
+# hls-fpga-machine-learning insert codecs
+input_codec = output_codec = None
+
+
+def fixed_point_codecs():
+    """Returns the encoding function of the input codec and the decoding function of the output codec."""
+    if input_codec is None and output_codec is None:
+        raise ValueError('fixed_point requires fixed-point types on the interface, but it uses floating-point types')
+    return (
+        input_codec.encode if input_codec is not None else None,
+        output_codec.decode if output_codec is not None else None,
+    )
+
 
 class NeuralNetworkOverlay(Overlay):
     def __init__(self, xclbin_name, dtbo=None, download=True, ignore_version=False, device=None):
@@ -23,16 +36,8 @@ class NeuralNetworkOverlay(Overlay):
                 data type for the 'data' AXI-Stream field, 'np.float32' dtype must be used. Instead if it uses
                 'ap_fixed<A,B>', 'np.intA' is the correct dtype to use. Note that A cannot any integer value, but it can
                 assume power of 2 values, i.e., {..., 8, 16, 32, ...}. Check `numpy` documentation for more information.
-                In this case the encoding/decoding has to be computed by the host machine. For example for
-                'ap_fixed<16,6>' type the following 2 functions are the correct one to use for encode/decode
-                'float' -> 'ap_fixed<16,6>'::
-
-                    def encode(xi):
-                        return np.int16(round(xi * 2**10)) # note 2**10 = 2**(A-B)
-                    def decode(yi):
-                        return yi * 2**-10
-                    encode_v = np.vectorize(encode) # to apply them element-wise
-                    decode_v = np.vectorize(decode)
+                In this case the encoding/decoding has to be computed by the host machine, see the ``fixed_point``
+                argument of ``predict``.
 
             trg_in (optional): Input buffer target memory. By default the v++ command set it to HBM[0] for
                 alveo-u50. Defaults to None.
@@ -42,7 +47,9 @@ class NeuralNetworkOverlay(Overlay):
         self.input_buffer = allocate(shape=X_shape, dtype=dtype, target=trg_in)
         self.output_buffer = allocate(shape=y_shape, dtype=dtype, target=trg_out)
 
-    def predict(self, X, y_shape, dtype=np.float32, debug=False, profile=False, encode=None, decode=None):
+    def predict(
+        self, X, y_shape, dtype=np.float32, debug=False, profile=False, encode=None, decode=None, fixed_point=False
+    ):
         """Obtain the predictions of the NN implemented in the FPGA.
 
         Args:
@@ -56,10 +63,15 @@ class NeuralNetworkOverlay(Overlay):
                 inference/s. Defaults to False.
             encode (Callable, optional): Function to transform the input tensor. Defaults to None.
             decode (Callable, optional): Function to transform the output tensor. Defaults to None.
+            fixed_point (bool, optional): If set, the input tensor is encoded with ``input_codec`` and the output tensor
+                is decoded with ``output_codec``, the vectorized codecs of the fixed-point types of the interface,
+                generated with this driver. Takes precedence over ``encode``/``decode``. Defaults to False.
 
         Returns:
             _type_: A ``np.ndarray`` with a shape equal of ``y_shape`` and ``dtype`` data type.
         """
+        if fixed_point:
+            encode, decode = fixed_point_codecs()
         self.allocate_mem(X_shape=X.shape, y_shape=y_shape, dtype=dtype)
         if profile:
             timea = datetime.now()
@@ -78,6 +90,8 @@ class NeuralNetworkOverlay(Overlay):
         if debug:
             print("Recieve OK")
         result = self.output_buffer.copy()
+        if decode is not None:
+            result = decode(result)
         if profile:
             timeb = datetime.now()
             dts, rate = self._print_dt(timea, timeb, len(X))
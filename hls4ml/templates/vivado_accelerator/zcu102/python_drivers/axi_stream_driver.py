@@ -3,6 +3,19 @@ from datetime import datetime
 import numpy as np
 from pynq import Overlay, allocate
 
+# hls-fpga-machine-learning insert codecs
+input_codec = output_codec = None
+
+
+def fixed_point_codecs():
+    """Returns the encoding function of the input codec and the decoding function of the output codec."""
+    if input_codec is None and output_codec is None:
+        raise ValueError('fixed_point requires fixed-point types on the interface, but it uses floating-point types')
+    return (
+        input_codec.encode if input_codec is not None else None,
+        output_codec.decode if output_codec is not None else None,
+    )
+
 
 class NeuralNetworkOverlay(Overlay):
     def __init__(
@@ -21,7 +34,19 @@ class NeuralNetworkOverlay(Overlay):
         print(f"Classified {N} samples in {dts} seconds ({rate} inferences / s)")
         return dts, rate
 
-    def predict(self, X, debug=False, profile=False, encode=None, decode=None):
+    def _batch_buffers(self, batch_size):
+        """Two pairs of input/output buffers of `batch_size` samples, allocated on first use."""
+        if getattr(self, '_ping_pong', None) is None or self._ping_pong[0][0].shape[0] != batch_size:
+            self._ping_pong = [
+                (
+                    allocate(shape=(batch_size,) + self.input_buffer.shape[1:], dtype=self.input_buffer.dtype),
+                    allocate(shape=(batch_size,) + self.output_buffer.shape[1:], dtype=self.output_buffer.dtype),
+                )
+                for _ in range(2)
+            ]
+        return self._ping_pong
+
+    def predict(self, X, debug=False, profile=False, encode=None, decode=None, fixed_point=False):
         """
         Obtain the predictions of the NN implemented in the FPGA.
         Parameters:
@@ -32,22 +57,17 @@ class NeuralNetworkOverlay(Overlay):
                   Instead if it uses 'ap_fixed<A,B>', 'np.intA' is the correct one to use (note that A cannot
                   any integer value, but it can assume {..., 8, 16, 32, ...} values. Check `numpy`
                   doc for more info).
-                  In this case the encoding/decoding has to be computed by the PS. For example for
-                  'ap_fixed<16,6>' type the following 2 functions are the correct one to use for encode/decode
-                  'float' -> 'ap_fixed<16,6>':
-                  ```
-                    def encode(xi):
-                        return np.int16(round(xi * 2**10)) # note 2**10 = 2**(A-B)
-                    def decode(yi):
-                        return yi * 2**-10
-                    encode_v = np.vectorize(encode) # to apply them element-wise
-                    decode_v = np.vectorize(decode)
-                  ```
+                  In this case the encoding/decoding has to be computed by the PS, which `fixed_point` does.
+        - fixed_point : boolean. Set it to `True` to encode the input with `input_codec` and decode the output with
+                  `output_codec`, the vectorized codecs of the fixed-point types of the interface, generated with this
+                  driver. Takes precedence over `encode`/`decode`.
         - profile : boolean. Set it to `True` to print the performance of the algorithm in term of `inference/s`.
-        - encode/decode: function pointers. See `dtype` section for more information.
+        - encode/decode: function pointers, applied to the whole input/output arrays.
         - return: an output array based on `np.ndarray` with a shape equal to `y_shape` and a `dtype` equal to
                   the namesake parameter.
         """
+        if fixed_point:
+            encode, decode = fixed_point_codecs()
         if profile:
             timea = datetime.now()
         if encode is not None:
@@ -63,13 +83,74 @@ class NeuralNetworkOverlay(Overlay):
         self.recvchannel.wait()
         if debug:
             print("Receive OK")
-        # result = self.output_buffer.copy()
+        result = self.output_buffer
         if decode is not None:
-            self.output_buffer = decode(self.output_buffer)
+            result = decode(self.output_buffer)
+
+        if profile:
+            timeb = datetime.now()
+            dts, rate = self._print_dt(timea, timeb, len(X))
+            return result, dts, rate
+        else:
+            return result
+
+    def predict_batched(self, X, batch_size, profile=False, encode=None, decode=None, fixed_point=False):
+        """
+        Obtain the predictions of the NN implemented in the FPGA, transferring the input in chunks of `batch_size`
+        samples. Two pairs of buffers are used in turn, so the PS encodes the next chunk while the DMA of the current
+        one runs, and decodes a chunk while the DMA of the next one runs. Unlike `predict`, `X` may have any number of
+        samples.
+        Parameters:
+        - X : the input vector. Should be numpy ndarray.
+        - batch_size : the number of samples per DMA transfer.
+        - profile : boolean. Set it to `True` to print the performance of the algorithm in term of `inference/s`.
+        - encode/decode: function pointers applied to whole chunks. See `predict` for more information.
+        - fixed_point : boolean. Set it to `True` to convert the chunks with the codecs of the interface. See `predict`
+                  for more information.
+        - return: an output array with one entry per sample of `X`.
+        """
+        if fixed_point:
+            encode, decode = fixed_point_codecs()
+        if profile:
+            timea = datetime.now()
+        buffers = self._batch_buffers(batch_size)
+        starts = range(0, len(X), batch_size)
+        y = None
+
+        def load(i):
+            chunk = X[starts[i] : starts[i] + batch_size]
+            buffers[i % 2][0][: len(chunk)] = chunk if encode is None else encode(chunk)
+            return len(chunk)
+
+        def start(i, n):
+            input_buffer, output_buffer = buffers[i % 2]
+            self.sendchannel.transfer(input_buffer, nbytes=n * input_buffer[0].nbytes)
+            self.recvchannel.transfer(output_buffer, nbytes=n * output_buffer[0].nbytes)
+
+        n = load(0) if len(starts) else 0
+        if n:
+            start(0, n)
+        else:
+            y = np.empty((0,) + self.output_buffer.shape[1:])
+        for i in range(len(starts)):
+            # Overlaps with the DMA of chunk i
+            n_next = load(i + 1) if i + 1 < len(starts) else 0
+            self.sendchannel.wait()
+            self.recvchannel.wait()
+            if n_next:
+                start(i + 1, n_next)
+            # Overlaps with the DMA of chunk i + 1
+            result = buffers[i % 2][1][:n]
+            if decode is not None:
+                result = decode(result)
+            if y is None:
+                y = np.empty((len(X),) + result.shape[1:], dtype=result.dtype)
+            y[starts[i] : starts[i] + n] = result
+            n = n_next
 
         if profile:
             timeb = datetime.now()
             dts, rate = self._print_dt(timea, timeb, len(X))
-            return self.output_buffer, dts, rate
+            return y, dts, rate
         else:
-            return self.output_buffer
+            return y
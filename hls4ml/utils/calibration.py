@@ -0,0 +1,211 @@
+"""Data-driven calibration of the fixed-point precisions of a model.
+
+A representative dataset is run through the original (floating-point) model in batches. The range of every tensor is
+accumulated in a :py:class:`~hls4ml.utils.streaming_stats.StreamingSummary`, so the calibration set never needs to be held
+in memory at once, and the minimal precisions covering the observed ranges are written into the HLS configuration.
+"""
+
+import math
+
+import numpy as np
+
+from hls4ml.model.types import FixedPrecisionType
+from hls4ml.utils.streaming_stats import StreamingSummary, iter_batches
+
+
+def _collect_keras(model, batches):
+    import keras
+
+    summaries = {}
+
+    def _update(name, value):
+        summaries.setdefault(name, StreamingSummary()).update(keras.ops.convert_to_numpy(value))
+
+    layers = [layer for layer in model.layers if not isinstance(layer, keras.layers.InputLayer)]
+    # Layers with a fused activation are split in two by the converters, named '<layer>' and '<layer>_<activation>'
+    split_layers = [
+        layer
+        for layer in layers
+        if getattr(layer, 'activation', None) not in (None, keras.activations.linear)
+        and not isinstance(layer, keras.layers.Activation)
+    ]
+    output_names = [layer.name for layer in layers]
+    for layer in split_layers:
+        output_names[layers.index(layer)] = f'{layer.name}_{layer.activation.__name__}'
+    input_names = []
+    for tensor in model.inputs:
+        history = tensor._keras_history
+        input_names.append(getattr(history, 'operation', None) or history.layer)
+    input_names = [layer.name for layer in input_names]
+
+    feature_model = keras.Model(
+        inputs=model.inputs, outputs=[layer.output for layer in layers] + [layer.input for layer in split_layers]
+    )
+
+    for x in batches:
+        xs = list(x) if isinstance(x, (list, tuple)) else [x]
+        outputs = feature_model(xs, training=False)
+        for name, value in zip(input_names, xs):
+            _update(name, value)
+        for name, y in zip(output_names, outputs[: len(layers)]):
+            _update(name, y)
+        for layer, y in zip(split_layers, outputs[len(layers) :]):
+            activation = layer.activation
+            try:
+                layer.activation = keras.activations.linear
+                pre_activation = layer(y)
+            finally:
+                layer.activation = activation
+            _update(layer.name, pre_activation)
+
+    return summaries
+
+
+def _collect_pytorch(model, batches):
+    import torch
+
+    from hls4ml.utils.torch import CustomFXTracer
+
+    graph_module = torch.fx.GraphModule(model, CustomFXTracer().trace(model))
+    summaries = {}
+
+    class _Recorder(torch.fx.Interpreter):
+        def run_node(self, n):
+            result = super().run_node(n)
+            if isinstance(result, (tuple, list)) and len(result) > 0:
+                result = result[0]
+            if n.op != 'output' and isinstance(result, torch.Tensor) and result.is_floating_point():
+                summaries.setdefault(n.name, StreamingSummary()).update(result.detach().cpu().numpy())
+            return result
+
+    recorder = _Recorder(graph_module)
+    with torch.no_grad():
+        for x in batches:
+            xs = x if isinstance(x, (list, tuple)) else [x]
+            recorder.run(*[torch.as_tensor(np.asarray(xi), dtype=torch.float32) for xi in xs])
+
+    return summaries
+
+
+def collect_ranges(model, X, batch_size=1024):
+    """Run the data through the model in batches and accumulate the distribution of every tensor.
+
+    The tensors are named after the hls4ml layers producing them. Layers with a fused activation (e.g., ``Dense`` with
+    ``activation='relu'``) are reported as two tensors, ``<layer>`` for the pre-activation and ``<layer>_<activation>`` for
+    the output, as in the converted model.
+
+    Args:
+        model: Keras or PyTorch model.
+        X (ndarray or list of ndarray): The calibration data, with the samples along the first axis.
+        batch_size (int, optional): Number of samples evaluated at once. Defaults to 1024.
+
+    Raises:
+        Exception: If the model type is not supported.
+
+    Returns:
+        dict[str, StreamingSummary]: The accumulated summary of each tensor. Summaries from several workers (e.g., from
+        disjoint parts of the calibration set) can be combined with ``StreamingSummary.merge``.
+    """
+    batches = iter_batches(X, batch_size)
+
+    modules = {cls.__module__.split('.')[0] for cls in type(model).__mro__}
+    if modules & {'keras', 'tensorflow', 'tf_keras'}:
+        return _collect_keras(model, batches)
+    if 'torch' in modules:
+        return _collect_pytorch(model, batches)
+    raise Exception(f'Unsupported model type for calibration: {type(model)}')
+
+
+def precision_from_summary(
+    summary, max_error=2**-8, integer_margin=0, max_width=None, signed=None, rounding_mode='RND', saturation_mode='SAT'
+):
+    """Minimal fixed-point precision covering the values accumulated in a summary.
+
+    The integer bits are chosen to represent the largest observed magnitude (plus ``integer_margin`` extra bits). The
+    fractional bits are the fewest such that the LSB is at most ``max_error`` times the largest observed magnitude.
+
+    Args:
+        summary (StreamingSummary): The accumulated distribution.
+        max_error (float, optional): The tolerated quantization step, relative to the largest observed magnitude.
+            Defaults to 2**-8.
+        integer_margin (int, optional): Extra integer bits added as headroom against values outside of the calibration
+            set. Defaults to 0.
+        max_width (int, optional): Maximum total width. Fractional bits are dropped to satisfy it. Defaults to None.
+        signed (bool, optional): Signedness of the type, inferred from the observed values if not given.
+        rounding_mode (str, optional): Rounding mode of the type. Defaults to 'RND'.
+        saturation_mode (str, optional): Saturation mode of the type. Defaults to 'SAT'.
+
+    Returns:
+        FixedPrecisionType: The precision, or ``None`` if the summary only contains zeros.
+    """
+    hist = summary.histogram
+    if hist.count == 0:
+        return None
+    if signed is None:
+        signed = hist.signed
+    integer = hist.integer_bits(signed=signed) + integer_margin
+    max_abs = max(abs(hist.min), abs(hist.max))
+    fractional = math.ceil(-math.log2(max_error * max_abs))
+    width = max(integer + fractional, 1)
+    if max_width is not None:
+        width = min(width, max_width)
+    return FixedPrecisionType(
+        width=width, integer=integer, signed=signed, rounding_mode=rounding_mode, saturation_mode=saturation_mode
+    )
+
+
+def calibrate_precision(
+    model, config, X, batch_size=1024, max_error=2**-8, integer_margin=0, max_width=None, summaries=None
+):
+    """Set the result and accumulator precisions of every layer from the ranges observed on a calibration set.
+
+    The precisions are written in the 'LayerName' section of the configuration (which is created if needed) as the
+    'result' precision of every layer, and as the 'accum' precision of the layers with weights (as listed by a config
+    created with ``granularity='name'``). The remaining precisions (e.g., of the weights) are left untouched, so they can
+    still be inferred from the calibrated types with 'auto'.
+
+    Args:
+        model: Keras or PyTorch model.
+        config (dict): HLS configuration, e.g., as created by ``config_from_keras_model`` or
+            ``config_from_pytorch_model``. Modified in place.
+        X (ndarray or list of ndarray): The calibration data. Can be ``None`` if ``summaries`` is given.
+        batch_size (int, optional): Number of samples evaluated at once. Defaults to 1024.
+        max_error (float, optional): The tolerated quantization step of every tensor, relative to its largest observed
+            magnitude. Defaults to 2**-8.
+        integer_margin (int, optional): Extra integer bits added as headroom. Defaults to 0.
+        max_width (int, optional): Maximum width of the precisions. Defaults to None.
+        summaries (dict, optional): Previously collected summaries (see ``collect_ranges``), for example merged from
+            several workers. If given, the model is not evaluated.
+
+    Returns:
+        dict: The updated configuration.
+    """
+    if summaries is None:
+        summaries = collect_ranges(model, X, batch_size=batch_size)
+
+    layer_configs = config.setdefault('LayerName', {})
+    for name, summary in summaries.items():
+        precision = precision_from_summary(summary, max_error=max_error, integer_margin=integer_margin, max_width=max_width)
+        if precision is None:
+            continue
+        layer_config = layer_configs.setdefault(name, {})
+        precision_config = layer_config.get('Precision')
+        if not isinstance(precision_config, dict):
+            precision_config = {} if precision_config is None else {'default': precision_config}
+            layer_config['Precision'] = precision_config
+        precision_config['result'] = str(precision)
+        if 'weight' in precision_config:
+            # The accumulator of a weighted layer holds its output before the final cast, so it needs the same range,
+            # with a sign bit as partial sums may be negative. Rounding and saturation are too costly in accumulators.
+            accum = precision_from_summary(
+                summary,
+                max_error=max_error,
+                integer_margin=integer_margin,
+                max_width=max_width,
+                signed=True,
+                rounding_mode=None,
+                saturation_mode=None,
+            )
+            precision_config['accum'] = str(accum)
+
+    return config
@@ -379,7 +379,7 @@ def config_from_pytorch_model(
         layer_list,
         _,
         _,
-    ) = parse_pytorch_model(config, verbose=False)
+    ) = parse_pytorch_model(config, verbose=False, keep_parsed=True)
 
     def make_layer_config(layer):
         cls_name = layer['class_name']
@@ -0,0 +1,152 @@
+"""
+Vectorized conversion between floating-point values and the bits of fixed-point types.
+
+This module only depends on NumPy, as it is also embedded in the host code generated for the designs (e.g., the Python
+drivers of the VivadoAccelerator backend).
+"""
+
+import numpy as np
+
+
+class FixedPointCodec:
+    """Encodes floating-point values to the bits of a fixed-point type and decodes them back, on whole arrays.
+
+    Encoding rounds and saturates as the assignment of a ``double`` to an ``ap_fixed`` (or ``ap_ufixed``, ``ap_int``)
+    variable does. The codes are the integer values of the bits, i.e., the fixed-point values times ``2**fractional``.
+    Several elements can be packed into the words of a wider bus, the first element in the least significant bits, as
+    in the AXI streams of the generated designs.
+
+    Args:
+        width (int): The total number of bits.
+        integer (int): The number of integer bits, including the sign bit.
+        signed (bool, optional): Whether the type is signed. Defaults to True.
+        rounding_mode (str, optional): The rounding mode, one of ``'TRN'``, ``'TRN_ZERO'``, ``'RND'``, ``'RND_ZERO'``,
+            ``'RND_INF'``, ``'RND_MIN_INF'`` or ``'RND_CONV'``. Defaults to ``'TRN'``.
+        saturation_mode (str, optional): The saturation mode, one of ``'WRAP'``, ``'SAT'``, ``'SAT_ZERO'`` or
+            ``'SAT_SYM'``. Defaults to ``'WRAP'``.
+    """
+
+    def __init__(self, width, integer, signed=True, rounding_mode='TRN', saturation_mode='WRAP'):
+        self.width = width
+        self.integer = integer
+        self.signed = signed
+        self.fractional = width - integer
+        self.rounding_mode = str(rounding_mode).upper().replace('AP_', '')
+        self.saturation_mode = str(saturation_mode).upper().replace('AP_', '')
+        self.min_code = -(2 ** (width - 1)) if signed else 0
+        self.max_code = 2 ** (width - 1) - 1 if signed else 2**width - 1
+
+    @classmethod
+    def from_precision(cls, precision):
+        """Creates the codec of a ``FixedPrecisionType`` or an ``IntegerPrecisionType``."""
+        return cls(precision.width, precision.integer, precision.signed, precision.rounding_mode, precision.saturation_mode)
+
+    def __repr__(self):
+        return (
+            f'FixedPointCodec({self.width}, {self.integer}, signed={self.signed}, '
+            f"rounding_mode='{self.rounding_mode}', saturation_mode='{self.saturation_mode}')"
+        )
+
+    def _codes(self, x):
+        """The rounded and saturated codes, as floating-point values."""
+        q = np.asarray(x, dtype=np.float64) * 2.0**self.fractional
+        mode = self.rounding_mode
+        if mode == 'TRN':
+            q = np.floor(q)
+        elif mode == 'TRN_ZERO':
+            q = np.trunc(q)
+        elif mode == 'RND':
+            q = np.floor(q + 0.5)
+        elif mode == 'RND_ZERO':
+            q = np.where(q >= 0, np.ceil(q - 0.5), np.floor(q + 0.5))
+        elif mode == 'RND_INF':
+            q = np.where(q >= 0, np.floor(q + 0.5), np.ceil(q - 0.5))
+        elif mode == 'RND_MIN_INF':
+            q = np.ceil(q - 0.5)
+        elif mode == 'RND_CONV':
+            q = np.round(q)
+        else:
+            raise ValueError(f'Unknown rounding mode: {mode}')
+
+        low, high = float(self.min_code), float(self.max_code)
+        mode = self.saturation_mode
+        if mode == 'WRAP':
+            q = np.mod(q - low, 2.0**self.width) + low
+        elif mode == 'SAT_ZERO':
+            q = np.where((q < low) | (q > high), 0.0, q)
+        elif mode == 'SAT_SYM' and self.signed:
+            q = np.clip(q, -high, high)
+        elif mode in ('SAT', 'SAT_SYM'):
+            q = np.clip(q, low, high)
+        else:
+            raise ValueError(f'Unknown saturation mode: {mode}')
+        return q
+
+    def quantize(self, x):
+        """Rounds and saturates the values to the type, keeping them as floating-point values."""
+        return self._codes(x) * 2.0**-self.fractional
+
+    def encode(self, x):
+        """Converts floating-point values to the codes of the type, as ``int64``."""
+        return self._codes(x).astype(np.int64)
+
+    def decode(self, codes):
+        """Converts codes to floating-point values.
+
+        Only the lowest ``width`` bits of the codes are used, so both signed codes and the unsigned bits of signed
+        types (e.g., as read from a wider bus) are accepted.
+        """
+        codes = np.asarray(codes)
+        if codes.dtype == object:
+            bits = (codes & (2**self.width - 1)).astype(np.uint64)
+        else:
+            bits = codes.astype(np.uint64) & np.uint64(2**self.width - 1)
+        values = bits.astype(np.float64)
+        if self.signed:
+            values -= (bits >> np.uint64(self.width - 1)).astype(np.float64) * 2.0**self.width
+        return values * 2.0**-self.fractional
+
+    def pack(self, x, elements_per_word, element_width=None):
+        """Encodes the values and packs each group of ``elements_per_word`` consecutive values of the last axis into a
+        word, the first one in the least significant bits.
+
+        Args:
+            x (ndarray): The values, with the size of the last axis a multiple of ``elements_per_word``.
+            elements_per_word (int): The number of elements per word.
+            element_width (int, optional): The number of bits between the elements in a word, at least ``width``.
+                Defaults to ``width``.
+
+        Returns:
+            ndarray: The words, as ``uint64`` if they have at most 64 bits, else as Python integers.
+        """
+        element_width = element_width or self.width
+        codes = self.encode(x)
+        codes = codes.reshape(codes.shape[:-1] + (-1, elements_per_word))
+        bits = codes.astype(np.uint64) & np.uint64(2**self.width - 1)
+        shifts = np.arange(elements_per_word) * element_width
+        if elements_per_word * element_width > 64:
+            bits, shifts = bits.astype(object), shifts.astype(object)
+        else:
+            shifts = shifts.astype(np.uint64)
+        return np.bitwise_or.reduce(bits << shifts, axis=-1)
+
+    def unpack(self, words, elements_per_word, element_width=None):
+        """Unpacks the elements of the words and decodes them, the inverse of :py:meth:`pack`.
+
+        Args:
+            words (ndarray): The words, as unsigned integers or Python integers.
+            elements_per_word (int): The number of elements per word.
+            element_width (int, optional): The number of bits between the elements in a word. Defaults to ``width``.
+
+        Returns:
+            ndarray: The values, with the last axis ``elements_per_word`` times longer than that of ``words``.
+        """
+        element_width = element_width or self.width
+        words = np.asarray(words)
+        shifts = np.arange(elements_per_word) * element_width
+        if words.dtype == object or elements_per_word * element_width > 64:
+            bits = (words.astype(object)[..., None] >> shifts.astype(object)) & (2**self.width - 1)
+        else:
+            bits = words.astype(np.uint64)[..., None] >> shifts.astype(np.uint64)
+        values = self.decode(bits)
+        return values.reshape(words.shape[:-1] + (-1,))
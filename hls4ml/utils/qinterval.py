@@ -39,6 +39,75 @@ def minimal_kif(array: np.ndarray):
     return k, i, f
 
 
+# Maximum number of elements of the temporary arrays created by the interval matrix multiplications
+_MATMUL_CHUNK_SIZE = 2**20
+
+
+def _matmul_chunks(P: int, C: int, Q: int):
+    """Split the contracted axis of a (P, C) x (C, Q) product, such that the (P, chunk, Q) temporaries stay small."""
+    step = max(1, _MATMUL_CHUNK_SIZE // max(P * Q, 1))
+    for start in range(0, C, step):
+        yield slice(start, min(start + step, C))
+
+
+def _min_product(a: np.ndarray, b: np.ndarray, ignore_zero: bool) -> np.ndarray:
+    """Compute min_c(a[p, c] * b[c, q]) with bounded memory, optionally ignoring zero products."""
+    out = np.full((a.shape[0], b.shape[1]), np.inf)
+    for s in _matmul_chunks(a.shape[0], a.shape[1], b.shape[1]):
+        prod = a[:, s, None] * b[None, s, :]
+        if ignore_zero:
+            prod[prod == 0] = np.inf
+        np.minimum(out, np.min(prod, axis=1), out=out)
+    return out
+
+
+def _const_matmul(_min: np.ndarray, _max: np.ndarray, _delta: np.ndarray, const: np.ndarray, const_first: bool):
+    """Product of an interval array and a constant array, contracting the last axis of the first operand with the first
+    axis of the second one. ``const_first`` selects between ``const @ interval`` and ``interval @ const``.
+
+    The bounds are computed with the sign-split of the constant: each interval is multiplied by the positive and by
+    the negative part of the constant, so the bounds are plain matrix products and no broadcast product is built.
+    """
+    _delta = np.broadcast_to(_delta, _min.shape)
+    const_pos, const_neg = np.maximum(const, 0), np.minimum(const, 0)
+    const_delta = 2.0 ** -_minimal_f(const)
+    if const_first:
+        out_shape = const.shape[:-1] + _min.shape[1:]
+        lo, hi, d = (x.reshape(x.shape[0], -1) for x in (_min, _max, _delta))
+        c_pos, c_neg, c_delta = (x.reshape(-1, x.shape[-1]) for x in (const_pos, const_neg, const_delta))
+        new_min = c_pos @ lo + c_neg @ hi
+        new_max = c_pos @ hi + c_neg @ lo
+        new_delta = _min_product(c_delta, d, ignore_zero=True)
+    else:
+        out_shape = _min.shape[:-1] + const.shape[1:]
+        lo, hi, d = (x.reshape(-1, x.shape[-1]) for x in (_min, _max, _delta))
+        c_pos, c_neg, c_delta = (x.reshape(x.shape[0], -1) for x in (const_pos, const_neg, const_delta))
+        new_min = lo @ c_pos + hi @ c_neg
+        new_max = hi @ c_pos + lo @ c_neg
+        new_delta = _min_product(d, c_delta, ignore_zero=True)
+    return new_min.reshape(out_shape), new_max.reshape(out_shape), new_delta.reshape(out_shape)
+
+
+def _interval_matmul(
+    min0: np.ndarray, max0: np.ndarray, delta0: np.ndarray, min1: np.ndarray, max1: np.ndarray, delta1: np.ndarray
+):
+    """Product of two interval arrays (``interval0 @ interval1``), accumulated over chunks of the contracted axis."""
+    out_shape = min0.shape[:-1] + min1.shape[1:]
+    lo0, hi0, d0 = (np.broadcast_to(x, min0.shape).reshape(-1, min0.shape[-1]) for x in (min0, max0, delta0))
+    lo1, hi1, d1 = (np.broadcast_to(x, min1.shape).reshape(min1.shape[0], -1) for x in (min1, max1, delta1))
+    P, C, Q = lo0.shape[0], lo0.shape[1], lo1.shape[1]
+
+    _min, _max = np.zeros((P, Q)), np.zeros((P, Q))
+    _delta = np.full((P, Q), np.inf)
+    for s in _matmul_chunks(P, C, Q):
+        a_lo, a_hi, b_lo, b_hi = lo0[:, s, None], hi0[:, s, None], lo1[None, s], hi1[None, s]
+        v1, v2, v3, v4 = a_lo * b_lo, a_hi * b_hi, a_lo * b_hi, a_hi * b_lo
+        _min += np.sum(np.minimum(np.minimum(v1, v2), np.minimum(v3, v4)), axis=1)
+        _max += np.sum(np.maximum(np.maximum(v1, v2), np.maximum(v3, v4)), axis=1)
+        np.minimum(_delta, np.min(d0[:, s, None] * d1[None, s], axis=1), out=_delta)
+    return _min.reshape(out_shape), _max.reshape(out_shape), _delta.reshape(out_shape)
+
+
 class _QIntervalArray:
     # For single dispatch purpose, as one cannot dispatch against itself'
     def __init__(self, min: np.ndarray, max: np.ndarray, delta: np.ndarray):
@@ -122,47 +191,18 @@ class QIntervalArray(_QIntervalArray):
 
     @singledispatchmethod
     def __matmul__(self, other: np.ndarray):
-        seq = ''.join(chr(ord('a') + i) for i in range(self.min.ndim))
-        eq = f'{seq},{seq[-1]}...->{seq}...'
-        ax = self.min.ndim - 1
-        v1 = np.einsum(eq, self.min, other, optimize=True)
-        v2 = np.einsum(eq, self.max, other, optimize=True)
-        other_delta = 2.0 ** -_minimal_f(other)
-        _delta = np.einsum(eq, self.delta, other_delta, optimize=True)
-        delta = np.min(np.where(_delta == 0, np.inf, _delta), axis=ax)
-        _min = np.sum(np.minimum(v1, v2), axis=ax)
-        _max = np.sum(np.maximum(v1, v2), axis=ax)
+        other = np.asarray(other, dtype=np.float64)
+        _min, _max, delta = _const_matmul(self.min, self.max, self.delta, other, const_first=False)
         return QIntervalArray(_min, _max, delta)
 
     @__matmul__.register
     def _(self, other: _QIntervalArray):
-        seq = ''.join(chr(ord('a') + i) for i in range(self.min.ndim))
-        eq = f'{seq},{seq[-1]}...->{seq}...'
-        ax = self.min.ndim - 1
-        v1 = np.einsum(eq, self.min, other.min, optimize=True)
-        v2 = np.einsum(eq, self.max, other.max, optimize=True)
-        v3 = np.einsum(eq, self.min, other.max, optimize=True)
-        v4 = np.einsum(eq, self.max, other.min, optimize=True)
-
-        _max = np.sum(np.maximum(np.maximum(v1, v2), np.maximum(v3, v4)), axis=ax)
-        _min = np.sum(np.minimum(np.minimum(v1, v2), np.minimum(v3, v4)), axis=ax)
-
-        _delta = np.einsum(eq, self.delta, other.delta, optimize=True)
-        delta = np.min(_delta, axis=ax)
-
+        _min, _max, delta = _interval_matmul(self.min, self.max, self.delta, other.min, other.max, other.delta)
         return QIntervalArray(_min, _max, delta)
 
     def __rmatmul__(self, other: np.ndarray):
-        seq = ''.join(chr(ord('a') + i) for i in range(other.ndim))
-        eq = f'{seq},{seq[-1]}...->{seq}...'
-        ax = other.ndim - 1
-        v1 = np.einsum(eq, other, self.min, optimize=True)
-        v2 = np.einsum(eq, other, self.max, optimize=True)
-        other_delta = 2.0 ** -_minimal_f(other)
-        _delta = np.einsum(eq, other_delta, self.delta, optimize=True)
-        delta = np.min(np.where(_delta == 0, np.inf, _delta), axis=ax)
-        _min = np.sum(np.minimum(v1, v2), axis=ax)
-        _max = np.sum(np.maximum(v1, v2), axis=ax)
+        other = np.asarray(other, dtype=np.float64)
+        _min, _max, delta = _const_matmul(self.min, self.max, self.delta, other, const_first=True)
         return QIntervalArray(_min, _max, delta)
 
     def transpose(self, axes: Sequence[int]):
@@ -244,9 +284,12 @@ class QIntervalArray(_QIntervalArray):
         return k, i, f
 
 
-def _exec_einsum(recipe: EinsumRecipe, input0: np.ndarray | QIntervalArray, input1: np.ndarray | QIntervalArray, operator):
+def _exec_einsum(recipe: EinsumRecipe, input0: np.ndarray | QIntervalArray, input1: np.ndarray | QIntervalArray):
     """Execute einsum operation on two input arrays.
 
+    The contraction is carried out as one matrix product per direct-sum index, so the memory used is bounded by the
+    interval matrix product (see ``_MATMUL_CHUNK_SIZE``) rather than growing with the full broadcast product.
+
     Args:
         recipe (EinsumRecipe): einsum recipe.
         input0 (np.ndarray): input0, the first input array.
@@ -255,44 +298,42 @@ def _exec_einsum(recipe: EinsumRecipe, input0: np.ndarray | QIntervalArray, inpu
     Returns:
         np.ndarray: output array.
     """
-    input0 = input0.transpose(recipe['in_transpose_idxs'][0]).ravel()
-    input1 = input1.transpose(recipe['in_transpose_idxs'][1]).ravel()
-    # output = np.zeros(recipe['L0'] * recipe['L1'] * recipe['I'], dtype=input0.dtype)
-    output = []
-
     L0, L1, I, C = recipe['L0'], recipe['L1'], recipe['I'], recipe['C']
 
+    input0 = input0.transpose(recipe['in_transpose_idxs'][0]).ravel().reshape((I, L0, C))
+    input1 = input1.transpose(recipe['in_transpose_idxs'][1]).ravel().reshape((I, L1, C))
+
+    output = []
     for i in range(I):
-        for l0 in range(L0):
-            A = input1[i * L1 * C : (i + 1) * L1 * C].reshape((L1, C))
-            B = input0[(i * L0 + l0) * C : (i * L0 + l0 + 1) * C]
-            output.append(operator(A, B))
+        A, B = input0[i], input1[i].transpose((1, 0))
+        if isinstance(A, np.ndarray) and isinstance(B, QIntervalArray):
+            output.append(B.rmatmul(A))
+        else:
+            output.append(A @ B)
     output = np.concatenate(output, axis=0)
 
     return output.reshape(recipe['out_interpert_shape']).transpose(recipe['out_transpose_idxs'])
 
 
 @overload
-def einsum(fn: str, input0: QIntervalArray, input1: QIntervalArray, operator=None) -> QIntervalArray: ...
+def einsum(fn: str, input0: QIntervalArray, input1: QIntervalArray) -> QIntervalArray: ...
 
 
 @overload
-def einsum(fn: str, input0: np.ndarray, input1: QIntervalArray, operator=None) -> QIntervalArray: ...
+def einsum(fn: str, input0: np.ndarray, input1: QIntervalArray) -> QIntervalArray: ...
 
 
 @overload
-def einsum(fn: str, input0: QIntervalArray, input1: np.ndarray, operator=None) -> QIntervalArray: ...
+def einsum(fn: str, input0: QIntervalArray, input1: np.ndarray) -> QIntervalArray: ...
 
 
 @overload
-def einsum(fn: str, input0: np.ndarray, input1: np.ndarray, operator=None) -> np.ndarray: ...
+def einsum(fn: str, input0: np.ndarray, input1: np.ndarray) -> np.ndarray: ...
 
 
 def einsum(fn: str, input0: np.ndarray | QIntervalArray, input1: np.ndarray | QIntervalArray) -> Any:  # type: ignore
     """Execute einsum operation on two input arrays.
 
-    WARNING: Order of multiplication is reversed -- watch out if you are using non-commutative operators.
-
     Args:
         fn (str): einsum string, e.g. 'ij,jk->ik'.
         input0 (np.ndarray): input0, the first input array.
@@ -302,11 +343,5 @@ def einsum(fn: str, input0: np.ndarray | QIntervalArray, input1: np.ndarray | QI
         np.ndarray: output array.
     """
 
-    def operator(A, B):
-        if isinstance(A, np.ndarray):
-            return B.__rmatmul__(A)
-        else:
-            return A @ B
-
     recipe = parse_einsum(fn, input0.shape, input1.shape)
-    return _exec_einsum(recipe, input0, input1, operator)
+    return _exec_einsum(recipe, input0, input1)
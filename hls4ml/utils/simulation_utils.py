@@ -1,10 +1,14 @@
 import csv
 import os
 import xml.etree.ElementTree as ET
-from collections import defaultdict
 
 import numpy as np
 
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
+
+# First 32-bit chunk of the binary data files of the testbench ('hls4' in ASCII), its bytes tell the byte order apart
+_TB_FILE_MARKER = 0x686C7334
+
 
 def parse_component_xml(component_xml_path):
     """
@@ -61,14 +65,38 @@ def annotate_axis_stream_widths(nn_config, vivado_project_path):
         layer.update({'axis_bus_width': w, 'axis_element_width': w // batch})
 
 
-def write_verilog_testbench(nn_config, testbench_output_path):
+def _tb_word_chunks(layer):
+    """
+    Number of 32-bit chunks of a word in the binary data files of the testbench: the packed word of a beat for stream
+    interfaces, or the value of a port for partitioned ones.
+    """
+    if layer['pragma'] == 'stream':
+        # The width of the output buses is annotated from the IP, the input buses are not padded
+        width = layer.get('axis_bus_width', (layer['integer_bits'] + layer['fractional_bits']) * layer['batch_size'])
+    else:
+        width = layer['integer_bits'] + layer['fractional_bits']
+    return -(-width // 32)
+
+
+def _tb_write_chunks(f, indent, file, word, n_chunks):
+    """
+    Write the $fwrite statements of a word to a binary data file of the testbench: big-endian 32-bit chunks (as read by
+    $fread), the least significant chunk first. The bytes are written one by one with %c, so that the byte order does
+    not depend on the simulator or the host.
+    """
+    for c in range(n_chunks):
+        chunk_bytes = ', '.join(f'{word}[{32 * c + 8 * b + 7}:{32 * c + 8 * b}]' for b in reversed(range(4)))
+        f.write(f'{indent}$fwrite({file}, "%c%c%c%c", {chunk_bytes});\n')
+
+
+def write_verilog_testbench(nn_config, testbench_output_path, n_samples=1):
     """
     Generate a Verilog testbench for a given neural network configuration.
     The testbench includes:
       - Clock and reset logic
       - DUT instantiation and AXI4-Stream/Partition interfaces
-      - Stimulus generation for inputs
-      - Data capture and logging for outputs
+      - Stimulus generation for inputs, with n_samples samples read from binary files (see write_tb_inputs)
+      - Data capture of the outputs to binary files (see read_testbench_log)
       - Latency measurement
     """
     pragma = nn_config['inputs'][0]['pragma']
@@ -277,14 +305,21 @@ def write_verilog_testbench(nn_config, testbench_output_path):
         f.write('    // Logging and Measurement Variables\n')
         f.write('    //------------------------------------------------------------------------\n')
         f.write('    integer csv_file;\n')
-        f.write('    integer file, r, value;\n')
-        f.write('    integer j;\n')
-        f.write('    integer total_bits;\n')
+        f.write('    integer r;\n')
+        f.write('    integer j, n;\n')
+        f.write('    reg [31:0] chunk;\n')
+        for i, layer in enumerate(nn_config['inputs']):
+            f.write(f'    integer in_file_{i};\n')
+            f.write(f'    reg [{32 * _tb_word_chunks(layer) - 1}:0] {layer["name"]}_word;\n')
+        for i, layer in enumerate(nn_config['outputs']):
+            f.write(f'    integer out_file_{i};\n')
+            f.write(f'    reg [{32 * _tb_word_chunks(layer) - 1}:0] {layer["name"]}_word;\n')
         f.write('    reg [63:0] cycle_count = 0;\n')
         f.write('    reg [63:0] start_cycle = 0;\n')
         f.write('    reg [63:0] end_cycle = 0;\n')
-        f.write('    reg [1:0] done_counter = 0;\n')
-        f.write('    reg old_ap_done = 0;\n\n')
+        f.write('    integer done_counter = 0;\n')
+        f.write('    reg old_ap_done = 0;\n')
+        f.write('    reg finish_pending = 0;\n\n')
 
         # ----------------------------------------------------------------------
         # Cycle Counting
@@ -326,6 +361,28 @@ def write_verilog_testbench(nn_config, testbench_output_path):
         f.write('        end\n')
         f.write('        $fwrite(csv_file, "output_name,index,value\\n");\n\n')
 
+        f.write('        // Open the binary data files\n')
+        for i, layer in enumerate(nn_config['inputs']):
+            f.write(f'        in_file_{i} = $fopen("../../../../{layer["name"]}_input_data.bin", "rb");\n')
+        for i, layer in enumerate(nn_config['outputs']):
+            f.write(f'        out_file_{i} = $fopen("../../../../{layer["name"]}_output_data.bin", "wb");\n')
+        f.write('\n')
+
+        # The files start with a marker chunk, the inputs are not sent if it is not read back as written
+        f.write('        // Check the marker of the input files and write the one of the output files\n')
+        for i, layer in enumerate(nn_config['inputs']):
+            f.write(f'        r = $fread(chunk, in_file_{i});\n')
+            f.write(f"        if (chunk !== 32'h{_TB_FILE_MARKER:08X}) begin\n")
+            f.write(f'            $display("ERROR: Unexpected marker %h in the input file of {layer["name"]}.", chunk);\n')
+            f.write(f'            $fwrite(csv_file, "InputFormatError,{i},%0d\\n", chunk);\n')
+            f.write('            $fclose(csv_file);\n')
+            f.write('            $finish;\n')
+            f.write('        end\n')
+        for i in range(len(nn_config['outputs'])):
+            f.write(f"        chunk = 32'h{_TB_FILE_MARKER:08X};\n")
+            _tb_write_chunks(f, '        ', f'out_file_{i}', 'chunk', 1)
+        f.write('\n')
+
         if pragma == 'stream':
             f.write('        // Start the DUT\n')
             f.write('        ap_start = 1;\n\n')
@@ -376,51 +433,49 @@ def write_verilog_testbench(nn_config, testbench_output_path):
                 f.write('        // Wait for ap_done to go high\n')
 
         # ----------------------------------------------------------------------
-        # Sending second pattern of inputs (read from file)
+        # Sending the samples (read from the binary files)
         # ----------------------------------------------------------------------
-        for layer in nn_config['inputs']:
-            i_bits = layer['integer_bits']
-            f_bits = layer['fractional_bits']
-            total_bits = i_bits + f_bits
+        # Words are read as big-endian 32-bit chunks, the least significant chunk first
+        f.write(f'        for (n = 0; n < {n_samples}; n = n + 1) begin\n')
+        for i, layer in enumerate(nn_config['inputs']):
             batch_size = layer['batch_size']
             fifo_depth = layer['fifo_depth']
             name = layer['name']
-            input_file = f'{name}_input_data.txt'
-            f.write(f'        // Sending second pattern of inputs for {name}\n')
+            f.write(f'            // Sending the inputs of the sample for {name}\n')
             if pragma == 'stream':
-                f.write(f'        {name}_tvalid = 1;\n')
-            f.write(f'        file = $fopen("../../../../{input_file}", "r");\n')
-            f.write('        if (file == 0) begin\n')
-            f.write(f'            $display("Error opening file {input_file}");\n')
-            f.write('            $finish;\n')
-            f.write('        end\n')
-            f.write(f'        for (j = 0; j < {fifo_depth}; j = j + 1) begin\n')
-            # For each line, read batch_size values:
-            for k in range(batch_size):
-                upper = (k + 1) * total_bits - 1
-                lower = k * total_bits
-                f.write('            r = $fscanf(file, "%d", value);\n')
+                f.write(f'            {name}_tvalid = 1;\n')
+            f.write(f'            for (j = 0; j < {fifo_depth}; j = j + 1) begin\n')
+            for k in range(1 if pragma == 'stream' else batch_size):
+                for c in range(_tb_word_chunks(layer)):
+                    f.write(f'                r = $fread(chunk, in_file_{i});\n')
+                    f.write(f'                {name}_word[{32 * c + 31}:{32 * c}] = chunk;\n')
                 if pragma == 'stream':
-                    f.write(f'            {name}_tdata[{upper}:{lower}] = value;\n')
+                    f.write(f'                {name}_tdata = {name}_word;\n')
                 else:
-                    f.write(f'            {name}_{k} = value;\n')
+                    f.write(f'                {name}_{k} = {name}_word;\n')
             if pragma == 'stream':
-                f.write(f'            while ({name}_tready == 0) @(posedge ap_clk);\n')
-                f.write('            @(posedge ap_clk);\n')
-            f.write('        end\n')
-            if pragma == 'partition':
-                f.write('        // Assert valid signals\n')
-                for k in range(batch_size):
-                    f.write(f'        {name}_{k}_ap_vld = 1;\n')
-                f.write('        // Start the DUT\n')
-                f.write('        ap_start = 1;\n')
-                f.write('        @(posedge ap_clk);\n')
-                f.write('        ap_start = 0;\n')
-                f.write('        // Deassert valid signals\n')
-                for k in range(batch_size):
-                    f.write(f'        {name}_{k}_ap_vld = 0;\n')
-                f.write('\n')
-
+                f.write(f'                while ({name}_tready == 0) @(posedge ap_clk);\n')
+                f.write('                @(posedge ap_clk);\n')
+            f.write('            end\n')
+            if pragma == 'stream':
+                f.write(f'            {name}_tvalid = 0;\n')
+        if pragma == 'partition':
+            f.write('            // Assert valid signals\n')
+            for layer in nn_config['inputs']:
+                for k in range(layer['batch_size']):
+                    f.write(f'            {layer["name"]}_{k}_ap_vld = 1;\n')
+            f.write('            // Start the DUT\n')
+            f.write('            ap_start = 1;\n')
+            f.write('            @(posedge ap_clk);\n')
+            f.write('            ap_start = 0;\n')
+            f.write('            // Deassert valid signals\n')
+            for layer in nn_config['inputs']:
+                for k in range(layer['batch_size']):
+                    f.write(f'            {layer["name"]}_{k}_ap_vld = 0;\n')
+            f.write('            // Wait for the sample to be processed before sending the next one\n')
+            f.write('            wait (ap_done);\n')
+            f.write('            wait (!ap_done);\n')
+        f.write('        end\n')
         f.write('    end\n\n')
 
         # ----------------------------------------------------------------------
@@ -428,48 +483,28 @@ def write_verilog_testbench(nn_config, testbench_output_path):
         # ----------------------------------------------------------------------
         f.write('    //------------------------------------------------------------------------\n')
         f.write('    // Output Data Capture and Logging\n')
-        f.write('    // Capture output for 2nd input (done_counter == 1) and log them to CSV.\n')
+        f.write('    // Capture the outputs of the samples (done_counter >= 1) to the binary files.\n')
         f.write('    //------------------------------------------------------------------------\n\n')
 
         for i, layer in enumerate(nn_config['outputs']):
-            i_bits = layer['integer_bits']
-            f_bits = layer['fractional_bits']
-            total_bits = i_bits + f_bits
             layer_name = layer['name']
             batch_size = layer['batch_size']
+            n_chunks = _tb_word_chunks(layer)
 
             f.write(f'    //Output capture for {layer_name}\n')
-            f.write(f'    integer idx_{i};\n')
-            if pragma == 'stream':
-                f.write(f'    reg signed [{total_bits - 1}:0] fixed_val_{i};\n')
-                f.write(f'    real real_val_{i};\n')
-            else:
-                f.write(f'    reg signed [{total_bits - 1}:0] fixed_val_{i};\n')
-                f.write(f'    real real_val_{i};\n')
             f.write('    always @(posedge ap_clk) begin\n')
             if pragma == 'stream':
-                axis_element_width = layer['axis_element_width']
-                f.write(f'        if (done_counter == 1 && {layer_name}_tvalid && {layer_name}_tready) begin\n')
-                f.write(f'            for (idx_{i} = 0; idx_{i} < {batch_size}; idx_{i} = idx_{i} + 1) begin\n')
-                f.write(
-                    f'                fixed_val_{i} = {layer_name}_tdata[idx_{i}*{axis_element_width} +: {total_bits}];\n'
-                )
-                f.write(f'                real_val_{i}  = fixed_val_{i} / (1.0 * (1 << {f_bits}));\n')
-                f.write(f'                $display("Output {layer_name}[%0d]: %.15f", idx_{i}, real_val_{i});\n')
-                f.write('                // Log result to CSV\n')
-                f.write(f'                $fwrite(csv_file, "%s,%0d,%.15f\\n", "{layer_name}", idx_{i}, real_val_{i});\n')
-                f.write('            end\n')
+                f.write(f'        if (done_counter >= 1 && {layer_name}_tvalid && {layer_name}_tready) begin\n')
+                f.write(f'            {layer_name}_word = {layer_name}_tdata;\n')
+                _tb_write_chunks(f, '            ', f'out_file_{i}', f'{layer_name}_word', n_chunks)
             else:
                 f.write(
                     '        // Note: The usual expected behavior is to have valid outputs (ap_vld=1) when ap_done = 1\n'
                 )
-                f.write('        if (done_counter == 1 && ap_done == 1) begin\n')
+                f.write('        if (done_counter >= 1 && ap_done && !old_ap_done) begin\n')
                 for idx in range(batch_size):
-                    f.write(f'            fixed_val_{i} = {layer_name}_{idx}[{total_bits - 1}:0];\n')
-                    f.write(f'            real_val_{i} = fixed_val_{i} / (1.0 * (1 << {f_bits}));\n')
-                    f.write(f'            $display("Output {layer_name}_{idx}: %.15f", real_val_{i});\n')
-                    f.write('            // Log result to CSV\n')
-                    f.write(f'            $fwrite(csv_file, "%s,%0d,%.15f\\n", "{layer_name}", {idx}, real_val_{i});\n')
+                    f.write(f'            {layer_name}_word = {layer_name}_{idx};\n')
+                    _tb_write_chunks(f, '            ', f'out_file_{i}', f'{layer_name}_word', n_chunks)
             f.write('        end\n')
             f.write('    end\n\n')
 
@@ -495,14 +530,28 @@ def write_verilog_testbench(nn_config, testbench_output_path):
         f.write('                    start_cycle = cycle_count;\n')
         f.write('                    $display("Worst latency (first input set): %0d cycles", cycle_count);\n')
         f.write('                    $fwrite(csv_file, "%s,%0d,%0d\\n", "WorstLatency", 0, cycle_count);\n')
-        f.write('                end else if (done_counter == 1) begin\n')
-        f.write('                    end_cycle = cycle_count;\n')
-        f.write('                    $display("Best latency (second input set): %0d cycles", end_cycle - start_cycle);\n')
-        f.write('                    $fwrite(csv_file, "%s,%0d,%0d\\n", "BestLatency", 0, end_cycle - start_cycle);\n')
-        f.write('                    $fclose(csv_file);\n')
-        f.write('                    $finish;\n')
+        f.write('                end else begin\n')
+        f.write('                    if (done_counter == 1) begin\n')
+        f.write('                        end_cycle = cycle_count;\n')
+        f.write(
+            '                        $display("Best latency (second input set): %0d cycles", end_cycle - start_cycle);\n'
+        )
+        f.write('                        $fwrite(csv_file, "%s,%0d,%0d\\n", "BestLatency", 0, end_cycle - start_cycle);\n')
+        f.write('                    end\n')
+        f.write(f'                    if (done_counter == {n_samples}) begin\n')
+        f.write('                        // Finish on the next cycle, once the outputs of the last sample are captured\n')
+        f.write('                        finish_pending <= 1;\n')
+        f.write('                    end\n')
         f.write('                end\n')
         f.write('            end\n')
+        f.write('            if (finish_pending) begin\n')
+        f.write('                $fclose(csv_file);\n')
+        for i in range(len(nn_config['inputs'])):
+            f.write(f'                $fclose(in_file_{i});\n')
+        for i in range(len(nn_config['outputs'])):
+            f.write(f'                $fclose(out_file_{i});\n')
+        f.write('                $finish;\n')
+        f.write('            end\n')
         f.write('        end\n')
         f.write('    end\n\n')
 
@@ -510,11 +559,14 @@ def write_verilog_testbench(nn_config, testbench_output_path):
 
 
 def prepare_zero_inputs(input_layers):
-    zero_list = [np.zeros((layer['fifo_depth'], layer['batch_size']), dtype=np.float32) for layer in input_layers]
+    zero_list = [np.zeros((1, layer['fifo_depth'], layer['batch_size']), dtype=np.float32) for layer in input_layers]
     return zero_list[0] if len(zero_list) == 1 else zero_list
 
 
 def prepare_tb_inputs(simulation_input_data, input_layers):
+    """
+    Reshape the input data of the testbench to (n_samples, fifo_depth, batch_size) for each input.
+    """
     if simulation_input_data is None:
         return prepare_zero_inputs(input_layers)
 
@@ -532,16 +584,79 @@ def prepare_tb_inputs(simulation_input_data, input_layers):
     for data, layer in zip(data_list, input_layers):
         arr = np.asarray(data)
         total = layer['fifo_depth'] * layer['batch_size']
-        if arr.size != total:
-            raise ValueError(f"Layer '{layer['name']}' has {arr.size} elements; expected {total}.")
-        reshaped.append(arr.reshape((layer['fifo_depth'], layer['batch_size'])))
+        if arr.size == 0 or arr.size % total != 0:
+            raise ValueError(f"Layer '{layer['name']}' has {arr.size} elements; expected a multiple of {total}.")
+        reshaped.append(arr.reshape((-1, layer['fifo_depth'], layer['batch_size'])))
+    if len({len(arr) for arr in reshaped}) > 1:
+        raise ValueError('All inputs must have the same number of samples.')
 
     return reshaped[0] if len(reshaped) == 1 else reshaped
 
 
-def read_testbench_log(testbench_log_path, outputs):
+def get_io_codec(layer):
+    """
+    Return the codec of the fixed-point type of an input or output of the stitched design, as described in nn_config.
+    """
+    return FixedPointCodec(
+        layer['integer_bits'] + layer['fractional_bits'],
+        layer['integer_bits'],
+        signed=bool(layer['signed']),
+        rounding_mode=layer.get('rounding_mode', 'TRN'),
+        saturation_mode=layer.get('saturation_mode', 'WRAP'),
+    )
+
+
+def _words_to_chunks(words, n_chunks):
+    """
+    Split words into 32-bit chunks, the least significant chunk first.
+    """
+    words = np.asarray(words)
+    if words.dtype == object:
+        chunks = [(words >> (32 * c)) & 0xFFFFFFFF for c in range(n_chunks)]
+    else:
+        words = words.astype(np.uint64)
+        chunks = [(words >> np.uint64(32 * c)) & np.uint64(0xFFFFFFFF) for c in range(n_chunks)]
+    return np.stack(chunks, axis=-1).astype(np.uint32)
+
+
+def _chunks_to_words(chunks):
+    """
+    Combine 32-bit chunks (the least significant first, along the last axis) into words, as uint64 if they fit.
+    """
+    n_chunks = chunks.shape[-1]
+    if n_chunks > 2:
+        chunks = chunks.astype(object)
+        shifts = np.arange(n_chunks, dtype=object) * 32
+    else:
+        chunks = chunks.astype(np.uint64)
+        shifts = np.arange(n_chunks, dtype=np.uint64) * np.uint64(32)
+    return np.bitwise_or.reduce(chunks << shifts, axis=-1)
+
+
+def write_tb_inputs(tb_inputs, input_layers, folder_path):
+    """
+    Write the binary input data files of the Verilog testbench, with the bits of the fixed-point input types. The file
+    holds the packed word of each beat for stream interfaces, or the value of each port for partitioned ones, sample
+    after sample, after a marker chunk. Each word is written as big-endian 32-bit chunks (as read by $fread), the least
+    significant first.
+    """
+    if isinstance(tb_inputs, np.ndarray):
+        tb_inputs = [tb_inputs]
+
+    for data, layer in zip(tb_inputs, input_layers):
+        codec = get_io_codec(layer)
+        data = np.asarray(data).reshape((-1, layer['batch_size']))
+        words = codec.pack(data, layer['batch_size'] if layer['pragma'] == 'stream' else 1)
+        chunks = _words_to_chunks(words, _tb_word_chunks(layer))
+        chunks = np.concatenate([[_TB_FILE_MARKER], chunks.ravel()])
+        chunks.astype('>u4').tofile(os.path.join(folder_path, f'{layer["name"]}_input_data.bin'))
+
+
+def read_testbench_log(testbench_log_path, outputs, n_samples=1):
     """
-    Reads the testbench log file and returns a dictionary
+    Reads the testbench log file and the binary output data files next to it and returns a dictionary with the latencies
+    and the outputs, of shape (n_samples, size) or (size,) for a single sample. The output files hold a marker chunk
+    and the big-endian 32-bit chunks of the words, the least significant chunk of each word first.
     """
     if not os.path.exists(testbench_log_path):
         print(f"Error: The file '{testbench_log_path}' does not exist.")
@@ -558,7 +673,7 @@ def read_testbench_log(testbench_log_path, outputs):
 
             col_index = {col: idx for idx, col in enumerate(header)}
             best_latency = worst_latency = None
-            output_data = defaultdict(list)
+            format_errors = []
 
             for row in reader:
                 output_name = row[col_index['output_name']]
@@ -567,33 +682,51 @@ def read_testbench_log(testbench_log_path, outputs):
                     best_latency = int(value)
                 elif output_name == 'WorstLatency':
                     worst_latency = int(value)
-                else:
-                    index = int(row[col_index['index']])
-                    output_data[output_name].append((index, float(value)))
-
-            if best_latency is None or worst_latency is None:
-                print('Error: BestLatency or WorstLatency not found.')
+                elif output_name == 'InputFormatError':
+                    format_errors.append(f'input {row[col_index["index"]]} (marker {int(value):#010x})')
+
+        if format_errors:
+            print(f'Error: The testbench did not read back the marker of the input data files: {", ".join(format_errors)}.')
+            return {}
+
+        if best_latency is None or worst_latency is None:
+            print('Error: BestLatency or WorstLatency not found.')
+            return {}
+        sim_dict = {'BestLatency': best_latency, 'WorstLatency': worst_latency, 'BehavSimResults': []}
+
+        folder_path = os.path.dirname(testbench_log_path)
+        for layer in outputs:
+            output_path = os.path.join(folder_path, f'{layer["name"]}_output_data.bin')
+            if not os.path.exists(output_path):
+                print(f"Warning: Expected output '{layer['name']}' not found in testbench outputs.")
+                continue
+
+            # The words of the beats of stream interfaces, or the values of the ports of partitioned ones
+            n_chunks = _tb_word_chunks(layer)
+            chunks = np.fromfile(output_path, dtype='>u4')
+            if len(chunks) == 0 or chunks[0] != _TB_FILE_MARKER:
+                print(f"Error: Unexpected marker in the output data file of '{layer['name']}'.")
                 return {}
-            sim_dict = {'BestLatency': best_latency, 'WorstLatency': worst_latency, 'BehavSimResults': []}
-            ordered_output_names = [entry['name'] for entry in outputs]
-
-            for name in ordered_output_names:
-                if name not in output_data:
-                    print(f"Warning: Expected output '{name}' not found in testbench log.")
-                    continue
-
-                indices_values = output_data[name]
-                max_index = max(index for index, _ in indices_values)
-                array = np.zeros(max_index + 1, dtype=np.float64)
-                for index, value in indices_values:
-                    array[index] = value
-                sim_dict['BehavSimResults'].append(array)
-
-            # If only one set of results, return it as a single array instead of a list
-            if len(sim_dict['BehavSimResults']) == 1:
-                sim_dict['BehavSimResults'] = sim_dict['BehavSimResults'][0]
-
-            return sim_dict
+            chunks = chunks[1:]
+            if len(chunks) % (n_chunks * n_samples) != 0:
+                raise ValueError(
+                    f"{len(chunks)} chunks in the output data file of '{layer['name']}', "
+                    f'expected a multiple of {n_chunks * n_samples}'
+                )
+            words = _chunks_to_words(chunks.reshape((-1, n_chunks)))
+            codec = get_io_codec(layer)
+            if layer['pragma'] == 'stream':
+                array = codec.unpack(words, layer['batch_size'], layer['axis_element_width'])
+            else:
+                array = codec.decode(words)
+            array = array.reshape((n_samples, -1))
+            sim_dict['BehavSimResults'].append(array[0] if n_samples == 1 else array)
+
+        # If only one set of results, return it as a single array instead of a list
+        if len(sim_dict['BehavSimResults']) == 1:
+            sim_dict['BehavSimResults'] = sim_dict['BehavSimResults'][0]
+
+        return sim_dict
 
     except (KeyError, IndexError, ValueError) as e:
         print(f'Error: Issue with CSV file format or data: {e}')
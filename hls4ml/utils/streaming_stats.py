@@ -0,0 +1,299 @@
+"""Mergeable streaming accumulators for profiling large datasets.
+
+The accumulators in this module ingest data batch by batch and never keep the full set of observed values in memory.
+All of them can be merged, so partial results computed in separate worker processes can be combined afterwards.
+"""
+
+import numpy as np
+
+
+class Log2Histogram:
+    """Histogram of the magnitudes of the observed values, with one bin per power of two.
+
+    Bin ``k`` counts the values with ``2**(min_exp + k) <= |x| < 2**(min_exp + k + 1)``, i.e., the bin edges coincide
+    with the bit boundaries of a fixed-point number. Zeros are counted separately. Values outside of the binned range
+    are accumulated in the first/last bin.
+
+    Args:
+        min_exp (int, optional): Exponent of the lower edge of the first bin. Defaults to -64.
+        max_exp (int, optional): Exponent of the upper edge of the last bin. Defaults to 64.
+    """
+
+    def __init__(self, min_exp=-64, max_exp=64):
+        if max_exp <= min_exp:
+            raise ValueError(f'max_exp ({max_exp}) must be larger than min_exp ({min_exp})')
+        self.min_exp = min_exp
+        self.max_exp = max_exp
+        self.counts = np.zeros(max_exp - min_exp, dtype=np.int64)
+        self.n_zeros = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        """Number of non-zero values observed."""
+        return int(self.counts.sum())
+
+    @property
+    def signed(self):
+        """Whether any negative value was observed."""
+        return bool(self.min < 0)
+
+    def update(self, x):
+        """Add a batch of values to the histogram.
+
+        Args:
+            x (array_like): The values to add. Any shape is accepted, NaNs are ignored.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        mag = np.abs(x[x != 0])
+        self.n_zeros += x.size - mag.size
+        if mag.size == 0:
+            return
+        # |x| = m * 2**e with 0.5 <= m < 1, hence floor(log2(|x|)) = e - 1 exactly
+        _, e = np.frexp(mag)
+        idx = np.clip(e - 1 - self.min_exp, 0, self.counts.size - 1)
+        self.counts += np.bincount(idx, minlength=self.counts.size)
+
+    def merge(self, other):
+        """Merge the content of another histogram with the same binning into this one.
+
+        Args:
+            other (Log2Histogram): The histogram to merge.
+
+        Returns:
+            Log2Histogram: self
+        """
+        if (other.min_exp, other.max_exp) != (self.min_exp, self.max_exp):
+            raise ValueError('Cannot merge histograms with different binning')
+        self.counts += other.counts
+        self.n_zeros += other.n_zeros
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def exponent_range(self):
+        """Returns the range of occupied bins as ``(low, high)`` exponents, such that all non-zero magnitudes are in
+        ``[2**low, 2**high)``. Returns ``None`` if no non-zero value was observed.
+        """
+        nonzero = np.flatnonzero(self.counts)
+        if nonzero.size == 0:
+            return None
+        return int(nonzero[0]) + self.min_exp, int(nonzero[-1]) + self.min_exp + 1
+
+    def integer_bits(self, signed=None):
+        """Number of integer bits (including the sign bit, as in ``ap_fixed<W, I>``) needed to represent all the
+        observed values without overflow.
+
+        Args:
+            signed (bool, optional): Whether the type is signed. If not specified, the type is signed if any negative
+                value was observed.
+
+        Returns:
+            int: The number of integer bits. May be negative if all values are small.
+        """
+        if signed is None:
+            signed = self.signed
+        i = -np.inf
+        if self.max > 0:
+            # Positive values need max < 2**i, i.e., i = floor(log2(max)) + 1
+            _, e = np.frexp(self.max)
+            i = int(e)
+        if self.min < 0:
+            # Negative values need -2**i <= min, i.e., i = ceil(log2(-min))
+            m, e = np.frexp(-self.min)
+            i = max(i, int(e) - 1 if m == 0.5 else int(e))
+        if i == -np.inf:
+            return int(signed)
+        return int(i) + int(signed)
+
+    def summary(self):
+        """Summary in the histogram format used by :py:func:`hls4ml.model.profiling.array_to_summary`, normalized to
+        unit sum and padded with one empty bin on each side.
+        """
+        low, high = self.exponent_range()
+        h = self.counts[low - self.min_exp : high - self.min_exp].astype(np.float64)
+        h = np.concatenate([[0.0], h / h.sum(), [0.0]])
+        b = np.arange(low - 1, high + 2, dtype=np.float64)
+        return {'h': h, 'b': b}
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch in the style of the merging t-digest.
+
+    The sketch keeps at most about ``compression`` weighted centroids. Centroids are formed with the ``k1`` scale function,
+    so they are small at the tails of the distribution and the extreme quantiles are accurate. While fewer than
+    ``compression`` values have been observed, the sketch is exact and quantiles match ``np.percentile``.
+
+    Args:
+        compression (int, optional): The maximum number of centroids to keep. Defaults to 200.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        """Total number of values observed."""
+        return int(self.weights.sum())
+
+    def update(self, x):
+        """Add a batch of values to the sketch.
+
+        Args:
+            x (array_like): The values to add. Any shape is accepted, NaNs are ignored.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        self._compress(np.concatenate([self.means, x]), np.concatenate([self.weights, np.ones(x.size)]))
+
+    def merge(self, other):
+        """Merge the content of another sketch into this one.
+
+        Args:
+            other (QuantileSketch): The sketch to merge.
+
+        Returns:
+            QuantileSketch: self
+        """
+        if other.means.size == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        if means.size <= self.compression:
+            self.means, self.weights = means, weights
+            return
+        cum = np.cumsum(weights)
+        total = cum[-1]
+        q = (cum - weights / 2) / total
+        # k1 scale function, maps [0, 1] onto [-compression / 2, compression / 2]
+        k = np.floor(self.compression / np.pi * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.diff(k, prepend=k[0] - 1))
+        w = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / w
+        self.weights = w
+
+    def quantile(self, q):
+        """Estimate the quantile(s) ``q`` of the observed values, with the same (linear) interpolation as
+        ``np.quantile``.
+
+        Args:
+            q (float or array_like): The quantile(s) to compute, in [0, 1].
+
+        Returns:
+            float or np.ndarray: The estimated quantile(s).
+        """
+        if self.means.size == 0:
+            raise ValueError('Cannot compute quantiles of an empty sketch')
+        q = np.asarray(q, dtype=np.float64)
+        # Position of each centroid in the sorted sequence of the observed values
+        pos = np.cumsum(self.weights) - (self.weights + 1) / 2
+        r = np.interp(q * (self.count - 1), pos, self.means)
+        r = np.where(q <= 0, self.min, np.where(q >= 1, self.max, r))
+        return r if r.ndim else float(r)
+
+
+class StreamingSummary:
+    """Streaming summary of the non-zero magnitudes of a tensor, as used by the profiling plots.
+
+    Combines a :py:class:`Log2Histogram` of the (signed) values with a :py:class:`QuantileSketch` of the non-zero
+    magnitudes, which can be turned into the same summaries as :py:func:`hls4ml.model.profiling.array_to_summary` with
+    ``summary()``.
+
+    Args:
+        compression (int, optional): Compression of the quantile sketch. Defaults to 200.
+        min_exp (int, optional): Exponent of the lower edge of the first histogram bin. Defaults to -64.
+        max_exp (int, optional): Exponent of the upper edge of the last histogram bin. Defaults to 64.
+    """
+
+    def __init__(self, compression=200, min_exp=-64, max_exp=64):
+        self.histogram = Log2Histogram(min_exp=min_exp, max_exp=max_exp)
+        self.quantiles = QuantileSketch(compression=compression)
+
+    @property
+    def count(self):
+        """Number of non-zero values observed."""
+        return self.histogram.count
+
+    def update(self, x):
+        """Add a batch of values.
+
+        Args:
+            x (array_like): The values to add. Any shape is accepted.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        self.histogram.update(x)
+        self.quantiles.update(np.abs(x[x != 0]))
+
+    def merge(self, other):
+        """Merge another summary into this one.
+
+        Args:
+            other (StreamingSummary): The summary to merge.
+
+        Returns:
+            StreamingSummary: self
+        """
+        self.histogram.merge(other.histogram)
+        self.quantiles.merge(other.quantiles)
+        return self
+
+    def integer_bits(self, signed=None):
+        """See :py:meth:`Log2Histogram.integer_bits`."""
+        return self.histogram.integer_bits(signed=signed)
+
+    def summary(self, fmt='boxplot'):
+        """Summarize the observed non-zero magnitudes.
+
+        Args:
+            fmt (str, optional): Either 'boxplot' or 'histogram'. Defaults to 'boxplot'.
+
+        Returns:
+            dict: The summary, in the format of :py:func:`hls4ml.model.profiling.array_to_summary`.
+        """
+        if fmt == 'boxplot':
+            q1, med, q3 = self.quantiles.quantile([0.25, 0.5, 0.75])
+            return {'med': med, 'q1': q1, 'q3': q3, 'whislo': self.quantiles.min, 'whishi': self.quantiles.max}
+        elif fmt == 'histogram':
+            return self.histogram.summary()
+        raise ValueError(f'Unknown summary format: {fmt}')
+
+
+def iter_batches(X, batch_size):
+    """Split the input data along the first axis into batches of (at most) ``batch_size`` samples.
+
+    Args:
+        X (ndarray or list of ndarray): The data, with the samples along the first axis of every array.
+        batch_size (int or None): The number of samples per batch. If None, ``X`` is returned as a single batch.
+
+    Yields:
+        ndarray or list of ndarray: The batches, in the format of ``X``.
+    """
+    if batch_size is None:
+        yield X
+        return
+    n_samples = len(X[0]) if isinstance(X, (list, tuple)) else len(X)
+    for start in range(0, n_samples, batch_size):
+        if isinstance(X, (list, tuple)):
+            yield [x[start : start + batch_size] for x in X]
+        else:
+            yield X[start : start + batch_size]
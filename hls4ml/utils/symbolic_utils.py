@@ -1,6 +1,10 @@
 import subprocess
 import tempfile
 
+import numpy as np
+
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
+
 math_lut_julia = """
 function math_lut(fun::Function, x::Float32 ; N::Integer = 1024, range_start::Real = 0, range_end::Real = 8)
     range = range_end - range_start
@@ -67,12 +71,295 @@ def register_pysr_lut_function(func, julia_main=None):
 
 
 class LUTFunction:
-    def __init__(self, name, math_func, range_start, range_end, table_size=1024) -> None:
+    def __init__(self, name, math_func, range_start, range_end, table_size=1024, max_error=None) -> None:
         self.name = name
         self.math_func = math_func
         self.range_start = range_start
         self.range_end = range_end
         self.table_size = table_size
+        self.max_error = max_error
+
+
+def eliminate_common_subexpressions(expressions):
+    """Hoists the subexpressions shared by (or repeated within) the given expressions into intermediate variables.
+
+    The intermediate variables are named ``cse_0``, ``cse_1``, etc.
+
+    Args:
+        expressions (list): List of SymPy expressions or strings.
+
+    Returns:
+        tuple: The list of ``(symbol, expression)`` definitions of the intermediate variables, in order of evaluation, and
+            the list of the expressions rewritten in terms of them.
+    """
+    import sympy
+
+    expressions = [sympy.sympify(expr) for expr in expressions]
+    return sympy.cse(expressions, symbols=sympy.numbered_symbols('cse_'), order='none')
+
+
+def _quantize(x, precision):
+    """Casts the values to a fixed-point type, as the assignment of a ``double`` to an ``ap_fixed`` variable does."""
+    return FixedPointCodec.from_precision(precision).quantize(x)
+
+
+# NumPy equivalents of the math functions used in expressions (by the name of the SymPy function) and LUTs
+_numpy_functions = {
+    'Abs': np.abs,
+    'sqrt': np.sqrt,
+    'Cbrt': np.cbrt,
+    'exp': np.exp,
+    'exp2': np.exp2,
+    'expm1': np.expm1,
+    'log': np.log,
+    'log10': np.log10,
+    'log2': np.log2,
+    'log1p': np.log1p,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'asin': np.arcsin,
+    'acos': np.arccos,
+    'atan': np.arctan,
+    'atan2': np.arctan2,
+    'sinh': np.sinh,
+    'cosh': np.cosh,
+    'tanh': np.tanh,
+    'asinh': np.arcsinh,
+    'acosh': np.arccosh,
+    'atanh': np.arctanh,
+    'sinpi': lambda x: np.sin(np.pi * x),
+    'cospi': lambda x: np.cos(np.pi * x),
+    'floor': np.floor,
+    'ceiling': np.ceil,
+}
+
+
+class _LookupTable:
+    """Emulates ``nnet::lookup_table`` of the given type."""
+
+    def __init__(self, lut_fn, precision):
+        n = lut_fn.table_size
+        self.precision = precision
+        self.size = n
+        self.range_start = _quantize(lut_fn.range_start, precision)
+        range_end = _quantize(lut_fn.range_end, precision)
+        # The divisions keep the fractional bits of the numerator, rounding toward zero
+        scale = 2.0**precision.fractional
+        step = _quantize(np.trunc((range_end - self.range_start) * scale / n) / scale, precision)
+        self.base_div = np.trunc(n / _quantize(range_end - self.range_start, precision))
+        points = _quantize(self.range_start + np.arange(n) * step, precision)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.samples = _quantize(_numpy_functions[lut_fn.math_func](points), precision)
+
+    def __call__(self, x):
+        index = np.trunc((_quantize(x, self.precision) - self.range_start) * self.base_div)
+        return self.samples[np.clip(index, 0, self.size - 1).astype(np.int64)]
+
+
+def size_lut_function(lut_fn, precision, max_error, max_table_size=2**15, max_points=2**20):
+    """Finds the smallest LUT approximating a function within a maximum absolute error.
+
+    The range of the LUT is widened to the next power of two (shifted down if it would exceed the type), and its size is
+    the smallest power of two for which the error is at most ``max_error``. The error is evaluated on the values of the
+    type within the original range (or on ``max_points`` of them, evenly spaced), against the function evaluated in double
+    precision.
+
+    Args:
+        lut_fn (LUTFunction): The LUT function, defining the math function and the range to approximate it in.
+        precision (FixedPrecisionType): The type of the LUT, its inputs and outputs.
+        max_error (float): Maximum absolute error.
+        max_table_size (int, optional): Largest table to consider. Defaults to 2**15.
+        max_points (int, optional): Maximum number of values to evaluate the error on. Defaults to 2**20.
+
+    Returns:
+        tuple: The sized ``LUTFunction`` (``None`` if no table meets the bound) and its error (the error of the largest
+            table if no table meets the bound).
+    """
+    lsb = 2.0**-precision.fractional
+    x = np.arange(np.ceil(lut_fn.range_start / lsb), np.ceil(lut_fn.range_end / lsb)) * lsb
+    if len(x) > max_points:
+        x = x[:: int(np.ceil(len(x) / max_points))]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reference = _numpy_functions[lut_fn.math_func](x)
+    x, reference = x[np.isfinite(reference)], reference[np.isfinite(reference)]
+
+    width = 2.0 ** np.ceil(np.log2(lut_fn.range_end - lut_fn.range_start))
+    range_start = lut_fn.range_start
+    if range_start + width > 2.0 ** (precision.integer - precision.signed):
+        range_start = lut_fn.range_end - width
+    range_end = range_start + width
+    if float(range_start).is_integer() and float(range_end).is_integer():
+        range_start, range_end = int(range_start), int(range_end)
+
+    error = np.inf
+    table_size = 1
+    while table_size <= max_table_size:
+        sized_fn = LUTFunction(lut_fn.name, lut_fn.math_func, range_start, range_end, table_size, lut_fn.max_error)
+        error = np.abs(_LookupTable(sized_fn, precision)(x) - reference).max() if len(x) else np.inf
+        if error <= max_error:
+            return sized_fn, error
+        table_size *= 2
+
+    return None, error
+
+
+class _ExpressionEvaluator:
+    """Evaluates SymPy expressions the way the code generated by ``SymbolicExpressionBackend`` computes them.
+
+    Evaluating an expression returns its values and the number of fractional bits of its exact fixed-point type (``None``
+    for floating-point values). The results are cached, so the subexpressions shared by several expressions are evaluated
+    once.
+    """
+
+    def __init__(self, X, result_t, lut_functions):
+        self.X = X
+        self.result_t = result_t
+        self.luts = {lut_fn.name: _LookupTable(lut_fn, result_t) for lut_fn in lut_functions}
+        self.results = {}
+
+    def __call__(self, expr):
+        result = self.results.get(expr)
+        if result is None:
+            result = self.results[expr] = self._evaluate(expr)
+        return result
+
+    def cast(self, value):
+        return _quantize(value, self.result_t), self.result_t.fractional
+
+    def _product(self, factors):
+        values, fracs = zip(*[self(factor) for factor in factors])
+        frac = None if None in fracs else sum(fracs)
+        return np.prod(np.broadcast_arrays(*values), axis=0), frac
+
+    def _evaluate(self, expr):
+        import sympy
+        from sympy.core.mul import _keep_coeff
+
+        # Additions and multiplications of fixed-point values are exact, the results are cast to the type of the output
+        # by the constants, the functions and the divisions
+        if expr.is_Symbol:
+            return self.X[:, int(expr.name[1:])], self.result_t.fractional
+        if expr.is_Number:
+            return self.cast(float(expr))
+        if expr.is_NumberSymbol:
+            return float(expr), None
+        if expr.is_Add:
+            values, fracs = zip(*[self(arg) for arg in expr.args])
+            return sum(values), None if None in fracs else max(fracs)
+        if expr.is_Mul:
+            # Split the factors as the printer does, a division keeps the fractional bits of the numerator
+            coeff, rest = expr.as_coeff_Mul()
+            sign = 1
+            if coeff < 0:
+                expr = _keep_coeff(-coeff, rest)
+                sign = -1
+            numerator, denominator = [], []
+            for factor in sympy.Mul.make_args(expr):
+                if factor.is_Pow and factor.exp.is_Rational and factor.exp.is_negative:
+                    denominator.append(sympy.Pow(factor.base, -factor.exp, evaluate=factor.exp == -1))
+                else:
+                    numerator.append(factor)
+            value, frac = self._product(numerator or [sympy.S.One])
+            if denominator:
+                divisor, _ = self._product(denominator)
+                if frac is None:
+                    value = value / divisor
+                else:
+                    value = np.trunc(value / divisor * 2.0**frac) * 2.0**-frac
+            return sign * value, frac
+        if expr.is_Pow:
+            base, frac = self(expr.base)
+            if expr.exp.is_Integer and expr.exp > 1:
+                return base ** int(expr.exp), None if frac is None else frac * int(expr.exp)
+            if expr.exp == -1:
+                return self.cast(1 / self.cast(base)[0])
+            if expr.exp == sympy.S.One / 3:
+                return self.cast(np.cbrt(self.cast(base)[0]))
+            return self.cast(self.cast(base)[0] ** float(expr.exp))
+        if expr.is_Function:
+            name = type(expr).__name__
+            args = [self.cast(self(arg)[0])[0] for arg in expr.args]
+            if name in self.luts:
+                return self.luts[name](*args), self.result_t.fractional
+            if name in _numpy_functions:
+                return self.cast(_numpy_functions[name](*args))
+        raise Exception(f'Unsupported expression {expr}')
+
+
+def evaluate_expression(
+    expr, X, precision='ap_fixed<16,6>', lut_functions=None, expr_precision=None, eliminate_subexpressions=True
+):
+    """Evaluates expressions with NumPy as the model created by ``convert_from_symbolic_expression`` computes them.
+
+    The evaluation is vectorized over the samples and requires no compilation, so it can be used to score many candidate
+    expressions at once. The subexpressions shared by the expressions are evaluated once.
+
+    The evaluation is bit-accurate for expressions built from additions, subtractions, multiplications, divisions,
+    integer powers, constants and LUT functions, as long as the exact intermediate results fit in double precision. Other
+    math functions are computed in double precision, with their arguments and results cast to ``precision``.
+
+    Args:
+        expr (str, sympy.Expr or list): Expression(s) to evaluate, in terms of the variables ``x0, x1, x2, ...``.
+        X (ndarray): Input data, of shape ``(n_samples, n_symbols)``.
+        precision (str, optional): Precision of the model. Defaults to 'ap_fixed<16,6>'.
+        lut_functions (dict or list, optional): LUT function definitions, as passed to
+            ``convert_from_symbolic_expression``, or a list of ``LUTFunction``. The LUTs with a maximum error are sized
+            as the backend does. Defaults to None.
+        expr_precision (str, optional): Precision of the intermediate variables holding the common subexpressions. If
+            not provided, they keep their full precision. Defaults to None.
+        eliminate_subexpressions (bool, optional): Evaluate the common subexpressions as intermediate variables, as the
+            backend implements them. Defaults to True.
+
+    Returns:
+        ndarray: The values of the expressions, of shape ``(n_samples, n_expressions)``.
+    """
+    import sympy
+
+    from hls4ml.backends.fpga.fpga_backend import FPGABackend
+
+    if not isinstance(expr, (list, tuple)):
+        expr = [expr]
+    expressions = [sympy.sympify(e) for e in expr]
+    if isinstance(lut_functions, dict):
+        lut_functions = [
+            LUTFunction(
+                name,
+                params['math_func'],
+                params['range_start'],
+                params['range_end'],
+                params.get('table_size', 1024),
+                params.get('max_error'),
+            )
+            for name, params in lut_functions.items()
+        ]
+    result_t = FPGABackend.convert_precision_string(precision)
+    expr_t = FPGABackend.convert_precision_string(expr_precision) if expr_precision is not None else None
+
+    # The LUTs with an error bound are sized as the backend does
+    sized_functions = []
+    for lut_fn in lut_functions or []:
+        if lut_fn.max_error is not None:
+            lut_fn = size_lut_function(lut_fn, result_t, lut_fn.max_error)[0] or lut_fn
+        sized_functions.append(lut_fn)
+
+    X = _quantize(np.asarray(X, dtype=np.float64).reshape(len(X), -1), result_t)
+    evaluator = _ExpressionEvaluator(X, result_t, sized_functions)
+    definitions = []
+    if eliminate_subexpressions:
+        definitions, expressions = eliminate_common_subexpressions(expressions)
+
+    y = np.empty((len(X), len(expressions)))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for symbol, definition in definitions:
+            value, fractional = evaluator(definition)
+            if expr_t is not None:
+                value, fractional = _quantize(value, expr_t), expr_t.fractional
+            evaluator.results[symbol] = value, fractional
+        for i, expression in enumerate(expressions):
+            y[:, i] = _quantize(evaluator(expression)[0], result_t)
+
+    return y
 
 
 _binary_ops = {'/': 'x / y', '*': 'x * y', '+': 'x + y', '-': 'x - y', 'pow': 'x**y', 'pow_abs': 'Abs(x) ** y'}
@@ -50,12 +50,10 @@ class CatapultWriter(Writer):
 
         # fill c++ array.
         # not including internal brackets for multidimensional case
-        sep = ''
-        for x in var:
-            h_file.write(sep + x)
-            if write_txt_file:
-                txt_file.write(sep + x)
-            sep = ', '
+        values = ', '.join(var)
+        h_file.write(values)
+        if write_txt_file:
+            txt_file.write(values)
         h_file.write('};\n')
         if write_txt_file:
             h_file.write('#endif\n')
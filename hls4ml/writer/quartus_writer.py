@@ -111,10 +111,7 @@ class QuartusWriter(Writer):
 
         # fill c++ array.
         # not including internal brackets for multidimensional case
-        sep = ''
-        for x in var:
-            h_file.write(sep + x)
-            sep = ', '
+        h_file.write(', '.join(var))
         h_file.write('};\n')
         h_file.write('\n#endif\n')
         h_file.close()
@@ -1,6 +1,7 @@
 import os
 from shutil import copyfile, copytree
 
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
 from hls4ml.writer.vivado_writer import VivadoWriter
 
 
@@ -398,11 +399,35 @@ class VivadoAcceleratorWriter(VivadoWriter):
         f.close()
 
     def write_driver(self, model):
+        """Write the driver, with the fixed-point codecs of the interface of the model for the Python drivers
+
+        Args:
+            model : The ModelGraph to write the driver for
+        """
         filedir = os.path.dirname(os.path.abspath(__file__))
-        copyfile(
-            os.path.join(filedir, self.vivado_accelerator_config.get_driver_path()),
-            ('{}/' + self.vivado_accelerator_config.get_driver_file()).format(model.config.get_output_dir()),
-        )
+        f = open(os.path.join(filedir, self.vivado_accelerator_config.get_driver_path()))
+        fout = open(f'{model.config.get_output_dir()}/{self.vivado_accelerator_config.get_driver_file()}', 'w')
+
+        inp_axi_t, out_axi_t, _, _ = self.vivado_accelerator_config.get_corrected_types()
+        for line in f.readlines():
+            if '# hls-fpga-machine-learning insert codecs' in line:
+                # The codec module only depends on numpy, which the driver imports already
+                with open(os.path.join(filedir, '../utils/fixed_point_codec.py')) as codec_file:
+                    codec_source = codec_file.read()
+                # Two blank lines between the imports and the class, the template has one before the marker
+                newline = '\n' + codec_source[codec_source.index('class FixedPointCodec') :] + '\n\n'
+            elif line.startswith('input_codec = output_codec = None'):
+                # No codec for floating-point types
+                newline = ''
+                for name, axi_t in [('input_codec', inp_axi_t), ('output_codec', out_axi_t)]:
+                    codec = None if axi_t in ['float', 'double'] else FixedPointCodec.from_precision(axi_t)
+                    newline += f'{name} = {codec!r}\n'
+            else:
+                newline = line
+            fout.write(newline)
+
+        f.close()
+        fout.close()
 
     def write_new_tar(self, model):
         tarfile = model.config.get_output_dir() + '.tar.gz'
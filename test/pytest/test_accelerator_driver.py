@@ -0,0 +1,154 @@
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import keras
+import numpy as np
+import pytest
+
+import hls4ml
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
+
+test_root_path = Path(__file__).parent
+driver_root = Path(__file__).parents[2] / 'hls4ml/templates/vivado_accelerator'
+
+
+class MockChannel:
+    """A DMA channel that transfers the first `nbytes` of a buffer, running one transfer at a time."""
+
+    def __init__(self, dma, name):
+        self.dma = dma
+        self.name = name
+        self.buffer = None
+
+    def transfer(self, buffer, nbytes=0):
+        assert self.buffer is None, f'{self.name} is not idle'
+        self.buffer = buffer.reshape(-1)[: (nbytes or buffer.nbytes) // buffer.itemsize]
+        self.dma.events.append(f'{self.name} transfer')
+
+    def wait(self):
+        if self.name == 'recv':
+            # The accelerator sums the features of each sample
+            inputs = self.dma.sendchannel_buffer.reshape(len(self.buffer), -1)
+            self.buffer[:] = inputs.sum(axis=1, dtype=self.buffer.dtype)
+        else:
+            self.dma.sendchannel_buffer = self.buffer
+        self.buffer = None
+        self.dma.events.append(f'{self.name} wait')
+
+
+class MockOverlay:
+    """Stands in for `pynq.Overlay` with a single DMA engine in `hier_0`, to run the drivers off-board."""
+
+    def __init__(self, bitfile_name, dtbo=None, download=True, ignore_version=False, device=None):
+        dma = types.SimpleNamespace(events=[])
+        dma.sendchannel = MockChannel(dma, 'send')
+        dma.recvchannel = MockChannel(dma, 'recv')
+        self.hier_0 = types.SimpleNamespace(axi_dma_0=dma)
+
+
+@pytest.fixture(scope='module')
+def driver_path():
+    model = keras.Sequential([keras.Input((4,)), keras.layers.Dense(1, name='dense')])
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='VivadoAccelerator')
+    output_dir = str(test_root_path / 'hls4mlprj_accelerator_driver')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model,
+        hls_config=config,
+        backend='VivadoAccelerator',
+        output_dir=output_dir,
+        io_type='io_stream',
+        board='pynq-z2',
+        input_type='ap_fixed<12,4,AP_RND,AP_SAT>',
+        output_type='ap_fixed<16,4>',
+    )
+    hls_model.write()
+    return Path(output_dir) / 'axi_stream_driver.py'
+
+
+@pytest.fixture
+def driver(monkeypatch, driver_path):
+    pynq = types.ModuleType('pynq')
+    pynq.Overlay = MockOverlay
+    pynq.allocate = lambda shape, dtype: np.zeros(shape, dtype=dtype)
+    monkeypatch.setitem(sys.modules, 'pynq', pynq)
+
+    spec = importlib.util.spec_from_file_location('axi_stream_driver', driver_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_zcu102_driver():
+    pynq_z2 = (driver_root / 'pynq-z2/python_drivers/axi_stream_driver.py').read_text()
+    assert (driver_root / 'zcu102/python_drivers/axi_stream_driver.py').read_text() == pynq_z2
+
+
+def test_driver_codecs(driver):
+    # The types of the interface are widened to whole bytes
+    assert repr(driver.input_codec) == repr(FixedPointCodec(16, 4, rounding_mode='RND', saturation_mode='SAT'))
+    assert repr(driver.output_codec) == repr(FixedPointCodec(16, 4))
+    np.testing.assert_array_equal(driver.input_codec.encode([0.5, -1.25, 100.0]), [2048, -5120, 32767])
+
+
+def test_float_interface(driver, monkeypatch):
+    # As generated for an interface with floating-point types
+    monkeypatch.setattr(driver, 'input_codec', None)
+    monkeypatch.setattr(driver, 'output_codec', None)
+    nn = driver.NeuralNetworkOverlay('hls4ml_nn.bit', (8, 4), (8, 1))
+    with pytest.raises(ValueError, match='fixed-point types'):
+        nn.predict(np.zeros((8, 4)), fixed_point=True)
+    with pytest.raises(ValueError, match='fixed-point types'):
+        nn.predict_batched(np.zeros((8, 4)), batch_size=4, fixed_point=True)
+
+
+@pytest.mark.parametrize('n_samples', [0, 3, 8, 21])
+def test_predict_batched(driver, n_samples):
+    nn = driver.NeuralNetworkOverlay('hls4ml_nn.bit', (8, 4), (8, 1), dtype=np.int16)
+    X = np.random.randint(-64, 64, (n_samples, 4)) / 64
+
+    y = nn.predict_batched(X, batch_size=4, fixed_point=True)
+    assert y.shape == (n_samples, 1)
+    np.testing.assert_array_equal(y[:, 0], X.sum(axis=1))
+    # Same results on reuse of the buffers
+    np.testing.assert_array_equal(nn.predict_batched(X, batch_size=4, fixed_point=True), y)
+
+    if n_samples == 8:
+        np.testing.assert_array_equal(nn.predict(X, fixed_point=True), y)
+
+
+def test_predict_batched_overlap(driver):
+    nn = driver.NeuralNetworkOverlay('hls4ml_nn.bit', (8, 4), (8, 1))
+    events = nn.hier_0.axi_dma_0.events
+
+    def encode(x):
+        events.append('encode')
+        return x
+
+    def decode(y):
+        events.append('decode')
+        return y.copy()
+
+    X = np.arange(24, dtype=np.float32).reshape(6, 4)
+    y = nn.predict_batched(X, batch_size=4, encode=encode, decode=decode)
+    np.testing.assert_array_equal(y[:, 0], X.sum(axis=1))
+
+    # The next chunk is encoded during the DMA of the current one, and the current one is decoded during the next DMA
+    assert events == [
+        'encode',
+        'send transfer',
+        'recv transfer',
+        'encode',
+        'send wait',
+        'recv wait',
+        'send transfer',
+        'recv transfer',
+        'decode',
+        'send wait',
+        'recv wait',
+        'decode',
+    ]
+    # The ping-pong buffers are distinct
+    (in0, out0), (in1, out1) = nn._batch_buffers(4)
+    assert in0 is not in1 and out0 is not out1
@@ -0,0 +1,86 @@
+"""Incremental re-propagation of the bit-exact precisions after editing a quantizer."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import hls4ml
+from hls4ml.model.optimizer import get_optimizer
+from hls4ml.model.optimizer.passes.bit_exact import update_bit_exact_precision
+
+test_root_path = Path(__file__).parent
+
+
+def _mask_kbi(n, k, b, i):
+    return tuple(np.full((1, n), v, dtype=np.int16) for v in (k, b, i))
+
+
+def _quantizer(name, n, k, b, i, sat='WRAP'):
+    return {
+        'class_name': 'FixedPointQuantizer',
+        'name': name,
+        'overrides': {},
+        'fusible': True,
+        'SAT': sat,
+        'RND': 'TRN',
+        'mask_kbi': _mask_kbi(n, k, b, i),
+    }
+
+
+def bit_exact_model(output_dir, q0=(8, 3), q2=(12, 6)):
+    rng = np.random.default_rng(0)
+    w0 = rng.integers(-8, 8, (4, 6)) * 0.25
+    w1 = rng.integers(-8, 8, (6, 3)) * 0.5
+    layers = [
+        {'class_name': 'Input', 'name': 'x', 'input_shape': [4]},
+        _quantizer('q0', 4, 1, *q0),
+        {'class_name': 'Dense', 'name': 'd0', 'n_in': 4, 'n_out': 6, 'weight_data': w0, 'bias_data': np.zeros(6)},
+        _quantizer('q1', 6, 1, 18, 10, sat='SAT'),
+        {'class_name': 'Dense', 'name': 'd1', 'n_in': 6, 'n_out': 3, 'weight_data': w1, 'bias_data': np.zeros(3)},
+        _quantizer('q2', 3, 1, *q2),
+    ]
+    config = {
+        'HLSConfig': {'Model': {'Precision': 'ap_fixed<16,6>', 'ReuseFactor': 1, 'BitExact': True}, 'Flows': []},
+        'OutputDir': output_dir,
+        'ProjectName': 'myprj',
+        'IOType': 'io_parallel',
+        'Backend': 'Vivado',
+    }
+    model = hls4ml.model.ModelGraph.from_layer_list(config, layers)
+    get_optimizer('bit_exact').transform(model)
+    return model
+
+
+def _types(model):
+    types = {}
+    for name, layer in model.graph.items():
+        accum_t = layer.attributes.get('accum_t')
+        types[name] = (
+            str(layer.get_output_variable().type.precision),
+            str(accum_t.precision) if accum_t is not None else None,
+        )
+    return types
+
+
+@pytest.mark.parametrize(
+    'changed, bits, integer, expected_updates',
+    [
+        ('q0', 5, 3, ['x', 'q0', 'd0', 'q1', 'd1', 'q2']),
+        # Widening a quantizer widens the downstream quantizers again, up to their original masks
+        ('q0', 10, 5, ['x', 'q0', 'd0', 'q1', 'd1', 'q2']),
+        ('q2', 4, 6, ['d1', 'q2']),
+    ],
+)
+def test_update_bit_exact_precision(test_case_id, changed, bits, integer, expected_updates):
+    output_dir = str(test_root_path / test_case_id)
+    model = bit_exact_model(output_dir)
+    n = model.graph[changed].get_output_variable().size()
+    model.graph[changed].mask_kbi = _mask_kbi(n, 1, bits, integer)
+
+    # Only the edited quantizer, the layers downstream and the layers feeding them are updated
+    assert update_bit_exact_precision(model, [changed]) == expected_updates
+
+    # The result matches a full analysis of a model created with the edited quantizer
+    reference = bit_exact_model(output_dir, **{changed: (bits, integer)})
+    assert _types(model) == _types(reference)
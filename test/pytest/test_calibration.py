@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import keras
+import numpy as np
+import pytest
+import torch
+
+import hls4ml
+from hls4ml.utils.calibration import calibrate_precision, collect_ranges
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def data():
+    return np.random.default_rng(0).uniform(-4, 4, size=(2000, 8)).astype(np.float32)
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential(
+        [
+            keras.Input((8,), name='inp'),
+            keras.layers.Dense(16, activation='relu', name='fc1'),
+            keras.layers.Dense(4, name='fc2'),
+        ]
+    )
+    return model
+
+
+def test_collect_ranges_batched(keras_model, data):
+    summaries = collect_ranges(keras_model, data, batch_size=300)
+    assert set(summaries) == {'inp', 'fc1', 'fc1_relu', 'fc2'}
+
+    kernel, bias = keras_model.layers[0].get_weights()
+    pre_activation = data @ kernel + bias
+    np.testing.assert_allclose(summaries['fc1'].histogram.min, pre_activation.min(), rtol=1e-5)
+    np.testing.assert_allclose(summaries['fc1'].histogram.max, pre_activation.max(), rtol=1e-5)
+    assert summaries['fc1_relu'].histogram.min == 0
+    assert summaries['inp'].histogram.count == data.size
+
+    # Summaries of disjoint chunks merge into the summary of the full set
+    merged = collect_ranges(keras_model, data[:1000])
+    for name, summary in collect_ranges(keras_model, data[1000:]).items():
+        merged[name].merge(summary)
+    for name, summary in summaries.items():
+        np.testing.assert_array_equal(merged[name].histogram.counts, summary.histogram.counts)
+
+
+@pytest.mark.parametrize('backend', ['Vivado', 'Vitis'])
+def test_calibrate_keras(keras_model, data, backend):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend=backend)
+    calibrate_precision(keras_model, config, data, batch_size=512, max_error=2**-10)
+
+    precision = config['LayerName']
+    assert precision['inp']['Precision']['result'].startswith('fixed<12,3,')
+    assert precision['fc1_relu']['Precision']['result'].startswith('ufixed<')
+    assert 'accum' in precision['fc2']['Precision']
+    assert 'accum' not in precision['fc1_relu']['Precision']
+
+    output_dir = str(test_root_path / f'hls4mlprj_calibration_keras_{backend}')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        keras_model, hls_config=config, output_dir=output_dir, backend=backend
+    )
+    hls_model.compile()
+    y_keras = keras_model.predict(data[:100], verbose=0)
+    y_hls = hls_model.predict(data[:100])
+    np.testing.assert_allclose(y_hls, y_keras, atol=0.1)
+
+
+def test_calibrate_pytorch(data):
+    model = torch.nn.Sequential(torch.nn.Linear(8, 16), torch.nn.ReLU(), torch.nn.Linear(16, 4))
+    config = hls4ml.utils.config_from_pytorch_model(model, (8,), granularity='name', backend='Vivado')
+    calibrate_precision(model, config, data, batch_size=500)
+
+    for name in config['LayerName']:
+        assert config['LayerName'][name]['Precision']['result'] != 'auto'
+    assert config['LayerName']['_1']['Precision']['result'].startswith('ufixed<')
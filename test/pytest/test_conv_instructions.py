@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import keras
+import numpy as np
+import pytest
+
+import hls4ml
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def backend():
+    return hls4ml.backends.get_backend('Vivado')
+
+
+def reference_instructions(in_H, in_W, kernel, stride, min_H, min_W):
+    """Encodes the windows pixel by pixel, as the instructions were originally computed."""
+    min_oH = (min(in_H, min_H) - kernel[0]) // stride[0] + 1
+    min_oW = (min(in_W, min_W) - kernel[1]) // stride[1] + 1
+    windows = [0] * (min_H * min_W)
+    for i_oh in range(min_oH):
+        for i_ow in range(min_oW):
+            for i_fh in range(kernel[0]):
+                for i_fw in range(kernel[1]):
+                    index = (i_oh * stride[0] + i_fh) * min_W + i_ow * stride[1] + i_fw
+                    windows[index] |= 1 << (i_fh * kernel[1] + i_fw)
+    return windows
+
+
+def test_valid_reuse_factors(backend):
+    for n_in, n_out in [(1, 1), (7, 3), (16, 8), (27, 16), (64, 10), (120, 84)]:
+        expected = [rf for rf in range(1, n_in * n_out + 1) if backend._validate_reuse_factor(n_in, n_out, rf)]
+        assert backend.get_valid_reuse_factors(n_in, n_out) == expected
+
+    # The returned list can be modified without affecting the cache
+    backend.get_valid_reuse_factors(16, 8).pop()
+    assert backend.get_valid_reuse_factors(16, 8)[-1] == 128
+
+
+@pytest.mark.parametrize('kernel', [(3, 3), (3, 2), (1, 4), (5, 2)])
+@pytest.mark.parametrize('stride', [(1, 1), (1, 2), (2, 1), (3, 2)])
+def test_conv2d_instructions(backend, kernel, stride):
+    in_H, in_W = 11, 12
+    min_H, min_W, instructions = backend.compute_conv2d_instructions(in_H, in_W, 3, kernel, stride)
+    assert instructions == reference_instructions(in_H, in_W, kernel, stride, min_H, min_W)
+
+    if kernel[0] == kernel[1] and stride[0] == stride[1]:
+        assert backend.compute_conv2d_instructions(in_H, in_W, 3, kernel[0], stride[0]) == (min_H, min_W, instructions)
+
+    # 2D convolutions with a single row behave as 1D convolutions
+    min_H, min_W, instructions = backend.compute_conv2d_instructions(1, in_W, 3, (1, kernel[1]), (1, stride[1]))
+    assert backend.compute_conv1d_instructions(in_W, 3, kernel[1], stride[1]) == (min_W, instructions)
+
+
+@pytest.mark.parametrize('kernel, stride', [((3, 2), (1, 2)), ((2, 3), (2, 1))])
+def test_non_square_encoded(kernel, stride, test_case_id):
+    model = keras.Sequential(
+        [keras.Input((9, 10, 2)), keras.layers.Conv2D(3, kernel, strides=stride, name='conv', kernel_initializer='normal')]
+    )
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name', backend='Vivado')
+    config['LayerName']['conv']['ConvImplementation'] = 'Encoded'
+    output_dir = str(test_root_path / test_case_id)
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, io_type='io_stream', backend='Vivado', output_dir=output_dir
+    )
+    hls_model.compile()
+
+    X = np.random.rand(20, 9, 10, 2)
+    np.testing.assert_allclose(hls_model.predict(X).ravel(), model.predict(X, verbose=0).ravel(), atol=0.05)
@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hls4ml.model.types import FixedPrecisionType
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
+from hls4ml.utils.simulation_utils import read_testbench_log, write_tb_inputs
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.mark.parametrize(
+    'rounding_mode, expected',
+    [
+        ('TRN', [-3, -2, -1, 0, 1, 2]),
+        ('TRN_ZERO', [-2, -1, 0, 0, 1, 2]),
+        ('RND', [-2, -1, 0, 1, 2, 3]),
+        ('RND_ZERO', [-2, -1, 0, 0, 1, 2]),
+        ('RND_INF', [-3, -2, -1, 1, 2, 3]),
+        ('RND_MIN_INF', [-3, -2, -1, 0, 1, 2]),
+        ('RND_CONV', [-2, -2, 0, 0, 2, 2]),
+    ],
+)
+def test_rounding(rounding_mode, expected):
+    codec = FixedPointCodec(8, 7, rounding_mode=rounding_mode)
+    np.testing.assert_array_equal(codec.encode(np.array([-2.5, -1.5, -0.5, 0.5, 1.5, 2.5]) / 2), expected)
+
+
+@pytest.mark.parametrize(
+    'signed, saturation_mode, expected',
+    [
+        (True, 'WRAP', [7, -8, 7, -8, 0]),
+        (True, 'SAT', [-8, 7, 7, -8, 0]),
+        (True, 'SAT_ZERO', [0, 0, 7, -8, 0]),
+        (True, 'SAT_SYM', [-7, 7, 7, -7, 0]),
+        (False, 'WRAP', [7, 8, 7, 8, 0]),
+        (False, 'SAT', [0, 8, 7, 0, 0]),
+    ],
+)
+def test_saturation(signed, saturation_mode, expected):
+    codec = FixedPointCodec(4, 4, signed=signed, saturation_mode=saturation_mode)
+    np.testing.assert_array_equal(codec.encode([-9, 8, 7, -8, 0]), expected)
+
+
+def test_from_precision():
+    precision = FixedPrecisionType(10, 3, rounding_mode='AP_RND', saturation_mode='AP_SAT')
+    codec = FixedPointCodec.from_precision(precision)
+    assert repr(codec) == "FixedPointCodec(10, 3, signed=True, rounding_mode='RND', saturation_mode='SAT')"
+    np.testing.assert_array_equal(codec.quantize([0.0051, 100.0, -1.1]), [2**-7, 4 - 2**-7, -1.1015625])
+    # The unsigned bits of negative values are decoded as such
+    np.testing.assert_array_equal(codec.decode([0x3FF, 0x200, -1]), [-(2**-7), -4, -(2**-7)])
+
+
+@pytest.mark.parametrize('elements_per_word, element_width', [(1, None), (4, None), (5, 8), (12, 8)])
+def test_pack(elements_per_word, element_width):
+    codec = FixedPointCodec(6, 2)
+    X = np.random.uniform(-2, 2, (3, 60))
+    words = codec.pack(X, elements_per_word, element_width)
+    assert words.shape == (3, 60 // elements_per_word)
+    np.testing.assert_array_equal(codec.unpack(words, elements_per_word, element_width), codec.quantize(X))
+
+    # The first element is in the least significant bits
+    words = codec.pack(
+        [[0.0625, -0.0625] * (elements_per_word // 2) + [0.0625] * (elements_per_word % 2)], elements_per_word
+    )
+    assert int(words[0, 0]) & 0x3F == 1
+    if elements_per_word > 1:
+        assert (int(words[0, 0]) >> 6) & 0x3F == 0x3F
+
+
+def test_testbench_data(test_case_id):
+    output_dir = test_root_path / test_case_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    precision = {'integer_bits': 3, 'fractional_bits': 5, 'signed': 1, 'rounding_mode': 'RND', 'saturation_mode': 'SAT'}
+    inputs = [
+        {'name': 'stream_in', 'pragma': 'stream', 'fifo_depth': 2, 'batch_size': 3, **precision},
+        {'name': 'partition_in', 'pragma': 'partition', 'fifo_depth': 1, 'batch_size': 2, **precision},
+    ]
+    write_tb_inputs([np.array([[0.5, -1, 10], [0, 0, 1 / 64]]), np.array([[-4, 1]])], inputs, str(output_dir))
+    # A marker, then big-endian 32-bit chunks of the words of the beats or the values of the ports
+    assert (output_dir / 'stream_in_input_data.bin').read_bytes() == bytes.fromhex('686c7334 007fe010 00010000')
+    assert (output_dir / 'partition_in_input_data.bin').read_bytes() == bytes.fromhex('686c7334 00000080 00000020')
+
+    # The outputs are written in the same format by the testbench
+    outputs = [
+        {'name': 'stream_out', 'pragma': 'stream', 'batch_size': 2, 'axis_element_width': 16, **precision},
+        {'name': 'partition_out', 'pragma': 'partition', 'batch_size': 2, **precision},
+    ]
+    log_path = output_dir / 'testbench_log.csv'
+    log_path.write_text('output_name,index,value\nWorstLatency,0,20\nBestLatency,0,12\n')
+    (output_dir / 'stream_out_output_data.bin').write_bytes(bytes.fromhex('686c7334 00100020 00ff0001'))
+    (output_dir / 'partition_out_output_data.bin').write_bytes(bytes.fromhex('686c7334 00000001 000000e0'))
+    report = read_testbench_log(str(log_path), outputs)
+    assert report['BestLatency'] == 12 and report['WorstLatency'] == 20
+    stream_out, partition_out = report['BehavSimResults']
+    np.testing.assert_array_equal(stream_out, [1, 0.5, 1 / 32, -1 / 32])
+    np.testing.assert_array_equal(partition_out, [1 / 32, -1])
+
+    # Files in another byte order, or a testbench that did not read back the input marker, are reported as errors
+    (output_dir / 'partition_out_output_data.bin').write_bytes(bytes.fromhex('34736c68 01000000 e0000000'))
+    assert read_testbench_log(str(log_path), outputs) == {}
+    log_path.write_text('output_name,index,value\nInputFormatError,1,879915880\nWorstLatency,0,20\nBestLatency,0,12\n')
+    assert read_testbench_log(str(log_path), outputs) == {}
@@ -226,3 +226,34 @@ def test_multiple_outputs(test_case_id, batch):
     for y_i, y_hls_i in zip(y, y_hls):
         y_hls_i = y_hls_i.reshape(y_i.shape)
         np.testing.assert_allclose(y_i, y_hls_i, rtol=0)
+
+
+def test_clone(test_case_id):
+    """Test that a clone shares the weights but can be modified independently"""
+    model = base_model(output_dir=str(test_root_path / test_case_id / 'base'))
+    clone = model.clone(output_dir=str(test_root_path / test_case_id / 'clone'))
+
+    assert clone.config.get_output_dir() != model.config.get_output_dir()
+    for name, layer in model.graph.items():
+        cloned_layer = clone.graph[name]
+        assert cloned_layer is not layer and cloned_layer.model is clone
+        for weight_name, weight in layer.weights.items():
+            cloned_weight = cloned_layer.weights[weight_name]
+            assert cloned_weight is not weight
+            assert np.shares_memory(cloned_weight.data, weight.data)
+            # Shared weights are copy-on-write, in-place modification is not allowed
+            with pytest.raises(ValueError):
+                cloned_weight.data[0] = 0
+            # ... but the original model is left unchanged
+            assert weight.data.flags.writeable
+
+    clone.graph['layer1'].weights['weight'].data = np.array([3])
+    clone.graph['layer1'].get_output_variable().type.name = 'layer1_clone_t'
+    assert model.graph['layer1'].get_output_variable().type.name != 'layer1_clone_t'
+    assert clone.get_output_variables()[0] is clone.graph['layer1'].get_output_variable()
+
+    model.compile()
+    clone.compile()
+    X = np.array([[1.0], [2.0]])
+    np.testing.assert_allclose(model.predict(X).ravel(), ((X * w + b) * w + b).ravel())
+    np.testing.assert_allclose(clone.predict(X).ravel(), ((X * w + b) * 3 + b).ravel())
@@ -38,3 +38,51 @@ def test_keras_h5_loader(test_case_id, backend):
     data = np.random.rand(1000, 10).astype(np.float32)
     pred = hls_model.predict(data)
     np.testing.assert_allclose(pred, model.predict(data), rtol=5e-3, atol=5e-3)
+
+
+def test_keras_h5_index(test_case_id):
+    """The weights are found by variable name, even if the names of the layers or the variables overlap."""
+    import h5py
+
+    from hls4ml.converters.keras_v2_to_hls import KerasFileReader, KerasNestedFileReader, KerasWrappedLayerFileReader
+
+    output_dir = Path(test_root_path / test_case_id)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    h5_path = str(output_dir / 'weights.h5')
+    weights = {
+        'model_weights/kernel_model/kernel_model/bias:0': np.random.rand(4),
+        'model_weights/kernel_model/kernel_model/kernel:0': np.random.rand(3, 4),
+        'model_weights/lstm/lstm/lstm_cell/kernel:0': np.random.rand(4, 8),
+        'model_weights/lstm/lstm/lstm_cell/recurrent_kernel:0': np.random.rand(2, 8),
+        'model_weights/bidirectional/bidirectional/backward_lstm/lstm_cell/kernel:0': np.random.rand(4, 8),
+        'model_weights/bidirectional/bidirectional/forward_lstm/lstm_cell/kernel:0': np.random.rand(4, 8),
+        'model_weights/submodel/dense/kernel:0': np.random.rand(4, 2),
+        'model_weights/time_distributed/time_distributed/kernel': np.random.rand(4, 2),
+    }
+    with h5py.File(h5_path, 'w') as f:
+        for path, data in weights.items():
+            f[path] = data
+
+    reader = KerasFileReader({'KerasH5': h5_path})
+    np.testing.assert_array_equal(reader.get_weights_data('kernel_model', 'bias'), weights[next(iter(weights))])
+    np.testing.assert_array_equal(
+        reader.get_weights_data('lstm', 'recurrent_kernel'), weights['model_weights/lstm/lstm/lstm_cell/recurrent_kernel:0']
+    )
+    np.testing.assert_array_equal(
+        reader.get_weights_data('lstm', 'kernel'), weights['model_weights/lstm/lstm/lstm_cell/kernel:0']
+    )
+    np.testing.assert_array_equal(
+        reader.get_weights_data('bidirectional', 'forward_lstm/lstm_cell/kernel'),
+        weights['model_weights/bidirectional/bidirectional/forward_lstm/lstm_cell/kernel:0'],
+    )
+    assert reader.get_weights_data('lstm', 'bias') is None
+
+    nested_reader = KerasNestedFileReader(reader, 'submodel')
+    assert nested_reader.h5file is reader.h5file
+    np.testing.assert_array_equal(
+        nested_reader.get_weights_data('dense', 'kernel'), weights['model_weights/submodel/dense/kernel:0']
+    )
+    wrapped_reader = KerasWrappedLayerFileReader(reader, 'time_distributed/time_distributed')
+    np.testing.assert_array_equal(
+        wrapped_reader.get_weights_data('dense', 'kernel'), weights['model_weights/time_distributed/time_distributed/kernel']
+    )
@@ -86,7 +86,6 @@ def test_keras_v3_numerical_profiling_conv_model():
 
 
 @pytest.mark.skipif(not __keras_profiling_enabled__, reason='Keras 3.0 or higher is required')
-@pytest.mark.skip(reason='convert_from_config needs update for Keras v3 model serialization format')
 def test_keras_v3_numerical_profiling_with_hls_model(test_case_id):
     """Test numerical profiling with both Keras v3 model and hls4ml model."""
     import hls4ml
@@ -103,6 +102,8 @@ def test_keras_v3_numerical_profiling_with_hls_model(test_case_id):
 
     # Create hls4ml model
     config = hls4ml.utils.config_from_keras_model(model, granularity='name')
+    for layer_config in config['LayerName'].values():
+        layer_config['Trace'] = True
     hls_model = hls4ml.converters.convert_from_keras_model(
         model,
         hls_config=config,
@@ -120,6 +121,47 @@ def test_keras_v3_numerical_profiling_with_hls_model(test_case_id):
     assert ap is not None  # Keras model activations (before optimization)
     assert aph is not None  # HLS model activations (after optimization)
 
+    # The unoptimized model comes from the snapshot taken during conversion, and the traced library is reused
+    assert hls_model.get_unoptimized_model() is not None
+    lib = hls_model._top_function_lib
+    numerical(hls_model=hls_model, X=X_test, batch_size=32)
+    assert hls_model._top_function_lib is lib
+
+
+@pytest.mark.skipif(not __keras_profiling_enabled__, reason='Keras 3.0 or higher is required')
+def test_keras_v3_numerical_profiling_branching_stream_model(test_case_id):
+    """Test that the optimizers do not modify the unoptimized snapshot of a branching io_stream model."""
+    import hls4ml
+
+    inputs = keras.Input(shape=(8,))
+    x = keras.layers.Dense(16, name='d1')(inputs)
+    y = keras.layers.Dense(4, name='d2')(x)
+    z = keras.layers.Dense(4, name='d3')(x)
+    outputs = keras.layers.Add(name='add')([y, z])
+    model = keras.Model(inputs=inputs, outputs=outputs)
+    X_test = np.random.rand(100, 8).astype(np.float32)
+
+    config = hls4ml.utils.config_from_keras_model(model, granularity='name')
+    for layer_config in config['LayerName'].values():
+        layer_config['Trace'] = True
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model,
+        hls_config=config,
+        output_dir=str(Path(__file__).parent / test_case_id),
+        backend='Vivado',
+        io_type='io_stream',
+    )
+    # The stream of d1 is cloned for d2 and d3 in the optimized model only
+    assert hls_model.graph['d2'].inputs != ['d1']
+    unoptimized_model = hls_model.get_unoptimized_model()
+    assert unoptimized_model.graph['d2'].inputs == ['d1']
+    assert unoptimized_model.graph['d3'].inputs == ['d1']
+    assert [layer.get_output_variable().shape for layer in unoptimized_model.get_layers()][-1] == [4]
+
+    wp, wph, _, _ = numerical(model, hls_model=hls_model, X=X_test)
+    assert wp is not None
+    assert wph is not None
+
 
 @pytest.mark.skipif(not __keras_profiling_enabled__, reason='Keras 3.0 or higher is required')
 def test_keras_v3_numerical_profiling_batch_norm():
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 
 import numpy as np
@@ -7,6 +8,7 @@ from tensorflow.keras.models import Model
 
 import hls4ml
 import hls4ml.model
+from hls4ml.model.graph import MultiModelGraph
 
 test_root_path = Path(__file__).parent
 
@@ -67,6 +69,16 @@ def test_multimodelgraph_predict(test_case_id, split_layers, io_type, strategy,
     for mono_out, multi_out in zip(pred_mono, pred_multi):
         np.testing.assert_allclose(multi_out, mono_out, rtol=0, atol=1e-5)
 
+    if granularity == 'model':
+        # --- Pipelined C simulation, one thread per subgraph ---
+        pred_pipelined = hls_model_multi.predict(X_input, pipelined=True, batch_size=2)
+        for multi_out, pipelined_out in zip(pred_multi, pred_pipelined):
+            np.testing.assert_array_equal(pipelined_out, multi_out)
+        report = hls_model_multi.pipeline_report
+        assert list(report['Stages']) == ['graph1', 'graph2', 'graph3']
+        assert all(stage['Samples'] == len(X_input) for stage in report['Stages'].values())
+        assert report['Throughput'] > 0
+
     # if granularity == 'name':
     #     # --- Optional: Build the HLS project and run simulation ---
     #     hls_model_multi.build(
@@ -84,3 +96,45 @@ def test_multimodelgraph_predict(test_case_id, split_layers, io_type, strategy,
     #     sim_results = hls_model_multi.predict(inp, sim='rtl')
     #     for sim_out, pred_out in zip(sim_results, list([pred_multi[0][0], pred_multi[1][0]])):
     #         np.testing.assert_allclose(sim_out, pred_out, rtol=0, atol=1e-5)
+
+
+@pytest.mark.parametrize('failing_stage', [0, 1, 2])
+def test_pipelined_predict_error(test_case_id, monkeypatch, failing_stage):
+    """
+    Tests that a failing subgraph of the pipelined C simulation makes predict re-raise its error, without hanging on the
+    queues of the other subgraphs.
+    """
+    model = create_test_model()
+    config = hls4ml.utils.config_from_keras_model(model, granularity='model', default_precision='ap_fixed<32,16>')
+    hls_model = hls4ml.converters.convert_from_keras_model(
+        model, hls_config=config, output_dir=str(test_root_path / test_case_id), backend='vitis'
+    )
+    hls_model_multi = hls4ml.model.to_multi_model_graph(hls_model, ['dense2', 'avg_pool'])
+    hls_model_multi.compile()
+
+    # The subgraph fails on its third batch, when the queues of size 1 are full
+    run_subgraph = MultiModelGraph._run_subgraph
+    n_calls = [0]
+
+    def failing_run_subgraph(g, batch):
+        if g is hls_model_multi.graphs[failing_stage]:
+            n_calls[0] += 1
+            if n_calls[0] == 3:
+                raise RuntimeError('Subgraph failure')
+        return run_subgraph(g, batch)
+
+    monkeypatch.setattr(MultiModelGraph, '_run_subgraph', staticmethod(failing_run_subgraph))
+
+    errors = []
+
+    def predict():
+        try:
+            hls_model_multi.predict(np.random.rand(10, 6, 8), pipelined=True, batch_size=1, queue_size=1)
+        except Exception as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=predict, daemon=True)
+    thread.start()
+    thread.join(timeout=60)
+    assert not thread.is_alive(), 'The pipelined predict did not return after the failure of a subgraph'
+    assert len(errors) == 1 and str(errors[0]) == 'Subgraph failure'
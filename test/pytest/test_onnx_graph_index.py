@@ -0,0 +1,116 @@
+import mmap
+from pathlib import Path
+
+import numpy as np
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+import hls4ml
+from hls4ml.converters.onnx_to_hls import OnnxGraphIndex, get_constant_value, get_input_shape
+
+test_root_path = Path(__file__).parent
+
+
+def chain_model(n_nodes, width=8):
+    """A chain of alternating Add (with a constant) and Relu nodes, with the shapes of all tensors inferred."""
+    nodes = []
+    initializers = []
+    value_info = []
+    prev = 'x'
+    for i in range(n_nodes):
+        out = f't{i}'
+        if i % 2:
+            nodes.append(helper.make_node('Relu', [prev], [out], name=f'relu{i}'))
+        else:
+            initializers.append(numpy_helper.from_array(np.full((1, width), i, np.float32), f'c{i}'))
+            value_info.append(helper.make_tensor_value_info(f'c{i}', TensorProto.FLOAT, [1, width]))
+            nodes.append(helper.make_node('Add', [prev, f'c{i}'], [out], name=f'add{i}'))
+        value_info.append(helper.make_tensor_value_info(out, TensorProto.FLOAT, [1, width]))
+        prev = out
+    graph = helper.make_graph(
+        nodes,
+        'chain',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [1, width])],
+        [helper.make_tensor_value_info(prev, TensorProto.FLOAT, [1, width])],
+        initializer=initializers,
+        value_info=value_info,
+    )
+    return helper.make_model(graph)
+
+
+def test_graph_index():
+    graph = chain_model(4).graph
+    # The intermediate shapes take precedence over the outputs and global inputs with the same name
+    graph.output.append(helper.make_tensor_value_info('t1', TensorProto.FLOAT, [1, 3]))
+    index = OnnxGraphIndex(graph)
+
+    assert index.node is graph.node
+    assert not index.channels_last
+
+    for node in graph.node:
+        assert get_input_shape(index, node) == get_input_shape(graph, node) == [[1, 8]] * len(node.input)
+    np.testing.assert_array_equal(get_constant_value(index, 'c2'), np.full((1, 8), 2))
+    with pytest.raises(RuntimeError):
+        get_input_shape(index, helper.make_node('Relu', ['missing'], ['y']))
+
+
+def test_parse_large_graph(capsys):
+    n_nodes = 2000
+    layer_list, input_layers, output_layers = hls4ml.converters.parse_onnx_model(chain_model(n_nodes))
+    capsys.readouterr()
+
+    assert input_layers == ['x']
+    assert output_layers == [f'relu{n_nodes - 1}']
+    # The input, one constant per Add and the nodes
+    assert len(layer_list) == 1 + n_nodes // 2 + n_nodes
+    assert [layer['name'] for layer in layer_list if layer['class_name'] == 'Constant'][:2] == ['c0', 'c2']
+    assert layer_list[-1]['inputs'] == [f't{n_nodes - 2}']
+
+
+def is_mapped(array):
+    while isinstance(array, (np.ndarray, memoryview)):
+        array = array.base if isinstance(array, np.ndarray) else array.obj
+    return isinstance(array, mmap.mmap)
+
+
+def test_external_data(test_case_id):
+    n_in, n_out = 16, 8
+    weight = np.random.rand(n_in, n_out).astype(np.float32)
+    bias = np.random.rand(n_out).astype(np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node('MatMul', ['x', 'w'], ['h'], name='matmul'),
+            helper.make_node('Add', ['h', 'b'], ['y'], name='add'),
+        ],
+        'dense',
+        [helper.make_tensor_value_info('x', TensorProto.FLOAT, [1, n_in])],
+        [helper.make_tensor_value_info('y', TensorProto.FLOAT, [1, n_out])],
+        initializer=[numpy_helper.from_array(weight, 'w'), numpy_helper.from_array(bias, 'b')],
+        value_info=[
+            helper.make_tensor_value_info('w', TensorProto.FLOAT, [n_in, n_out]),
+            helper.make_tensor_value_info('b', TensorProto.FLOAT, [n_out]),
+            helper.make_tensor_value_info('h', TensorProto.FLOAT, [1, n_out]),
+        ],
+    )
+    output_dir = test_root_path / test_case_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_path = str(output_dir / 'dense.onnx')
+    onnx.save_model(
+        helper.make_model(graph), model_path, save_as_external_data=True, location='weights.bin', size_threshold=0
+    )
+
+    # The initializers are memory-mapped from the external data file
+    layer_list, _, _ = hls4ml.converters.parse_onnx_model(model_path)
+    value = next(layer['value'] for layer in layer_list if layer['name'] == 'w')
+    np.testing.assert_array_equal(value, weight)
+    assert is_mapped(value) and not value.flags.writeable
+
+    # ... and the weights of the layers are views of the file
+    config = hls4ml.utils.config.config_from_onnx_model(model_path, granularity='name', backend='Vivado')
+    hls_model = hls4ml.converters.convert_from_onnx_model(
+        model_path, hls_config=config, backend='Vivado', output_dir=str(output_dir)
+    )
+    dense = next(layer for layer in hls_model.get_layers() if layer.class_name == 'Dense')
+    assert is_mapped(dense.weights['weight'].data)
+    np.testing.assert_array_equal(dense.weights['bias'].data, bias)
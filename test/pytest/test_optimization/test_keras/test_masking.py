@@ -449,3 +449,173 @@ def test_consecutive_pattern_masking(local_masking, dense):
     assert not np.any(offsets['dense'])
     assert not np.any(masks['dense'][zeros[:, 0], zeros[:, 1]])
     assert (weight_shape[0] * weight_shape[1]) == (zeros.shape[0] + nonzeros.shape[0])
+
+
+# Create a Dense layer with neurons of distinct norms, so that the exact mask is known: the 2nd and 4th neuron are pruned
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('dense', dense_layers)
+def test_dense_masking_structured_exact(local_masking, dense):
+    model = Sequential()
+    model.add(dense(6, input_shape=(3,), name='dense'))
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.array([[1], [-1], [0.5]]) * np.array([3, 1, 5, 2, 6, 4])
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['dense'].optimizable = True
+    model_attributes['dense'].optimization_attributes.pruning = True
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+
+    masks, offsets = get_model_masks(model, model_attributes, sparsity, ParameterEstimator, metric='l2', local=local_masking)
+    expected = np.ones((3, 6))
+    expected[:, [1, 3]] = 0
+
+    np.testing.assert_array_equal(masks['dense'], expected)
+    assert not np.any(offsets['dense'])
+
+
+# Create a Dense layer with equal weights, so all the neurons have the same norm
+# Any two neurons can be pruned, but every neuron is either pruned or kept as a whole
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('dense', dense_layers)
+def test_dense_masking_structured_ties(local_masking, dense):
+    model = Sequential()
+    model.add(dense(6, input_shape=(3,), name='dense'))
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.full((3, 6), 0.5)
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['dense'].optimizable = True
+    model_attributes['dense'].optimization_attributes.pruning = True
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+
+    masks, offsets = get_model_masks(model, model_attributes, sparsity, ParameterEstimator, metric='l1', local=local_masking)
+
+    assert np.all(masks['dense'] == masks['dense'][0])
+    assert np.count_nonzero(masks['dense'][0] == 0) == 2
+    assert not np.any(offsets['dense'])
+
+
+# Create a Dense layer with artificial weights, so that the exact mask of the patterns is known
+# Set pattern offset to 6, which is equivalent to RF = 2 [4 * 3 / 6]; each pattern is half a neuron (column)
+# The patterns are ordered neuron by neuron, so the 2nd and 5th pattern are the lower half of the 1st neuron
+# And the upper half of the 3rd neuron
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('dense', dense_layers)
+def test_dense_masking_pattern_exact(local_masking, dense):
+    model = Sequential()
+    model.add(dense(3, input_shape=(4,), name='dense'))
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.repeat(np.array([[4, 6, 2], [1, 5, 3]]), 2, axis=0) * np.array([[1], [-1], [1], [-1]])
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['dense'].optimizable = True
+    model_attributes['dense'].optimization_attributes.pruning = True
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.PATTERN
+    model_attributes['dense'].optimization_attributes.pattern_offset = 6
+    model_attributes['dense'].optimization_attributes.consecutive_patterns = 1
+
+    # 33% sparsity - keep 4 out of 6 patterns [0.67 * 12 = 8.04 -> 8 weights, 2 per pattern]
+    masks, offsets = get_model_masks(model, model_attributes, sparsity, ParameterEstimator, metric='l1', local=local_masking)
+    expected = np.ones((4, 3))
+    expected[2:, 0] = 0
+    expected[:2, 2] = 0
+
+    np.testing.assert_array_equal(masks['dense'], expected)
+    assert not np.any(offsets['dense'])
+
+
+# Create a Conv2D layer with filters of distinct norms, so that the exact mask is known: the 2nd and 4th filter are pruned
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('conv2d', conv2d_layers)
+def test_conv2d_masking_structured_exact(local_masking, conv2d):
+    model = Sequential()
+    model.add(conv2d(4, input_shape=(4, 4, 2), kernel_size=(2, 2), name='conv2d'))
+    model.add(Flatten())
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    signs = np.where(np.arange(8).reshape(2, 2, 2, 1) % 3 == 0, -1, 1)
+    weights[0] = signs * np.array([2, 0.5, 3, 1])
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['conv2d'].optimizable = True
+    model_attributes['conv2d'].optimization_attributes.pruning = True
+    model_attributes['conv2d'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+
+    masks, offsets = get_model_masks(model, model_attributes, 0.5, ParameterEstimator, metric='l1', local=local_masking)
+    expected = np.ones((2, 2, 2, 4))
+    expected[..., [1, 3]] = 0
+
+    np.testing.assert_array_equal(masks['conv2d'], expected)
+    assert not np.any(offsets['conv2d'])
+
+
+# Create a Conv2D layer with artificial weights, so that the exact mask of the patterns is known
+# Set pattern offset to 4, which is equivalent to RF = 4 [2 * 2 * 2 * 2 / 4]
+# The patterns are ordered filter by filter, and then by row of the kernel, so every pattern is one row of a filter
+# The first row of the first filter and the second row of the second filter are pruned
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('conv2d', conv2d_layers)
+def test_conv2d_masking_pattern_exact(local_masking, conv2d):
+    model = Sequential()
+    model.add(conv2d(2, input_shape=(4, 4, 2), kernel_size=(2, 2), name='conv2d'))
+    model.add(Flatten())
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.broadcast_to(np.array([[1, 4], [3, 2]]).reshape(2, 1, 1, 2), (2, 2, 2, 2)).copy()
+    weights[0][:, 1, 0, :] *= -1
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['conv2d'].optimizable = True
+    model_attributes['conv2d'].optimization_attributes.pruning = True
+    model_attributes['conv2d'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.PATTERN
+    model_attributes['conv2d'].optimization_attributes.pattern_offset = 4
+    model_attributes['conv2d'].optimization_attributes.consecutive_patterns = 1
+
+    masks, offsets = get_model_masks(model, model_attributes, 0.5, ParameterEstimator, metric='l2', local=local_masking)
+    expected = np.ones((2, 2, 2, 2))
+    expected[0, :, :, 0] = 0
+    expected[1, :, :, 1] = 0
+
+    np.testing.assert_array_equal(masks['conv2d'], expected)
+    assert not np.any(offsets['conv2d'])
+
+
+# Create a Conv2D layer with equal weights, so all the patterns have the same norm
+# Any two patterns (rows of a filter) can be pruned, but every pattern is either pruned or kept as a whole
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('conv2d', conv2d_layers)
+def test_conv2d_masking_pattern_ties(local_masking, conv2d):
+    model = Sequential()
+    model.add(conv2d(2, input_shape=(4, 4, 2), kernel_size=(2, 2), name='conv2d'))
+    model.add(Flatten())
+    model.add(Dense(1, name='out'))
+
+    weights = model.layers[0].get_weights()
+    weights[0] = np.full((2, 2, 2, 2), 0.5)
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['conv2d'].optimizable = True
+    model_attributes['conv2d'].optimization_attributes.pruning = True
+    model_attributes['conv2d'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.PATTERN
+    model_attributes['conv2d'].optimization_attributes.pattern_offset = 4
+    model_attributes['conv2d'].optimization_attributes.consecutive_patterns = 1
+
+    masks, offsets = get_model_masks(model, model_attributes, 0.5, ParameterEstimator, metric='l1', local=local_masking)
+
+    assert np.all(masks['conv2d'] == masks['conv2d'][:, :1, :1, :])
+    assert np.count_nonzero(masks['conv2d'][:, 0, 0, :] == 0) == 2
+    assert not np.any(offsets['conv2d'])
@@ -0,0 +1,77 @@
+import pickle
+
+import numpy as np
+import pytest
+from tensorflow.keras.layers import Dense
+from tensorflow.keras.models import Sequential
+
+from hls4ml.optimization.dsp_aware_pruning.attributes import get_attributes_from_keras_model
+from hls4ml.optimization.dsp_aware_pruning.config import SUPPORTED_STRUCTURES
+from hls4ml.optimization.dsp_aware_pruning.keras.builder import ParallelTrialExecutor, _is_losing, _worker_attributes
+from hls4ml.optimization.dsp_aware_pruning.keras.regularizers import DenseRegularizer
+
+
+def test_median_stopping():
+    # The fourth trial is evaluated, after its first and second epoch
+    scores = np.full((4, 3), np.nan)
+    scores[0, :2] = [0.5, 0.6]
+    scores[1, :1] = [0.7]
+    scores[2, :1] = [0.9]
+
+    scores[3, 0] = 0.6
+    assert _is_losing(scores, 3, 0, increasing=True)
+    assert not _is_losing(scores, 3, 0, increasing=False)
+
+    # Only one other trial reached the second epoch
+    scores[3, 1] = 0.55
+    assert not _is_losing(scores, 3, 1, increasing=True)
+
+
+def test_parallel_tuner():
+    model = Sequential()
+    model.add(Dense(8, input_shape=(4,), activation='relu', name='dense'))
+    model.add(Dense(1, name='out'))
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['dense'].optimizable = True
+    model_attributes['dense'].optimization_attributes.pruning = True
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.UNSTRUCTURED
+
+    X = np.random.rand(256, 4).astype(np.float32)
+    y = np.sum(X, axis=1, keepdims=True)
+
+    executor = ParallelTrialExecutor(
+        model, model_attributes, 'adam', 'mse', 'mse', False, regularization_range=[1e-4, 1e-3], n_jobs=2, max_trials=3
+    )
+    trials = executor.sample_hyperparameters()
+    assert len(trials) == 3
+    assert trials[0] == {'dense_alpha': 1e-3}
+
+    optimizable_model = executor.search((X, y), (X[:64], y[:64]), batch_size=32, epochs=2)
+    assert isinstance(optimizable_model.layers[0].kernel_regularizer, DenseRegularizer)
+    assert optimizable_model.layers[0].kernel_regularizer.alpha in (1e-4, 1e-3)
+
+
+def test_parallel_tuner_no_epochs():
+    model = Sequential()
+    model.add(Dense(1, input_shape=(4,), name='dense'))
+    executor = ParallelTrialExecutor(model, get_attributes_from_keras_model(model), 'adam', 'mse', 'mse', False)
+
+    X = np.random.rand(32, 4).astype(np.float32)
+    y = np.sum(X, axis=1, keepdims=True)
+    with pytest.raises(ValueError):
+        executor.search((X, y), (X, y), batch_size=32, epochs=0)
+
+
+def test_worker_attributes():
+    model = Sequential()
+    model.add(Dense(8, input_shape=(4,), name='dense'))
+    model.add(Dense(1, name='out'))
+    model_attributes = get_attributes_from_keras_model(model)
+
+    # The Keras layers are not pickled to the workers, the attributes of the model are unchanged
+    worker_attributes = _worker_attributes(model_attributes)
+    assert worker_attributes['out'].inbound_layers == []
+    assert worker_attributes['out'].optimization_attributes is model_attributes['out'].optimization_attributes
+    assert model_attributes['out'].inbound_layers == [model.layers[0]]
+    pickle.dumps(worker_attributes)
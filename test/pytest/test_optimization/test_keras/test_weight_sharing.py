@@ -153,3 +153,73 @@ def test_weight_sharing_block(local_masking, dense):
 
     assert not np.any(masks['dense'][frozen[:, 0], frozen[:, 1]])
     assert np.all(offsets['dense'][frozen[:, 0], frozen[:, 1]] == 0.5)
+
+
+# The patterns are ranked by the oracle metric, but the offsets are the mean of the weights (not of the metric)
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('dense', dense_layers)
+def test_weight_sharing_pattern_oracle(local_masking, dense):
+    weight_shape = (3, 4)
+
+    model = Sequential()
+    model.add(dense(weight_shape[1], input_shape=(weight_shape[0],), name='dense'))
+    weights = model.layers[0].get_weights()
+    weights[0] = np.array([[-1.01, 1, -2.02, -2], [-0.99, -3, -1.98, 4], [-1, 2, -2, 0]])
+    model.layers[0].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    model_attributes['dense'].optimizable = True
+    model_attributes['dense'].optimization_attributes.pruning = False
+    model_attributes['dense'].optimization_attributes.weight_sharing = True
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.PATTERN
+    model_attributes['dense'].optimization_attributes.pattern_offset = 4
+    model_attributes['dense'].optimization_attributes.consecutive_patterns = 1
+
+    gradients = {'dense': np.full(weight_shape, 2.0)}
+    masks, offsets = get_model_masks(
+        model,
+        model_attributes,
+        sparsity,
+        MockWeightSharingEstimator,
+        metric='oracle',
+        local=local_masking,
+        gradients=gradients,
+    )
+    expected_offsets = np.zeros(weight_shape)
+    expected_offsets[:, 0] = -1
+    expected_offsets[:, 2] = -2
+
+    np.testing.assert_array_equal(masks['dense'], expected_offsets == 0)
+    np.testing.assert_allclose(offsets['dense'], expected_offsets, rtol=1e-6)
+
+
+# Every layer has one neuron with a low variance, which is shared with the mean of its weights
+# In global masking, the neurons of the second layer are indexed after the ones of the first layer
+@pytest.mark.parametrize('local_masking', local_masking)
+@pytest.mark.parametrize('dense', dense_layers)
+def test_weight_sharing_structured_multi_layer(local_masking, dense):
+    model = Sequential()
+    model.add(dense(2, input_shape=(3,), name='dense1'))
+    model.add(dense(2, name='dense2'))
+    weights = model.layers[0].get_weights()
+    weights[0] = np.array([[-0.9, 1], [-1.1, -2], [-1, 3]])
+    model.layers[0].set_weights(weights)
+    weights = model.layers[1].get_weights()
+    weights[0] = np.array([[2, 0.55], [-2, 0.45]])
+    model.layers[1].set_weights(weights)
+
+    model_attributes = get_attributes_from_keras_model(model)
+    for name in ('dense1', 'dense2'):
+        model_attributes[name].optimizable = True
+        model_attributes[name].optimization_attributes.pruning = False
+        model_attributes[name].optimization_attributes.weight_sharing = True
+        model_attributes[name].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+
+    masks, offsets = get_model_masks(
+        model, model_attributes, 0.5, MockWeightSharingEstimator, metric='l1', local=local_masking
+    )
+
+    np.testing.assert_array_equal(masks['dense1'], [[0, 1], [0, 1], [0, 1]])
+    np.testing.assert_allclose(offsets['dense1'], [[-1, 0], [-1, 0], [-1, 0]], rtol=1e-6)
+    np.testing.assert_array_equal(masks['dense2'], [[1, 0], [1, 0]])
+    np.testing.assert_allclose(offsets['dense2'], [[0, 0.5], [0, 0.5]], rtol=1e-6)
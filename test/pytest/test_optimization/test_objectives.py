@@ -3,7 +3,8 @@ from tensorflow.keras.layers import Conv2D, Dense, Flatten
 from tensorflow.keras.models import Sequential
 
 from hls4ml.optimization.dsp_aware_pruning.attributes import get_attributes_from_keras_model
-from hls4ml.optimization.dsp_aware_pruning.objectives import ParameterEstimator
+from hls4ml.optimization.dsp_aware_pruning.config import SUPPORTED_STRUCTURES
+from hls4ml.optimization.dsp_aware_pruning.objectives import ESTIMATE_CACHE_SIZE, ParameterEstimator, _cached_estimate
 
 
 # Test attempts to verify one of the estimators (parameter) is correctly declared, the functions are static etc.
@@ -55,3 +56,38 @@ def test_parameter_objective():
     assert [1] == ParameterEstimator.layer_savings(model_attributes['conv2d'])
     assert [0] == ParameterEstimator.layer_savings(model_attributes['flatten'])
     assert [1] == ParameterEstimator.layer_savings(model_attributes['dense'])
+
+    # The memoized estimates of a layer with inbound layers match as well
+    assert [conv_filters * np.prod(input_shape) * dense_units] == ParameterEstimator.cached_layer_resources(
+        model_attributes['dense']
+    ).tolist()
+    assert np.all(ParameterEstimator.structure_savings(model_attributes['dense'], 4) == 1)
+
+
+# Test the memoized and vectorized estimates match the estimates of the layer, and follow changes of the attributes
+def test_cached_estimates():
+    model = Sequential()
+    model.add(Dense(6, input_shape=(4,), name='dense'))
+    model_attributes = get_attributes_from_keras_model(model)
+    optimizable, optimization_attributes = ParameterEstimator.is_layer_optimizable(model_attributes['dense'])
+    model_attributes['dense'].optimizable = optimizable
+    model_attributes['dense'].optimization_attributes = optimization_attributes
+
+    assert [24] == ParameterEstimator.cached_layer_resources(model_attributes['dense']).tolist()
+    savings = ParameterEstimator.structure_savings(model_attributes['dense'], 24)
+    assert savings.shape == (1, 24)
+    assert np.all(savings == 1)
+
+    # Savings of structured pruning are recomputed, as the structure type is part of the cache key
+    model_attributes['dense'].optimization_attributes.structure_type = SUPPORTED_STRUCTURES.STRUCTURED
+    savings = ParameterEstimator.structure_savings(model_attributes['dense'], 6)
+    assert savings.shape == (1, 6)
+    assert np.all(savings == 4)
+
+    # The cache is bounded, and its copies of the attributes do not reference the Keras layers
+    _cached_estimate.cache_clear()
+    model_attributes['dense'].inbound_layers = [model.layers[0]]
+    ParameterEstimator.cached_layer_resources(model_attributes['dense'])
+    assert _cached_estimate.cache_info().maxsize == ESTIMATE_CACHE_SIZE
+    assert _cached_estimate.cache_info().currsize == 1
+    assert model_attributes['dense'].inbound_layers == [model.layers[0]]
@@ -984,3 +984,71 @@ def test_einsum_single_input(test_case_id, backend, io_type):
     hls_prediction = np.reshape(hls_model.predict(X_input), pytorch_prediction.shape)
 
     np.testing.assert_allclose(hls_prediction, pytorch_prediction, rtol=1e-2, atol=0.01)
+
+
+class BranchingModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.linear = nn.Linear(8, 4)
+        self.use_relu = True
+
+    def forward(self, x):
+        x = self.linear(x)
+        return torch.relu(x) if self.use_relu else torch.sigmoid(x)
+
+
+def test_parse_cache(test_case_id, monkeypatch):
+    from hls4ml.utils.torch import CustomFXTracer
+
+    traced = []
+    trace = CustomFXTracer.trace
+
+    def counting_trace(self, *args, **kwargs):
+        traced.append(args[0])
+        return trace(self, *args, **kwargs)
+
+    monkeypatch.setattr(CustomFXTracer, 'trace', counting_trace)
+
+    model = nn.Sequential(nn.Linear(8, 4), nn.ReLU())
+    model.eval()
+    output_dir = str(test_root_path / test_case_id)
+
+    # The model is traced once for the config and the conversion
+    config = config_from_pytorch_model(model, (8,))
+    hls_model = convert_from_pytorch_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    assert len(traced) == 1
+    weight = hls_model.graph['_0'].weights['weight'].data
+    assert np.shares_memory(weight, model[0].weight.detach().numpy())
+
+    # Updating the weights invalidates the cache
+    with torch.no_grad():
+        model[0].weight.mul_(2)
+    hls_model = convert_from_pytorch_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    assert len(traced) == 2
+    hls_model.compile()
+
+    X_input = np.random.rand(10, 8)
+    pytorch_prediction = model(torch.Tensor(X_input)).detach().numpy()
+    np.testing.assert_allclose(hls_model.predict(X_input), pytorch_prediction, rtol=1e-2, atol=0.01)
+
+    # The parsing is kept only for the conversion following the config
+    convert_from_pytorch_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    assert len(traced) == 3
+
+    # Changing the input shape, an attribute or the training flag of the model invalidates the kept parsing
+    config_from_pytorch_model(model, (None, 8))
+    config_from_pytorch_model(model, (2, 8))
+    assert len(traced) == 5
+
+    model = BranchingModel()
+    model.eval()
+    config = config_from_pytorch_model(model, (8,))
+    model.use_relu = False
+    hls_model = convert_from_pytorch_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    assert len(traced) == 7
+    assert any(layer.get_attr('activation') == 'sigmoid' for layer in hls_model.get_layers())
+
+    config = config_from_pytorch_model(model, (8,))
+    model.train()
+    convert_from_pytorch_model(model, hls_config=config, output_dir=output_dir, backend='Vivado')
+    assert len(traced) == 9
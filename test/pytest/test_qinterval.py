@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 from quantizers.fixed_point import get_fixed_quantizer_np
 
+from hls4ml.utils import qinterval
 from hls4ml.utils.qinterval import QIntervalArray, einsum, minimal_kif
 
 
@@ -28,13 +29,13 @@ def test_minimal_kif(data):
     assert np.all((data != q(data, k, i - 1, f)) | (data == 0) | (i + f == 0))
 
 
-def random_arr(seed=None):
+def random_arr(seed=None, max_exponent=8, max_int=1024):
     rng = np.random.default_rng(seed)
     shape = (64, 64)
 
-    _delta = 2.0 ** rng.integers(-8, 8, shape)
-    _min = rng.integers(-1024, 1024, shape) * _delta
-    _max = rng.integers(0, 4096, shape) * _delta + _min
+    _delta = 2.0 ** rng.integers(-max_exponent, max_exponent, shape)
+    _min = rng.integers(-max_int, max_int, shape) * _delta
+    _max = rng.integers(0, 4 * max_int, shape) * _delta + _min
     interval_arr = QIntervalArray(_min, _max, _delta)
     return interval_arr
 
@@ -99,3 +100,44 @@ def test_qinterval_to_kif(qint_arr1):
     samples = qint_arr1.sample(10000)
     q = get_fixed_quantizer_np()
     assert np.all(samples == q(samples, k, i, f))
+
+
+def test_qinterval_matmul_chunked(monkeypatch):
+    # The sums of products are exactly representable in double precision (at most 43 significant bits), so the results
+    # do not depend on the order of the additions
+    qint_arr1 = random_arr(seed=1, max_exponent=4, max_int=256)
+    qint_arr2 = random_arr(seed=2, max_exponent=4, max_int=256)
+    const_arr = qint_arr2.sample()
+    reference = [qint_arr1 @ const_arr, qint_arr1 @ qint_arr2, qint_arr1.rmatmul(const_arr)]
+
+    # Force the contracted axis to be split into many chunks
+    monkeypatch.setattr(qinterval, '_MATMUL_CHUNK_SIZE', 64 * 64 * 3)
+    chunked = [qint_arr1 @ const_arr, qint_arr1 @ qint_arr2, qint_arr1.rmatmul(const_arr)]
+
+    for ref, res in zip(reference, chunked):
+        np.testing.assert_array_equal(ref.min, res.min)
+        np.testing.assert_array_equal(ref.max, res.max)
+        np.testing.assert_array_equal(ref.delta, res.delta)
+
+
+@pytest.mark.parametrize('strides', [(1, 1), (2, 3)])
+@pytest.mark.parametrize('dilation', [(1, 1), (2, 1)])
+def test_im2col(strides, dilation):
+    from hls4ml.model.optimizer.passes.bit_exact import im2col
+
+    arr = np.random.rand(9, 8, 3)
+    kernel = np.random.rand(3, 2, 3, 5)
+    (cols,) = im2col(kernel.shape, arr, strides=strides, dilation=dilation)
+
+    # Reference convolution, computed position by position
+    dh, dw = dilation
+    out_h = (arr.shape[0] - dh * (kernel.shape[0] - 1) - 1) // strides[0] + 1
+    out_w = (arr.shape[1] - dw * (kernel.shape[1] - 1) - 1) // strides[1] + 1
+    expected = np.empty((out_h, out_w, kernel.shape[-1]))
+    for h in range(out_h):
+        for w in range(out_w):
+            h0, w0 = h * strides[0], w * strides[1]
+            patch = arr[h0 : h0 + dh * (kernel.shape[0] - 1) + 1 : dh, w0 : w0 + dw * (kernel.shape[1] - 1) + 1 : dw]
+            expected[h, w] = np.tensordot(patch, kernel, axes=3)
+
+    np.testing.assert_allclose(cols @ kernel.reshape(-1, kernel.shape[-1]), expected)
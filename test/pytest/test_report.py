@@ -148,3 +148,56 @@ def test_report(hls_model_setup, capsys):
     captured = capsys.readouterr()  # capture again to test
 
     assert captured.out == backend_config['expected_outcome']
+
+
+@pytest.mark.parametrize('hls_model_setup', ['Vivado', 'oneAPI'], indirect=True)
+def test_report_index(hls_model_setup, tmp_path):
+    """Tests that the report index parses the builds once and re-parses them only when the reports change."""
+    output_dir, backend_config = hls_model_setup
+    other_dir = str(tmp_path / 'other_build')
+    shutil.copytree(output_dir, other_dir)
+
+    expected_report = backend_config['parse_func'](output_dir)
+
+    db_path = str(tmp_path / 'reports.db')
+    with hls4ml.report.ReportIndex(db_path) as index:
+        parsed = index.update([output_dir, other_dir], n_jobs=2)
+        assert len(parsed) == 2 and len(index) == 2
+        assert index.get(output_dir) == expected_report
+        assert index.get(other_dir) == expected_report
+
+    # The index persists and only modified builds are parsed again
+    with hls4ml.report.ReportIndex(db_path) as index:
+        assert index.update([output_dir, other_dir]) == []
+        report_file = next(
+            os.path.join(root, f) for root, _, files in os.walk(other_dir) for f in files if f.endswith(('.xml', '.ndjson'))
+        )
+        stat = os.stat(report_file)
+        os.utime(report_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert index.update([output_dir, other_dir]) == [os.path.abspath(other_dir)]
+
+        index.update([output_dir], prune=True)
+        assert output_dir in index and other_dir not in index
+        assert list(index.reports().values()) == [expected_report]
+
+
+def test_report_index_failed_parse(tmp_path, monkeypatch):
+    """Tests that the builds whose reports failed to parse are not indexed and are parsed again on the next update."""
+    build_dir = str(tmp_path / 'build')
+    os.makedirs(build_dir)
+
+    def failing_parser(hls_dir):
+        raise RuntimeError('Corrupted report')
+
+    with hls4ml.report.ReportIndex(str(tmp_path / 'reports.db')) as index:
+        monkeypatch.setitem(hls4ml.report.report_index._report_parsers, 'vivado', failing_parser)
+        with pytest.warns(UserWarning, match='Failed to parse'):
+            assert index.update([build_dir], backend='Vivado') == []
+        assert build_dir not in index
+
+        monkeypatch.setitem(hls4ml.report.report_index._report_parsers, 'vivado', lambda hls_dir: None)
+        assert index.update([build_dir], backend='Vivado') == [os.path.abspath(build_dir)]
+        assert index.get(build_dir) == {}
+        # Builds without a synthesis report are listed when aggregating
+        with pytest.warns(UserWarning, match='covers only part of the design'):
+            assert index.aggregate([build_dir]) == {'MissingBuilds': [build_dir]}
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import keras
+import numpy as np
+import pytest
+
+import hls4ml
+from hls4ml.report.resource_estimator import ResourceEstimator, estimate_resources
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    model = keras.Sequential(
+        [
+            keras.Input((32,), name='inp'),
+            keras.layers.Dense(16, activation='relu', name='fc1'),
+            keras.layers.Dense(8, name='fc2'),
+            keras.layers.Activation('sigmoid', name='sigmoid'),
+        ]
+    )
+    return model
+
+
+def convert(keras_model, output_dir, strategy='Latency', reuse_factor=1, io_type='io_parallel', weight_bits=16):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend='Vivado')
+    for layer_config in config['LayerName'].values():
+        layer_config['Strategy'] = strategy
+        layer_config['ReuseFactor'] = reuse_factor
+        if isinstance(layer_config['Precision'], dict) and 'weight' in layer_config['Precision']:
+            layer_config['Precision']['weight'] = f'fixed<{weight_bits},6>'
+    return hls4ml.converters.convert_from_keras_model(
+        keras_model, hls_config=config, io_type=io_type, backend='Vivado', output_dir=output_dir
+    )
+
+
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+def test_estimate_trends(keras_model, io_type, test_case_id):
+    output_dir = str(test_root_path / test_case_id)
+    estimates = {
+        rf: estimate_resources(convert(keras_model, output_dir, 'Resource', rf, io_type))['Total'] for rf in [1, 4, 16]
+    }
+    assert estimates[1]['DSP'] == 32 * 16 + 16 * 8
+    assert estimates[1]['DSP'] > estimates[4]['DSP'] > estimates[16]['DSP']
+    assert estimates[1]['Latency'] < estimates[4]['Latency'] < estimates[16]['Latency']
+    assert estimates[16]['II'] >= 16
+
+    # Narrow multiplications are mapped to LUTs
+    narrow = estimate_resources(convert(keras_model, output_dir, 'Latency', 1, io_type, weight_bits=6))
+    assert narrow['Total']['DSP'] == 0
+    assert narrow['Layers']['fc1']['LUT'] > estimates[1]['LUT'] / 4
+    assert set(narrow['Layers']) == {'inp', 'fc1', 'fc1_relu', 'fc2', 'sigmoid'}
+
+
+def test_pruned_weights(keras_model, test_case_id):
+    output_dir = str(test_root_path / test_case_id)
+    dense = estimate_resources(convert(keras_model, output_dir))
+
+    kernel, bias = keras_model.layers[0].get_weights()
+    pruned_kernel = np.where(np.arange(kernel.shape[1]) % 2 == 0, kernel, 0)
+    keras_model.layers[0].set_weights([pruned_kernel, bias])
+    try:
+        pruned = estimate_resources(convert(keras_model, output_dir))
+    finally:
+        keras_model.layers[0].set_weights([kernel, bias])
+
+    # The multiplications by zero are removed by the latency strategy
+    assert pruned['Layers']['fc1']['DSP'] == dense['Layers']['fc1']['DSP'] // 2
+    assert pruned['Layers']['fc2']['DSP'] == dense['Layers']['fc2']['DSP']
+
+
+def test_calibration(keras_model, test_case_id):
+    output_dir = str(test_root_path / test_case_id)
+    models = [convert(keras_model, output_dir, 'Resource', rf) for rf in [1, 2, 4, 8, 16]]
+
+    # Reports of a synthesis that uses twice the estimated LUTs and FFs, plus some fixed overhead
+    estimator = ResourceEstimator()
+    reports = []
+    for model in models:
+        total = estimator.estimate(model)['Total']
+        reports.append(
+            {
+                'CSynthesisReport': {
+                    'DSP': str(total['DSP']),
+                    'LUT': str(2 * total['LUT'] + 500),
+                    'FF': str(2 * total['FF'] + 300),
+                    'WorstLatency': str(total['Latency'] + 5),
+                }
+            }
+        )
+
+    estimator.calibrate(models[:-1], reports[:-1])
+    total = estimator.estimate(models[-1])['Total']
+    report = reports[-1]['CSynthesisReport']
+    for key, report_key in [('DSP', 'DSP'), ('LUT', 'LUT'), ('FF', 'FF'), ('Latency', 'WorstLatency')]:
+        np.testing.assert_allclose(total[key], float(report[report_key]), rtol=0.05)
+    # Nothing was reported for the BRAMs, so their estimate is unchanged
+    assert estimator.coefficients['BRAM_18K'] == ResourceEstimator().coefficients['BRAM_18K']
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import keras
+import pytest
+
+import hls4ml
+from hls4ml.report import estimate_resources
+
+test_root_path = Path(__file__).parent
+
+
+@pytest.fixture(scope='module')
+def keras_model():
+    model = keras.Sequential(
+        [
+            keras.Input((10, 10, 3), name='inp'),
+            keras.layers.Conv2D(8, 3, activation='relu', name='conv1'),
+            keras.layers.Conv2D(8, 3, activation='relu', name='conv2'),
+            keras.layers.Flatten(name='flatten'),
+            keras.layers.Dense(16, name='fc1'),
+            keras.layers.Dense(4, name='fc2'),
+        ]
+    )
+    return model
+
+
+def convert(keras_model, output_dir, io_type, strategy, reuse_factor=1, search=None):
+    config = hls4ml.utils.config_from_keras_model(keras_model, granularity='name', backend='Vivado')
+    config['Model']['Strategy'] = strategy
+    for layer_config in config['LayerName'].values():
+        layer_config['Strategy'] = strategy
+        layer_config['ReuseFactor'] = reuse_factor
+    if search is not None:
+        config['Model']['ReuseFactorSearch'] = search
+    return hls4ml.converters.convert_from_keras_model(
+        keras_model, hls_config=config, io_type=io_type, backend='Vivado', output_dir=output_dir
+    )
+
+
+@pytest.mark.parametrize('strategy', ['Latency', 'Resource'])
+@pytest.mark.parametrize('io_type', ['io_parallel', 'io_stream'])
+def test_reuse_factor_search(keras_model, io_type, strategy, test_case_id):
+    output_dir = str(test_root_path / test_case_id)
+    budget = 600
+    hls_model = convert(keras_model, output_dir, io_type, strategy, search={'Budget': {'DSP': budget}, 'Objective': 'II'})
+    estimate = estimate_resources(hls_model)['Total']
+    assert estimate['DSP'] <= budget
+
+    backend = hls_model.config.backend
+    for layer in hls_model.get_layers():
+        if layer.class_name in ['Conv2D', 'Dense']:
+            assert layer.get_attr('reuse_factor') in backend.get_valid_reuse_factors(*backend.get_layer_mult_size(layer))
+
+    # No uniform reuse factor within the budget is faster
+    for rf in [1, 2, 3, 4, 6, 8, 9, 12, 16, 18, 24, 27, 36]:
+        uniform = estimate_resources(convert(keras_model, output_dir, io_type, strategy, reuse_factor=rf))['Total']
+        if uniform['DSP'] <= budget:
+            assert uniform['II'] >= estimate['II']
+
+
+def test_reuse_factor_search_configure(keras_model, test_case_id):
+    output_dir = str(test_root_path / test_case_id)
+    search = hls4ml.model.optimizer.get_optimizer('vivado:reuse_factor_search')
+    search.configure(budget={'DSP': 600}, objective='Latency')
+    try:
+        hls_model = convert(keras_model, output_dir, 'io_parallel', 'Latency')
+    finally:
+        search.configure(budget=None, objective='II')
+    assert estimate_resources(hls_model)['Total']['DSP'] <= 600
+    assert hls_model.graph['fc1'].get_attr('reuse_factor') > 1
+
+    # Without a budget, the reuse factors are left untouched
+    hls_model = convert(keras_model, output_dir, 'io_parallel', 'Latency')
+    assert all(layer.get_attr('reuse_factor') == 1 for layer in hls_model.get_layers())
+
+
+def test_reuse_factor_search_infeasible(keras_model, test_case_id, capsys):
+    output_dir = str(test_root_path / test_case_id)
+    hls_model = convert(keras_model, output_dir, 'io_parallel', 'Resource', search={'Budget': {'DSP': 1}})
+    assert 'no configuration within the budget' in capsys.readouterr().out
+    # The cheapest configuration is used instead
+    assert hls_model.graph['fc2'].get_attr('reuse_factor') == 16 * 4
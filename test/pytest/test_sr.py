@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 import hls4ml
+from hls4ml.utils.symbolic_utils import evaluate_expression
 
 test_root_path = Path(__file__).parent
 
@@ -41,6 +42,58 @@ def test_hlssr(test_case_id, data):
 
     np.testing.assert_allclose(y, y_hls, rtol=1e-2, atol=1e-2, verbose=True)
 
+    # The NumPy evaluation is bit-accurate
+    y_eval = evaluate_expression(expr, X, precision='ap_fixed<18,6>', lut_functions=lut_functions)
+    np.testing.assert_array_equal(y_hls, y_eval.ravel())
+
+
+@pytest.mark.parametrize('precision', ['ap_fixed<18,6>', 'ap_fixed<12,5,AP_RND,AP_SAT>'])
+@pytest.mark.parametrize('expr_precision', [None, 'ap_fixed<14,6>'])
+def test_common_subexpressions(test_case_id, precision, expr_precision):
+    expr = [
+        '(x0 + x1)**2 + 2.5382*cos_lut(x0 + x1) - 0.5',
+        'x2*(x0 + x1)/3 - cos_lut(x0 + x1)*sin_tab(x2 + 1)',
+        'x0/(x1 + 1.5) - x2/2',
+    ]
+    lut_functions = {
+        'cos_lut': {'math_func': 'cos', 'range_start': -4, 'range_end': 4, 'table_size': 2048},
+        'sin_tab': {'math_func': 'sin', 'range_start': -2, 'range_end': 6, 'table_size': 1000},
+    }
+
+    hls_models = {}
+    for eliminate_subexpressions in [True, False]:
+        hls_models[eliminate_subexpressions] = hls4ml.converters.convert_from_symbolic_expression(
+            expr,
+            n_symbols=3,
+            precision=precision,
+            eliminate_subexpressions=eliminate_subexpressions,
+            expr_precision=expr_precision,
+            output_dir=str(test_root_path / f'{test_case_id}_{eliminate_subexpressions}'),
+            lut_functions=lut_functions,
+            hls_include_path='',
+            hls_libs_path='',
+        )
+        hls_models[eliminate_subexpressions].compile()
+
+    # The sum and its cosine are computed once for all outputs, in variables of full precision unless expr_precision is set
+    expr_layer = hls_models[True].graph['expr1']
+    assert expr_layer.get_attr('cse_definitions') == [('cse_0', 'x0 + x1'), ('cse_1', 'cos_lut(cse_0)')]
+    expr_type = 'auto' if expr_precision is None else 'expr_default_t'
+    assert f'{expr_type} cse_0 = x[0] + x[1];' in expr_layer.get_attr('function_cpp')
+    assert hls_models[False].graph['expr1'].get_attr('cse_definitions') is None
+
+    X = 2 * np.random.rand(1000, 3) - 1
+    y_hls = hls_models[True].predict(X)
+    y_eval = evaluate_expression(expr, X, precision=precision, lut_functions=lut_functions, expr_precision=expr_precision)
+    np.testing.assert_array_equal(y_hls, y_eval)
+    y_inlined = hls_models[False].predict(X)
+    np.testing.assert_array_equal(
+        y_inlined, evaluate_expression(expr, X, precision, lut_functions, eliminate_subexpressions=False)
+    )
+    if expr_precision is None:
+        # Without rounding of the intermediate variables, the outputs do not depend on the elimination
+        np.testing.assert_array_equal(y_hls, y_inlined)
+
 
 def test_pysr_luts(data):
     try:
@@ -127,3 +180,37 @@ def test_sr_backend_config(test_case_id, part, clock_period, clock_unc, compiler
                 unc_ok = True
 
     assert part_ok and period_ok and unc_ok
+
+
+def test_lut_sizing(test_case_id, capsys):
+    max_error = 0.01
+    lut_functions = {'cos_lut': {'math_func': 'cos', 'range_start': -3, 'range_end': 3, 'max_error': max_error}}
+    output_dir = str(test_root_path / test_case_id)
+
+    hls_model = hls4ml.converters.convert_from_symbolic_expression(
+        'cos_lut(x0)',
+        n_symbols=1,
+        precision='ap_fixed<18,6>',
+        output_dir=output_dir,
+        lut_functions=lut_functions,
+        hls_include_path='',
+        hls_libs_path='',
+    )
+    # The range is widened to a power of two and the table is the smallest one within the error bound
+    expr_layer = hls_model.graph['expr1']
+    (lut_fn,) = expr_layer.get_attr('lut_functions')
+    assert (lut_fn.range_start, lut_fn.range_end, lut_fn.table_size) == (-3, 5, 1024)
+    assert expr_layer.get_attr('lut_memory') == 1024 * 18
+    assert 'LUT memory of expr1: 18432 bits' in capsys.readouterr().out
+
+    hls_model.compile()
+
+    X = np.linspace(-3, 3, 1000, endpoint=False).reshape(-1, 1)
+    y_hls = hls_model.predict(X).reshape(-1, 1)
+    np.testing.assert_array_equal(y_hls, evaluate_expression('cos_lut(x0)', X, 'ap_fixed<18,6>', lut_functions))
+    assert np.abs(y_hls - np.cos(X)).max() <= max_error
+
+    # A smaller table exceeds the error bound
+    lut_functions['cos_lut'] = {'math_func': 'cos', 'range_start': -3, 'range_end': 5, 'table_size': 512}
+    y_small = evaluate_expression('cos_lut(x0)', X, 'ap_fixed<18,6>', lut_functions)
+    assert np.abs(y_small - np.cos(X)).max() > max_error
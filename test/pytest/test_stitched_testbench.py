@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hls4ml.utils.fixed_point_codec import FixedPointCodec
+from hls4ml.utils.simulation_utils import prepare_tb_inputs, read_testbench_log, write_tb_inputs, write_verilog_testbench
+
+test_root_path = Path(__file__).parent
+
+precision = {'integer_bits': 3, 'fractional_bits': 5, 'signed': 1, 'rounding_mode': 'RND', 'saturation_mode': 'SAT'}
+
+
+def nn_config(pragma):
+    if pragma == 'stream':
+        return {
+            'inputs': [
+                {'name': 'stream_in', 'pragma': 'stream', 'fifo_depth': 2, 'batch_size': 3, **precision},
+                {'name': 'wide_in', 'pragma': 'stream', 'fifo_depth': 1, 'batch_size': 5, **precision},
+            ],
+            'outputs': [
+                {
+                    'name': 'stream_out',
+                    'pragma': 'stream',
+                    'fifo_depth': 2,
+                    'batch_size': 2,
+                    'axis_bus_width': 48,
+                    'axis_element_width': 24,
+                    **precision,
+                },
+            ],
+        }
+    return {
+        'inputs': [{'name': 'partition_in', 'pragma': 'partition', 'fifo_depth': 1, 'batch_size': 2, **precision}],
+        'outputs': [{'name': 'partition_out', 'pragma': 'partition', 'fifo_depth': 1, 'batch_size': 2, **precision}],
+    }
+
+
+def test_tb_inputs(test_case_id):
+    output_dir = test_root_path / test_case_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    inputs = nn_config('stream')['inputs'] + nn_config('partition')['inputs']
+
+    stream_in = np.array([[0.5, -1, 10, 0, 0, 1 / 64], [1, 1, 1, 2, 2, 2]])
+    wide_in = np.random.uniform(-4, 4, (2, 5))
+    partition_in = np.array([[-4, 1], [0.25, 0]])
+    tb_inputs = prepare_tb_inputs([stream_in, wide_in, partition_in], inputs)
+    assert [data.shape for data in tb_inputs] == [(2, 2, 3), (2, 1, 5), (2, 1, 2)]
+    with pytest.raises(ValueError):
+        prepare_tb_inputs([stream_in, wide_in[:1], partition_in], inputs)
+
+    write_tb_inputs(tb_inputs, inputs, str(output_dir))
+    # One chunk per beat of 24 bits and two per beat of 40 bits (the least significant first), after the marker
+    chunks = np.fromfile(output_dir / 'stream_in_input_data.bin', dtype='>u4')
+    np.testing.assert_array_equal(chunks, [0x686C7334, 0x7FE010, 0x10000, 0x202020, 0x404040])
+    chunks = np.fromfile(output_dir / 'wide_in_input_data.bin', dtype='>u4')[1:].reshape(2, 2).astype(np.uint64)
+    words = chunks[:, 0] | (chunks[:, 1] << np.uint64(32))
+    codec = FixedPointCodec(8, 3, rounding_mode='RND', saturation_mode='SAT')
+    np.testing.assert_array_equal(codec.unpack(words[:, np.newaxis], 5), codec.quantize(wide_in))
+    chunks = np.fromfile(output_dir / 'partition_in_input_data.bin', dtype='>u4')
+    np.testing.assert_array_equal(chunks, [0x686C7334, 0x80, 0x20, 0x08, 0x00])
+
+
+@pytest.mark.parametrize('n_samples', [1, 3])
+@pytest.mark.parametrize('pragma', ['stream', 'partition'])
+def test_read_testbench_log(test_case_id, pragma, n_samples):
+    output_dir = test_root_path / test_case_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log_path = output_dir / 'testbench_log.csv'
+    log_path.write_text('output_name,index,value\nWorstLatency,0,20\nBestLatency,0,12\n')
+    outputs = nn_config(pragma)['outputs']
+    name = outputs[0]['name']
+
+    # The words are written as big-endian 32-bit chunks, the least significant first, after the marker
+    codec = FixedPointCodec(8, 3)
+    expected = np.random.randint(-128, 128, (n_samples, 4)) / 32
+    if pragma == 'stream':
+        words = codec.pack(expected.reshape(-1, 2), 2, element_width=24).ravel()
+        chunks = np.stack([words & np.uint64(0xFFFFFFFF), words >> np.uint64(32)], axis=-1)
+    else:
+        expected = expected[:, :2]
+        chunks = codec.pack(expected.reshape(-1, 1), 1)
+    chunks = np.concatenate([[0x686C7334], chunks.ravel()])
+    chunks.astype('>u4').tofile(output_dir / f'{name}_output_data.bin')
+
+    report = read_testbench_log(str(log_path), outputs, n_samples=n_samples)
+    assert report['BestLatency'] == 12 and report['WorstLatency'] == 20
+    np.testing.assert_array_equal(report['BehavSimResults'], expected[0] if n_samples == 1 else expected)
+
+
+@pytest.mark.parametrize('pragma', ['stream', 'partition'])
+def test_verilog_testbench(test_case_id, pragma):
+    output_dir = test_root_path / test_case_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    testbench_path = output_dir / 'testbench.v'
+    write_verilog_testbench(nn_config(pragma), str(testbench_path), n_samples=3)
+    testbench = testbench_path.read_text()
+
+    assert 'for (n = 0; n < 3; n = n + 1) begin' in testbench
+    assert 'if (done_counter == 3) begin' in testbench
+    if pragma == 'stream':
+        # One chunk per beat of stream_in, two for wide_in and stream_out, and the marker of the inputs
+        assert testbench.count('$fread(chunk, in_file_0)') == 2
+        assert 'wide_in_word[63:32] = chunk;' in testbench
+        assert testbench.count('$fread(chunk, in_file_1)') == 3
+        assert (
+            '$fwrite(out_file_0, "%c%c%c%c", stream_out_word[63:56], stream_out_word[55:48], '
+            'stream_out_word[47:40], stream_out_word[39:32]);' in testbench
+        )
+    else:
+        assert testbench.count('$fread(chunk, in_file_0)') == 3
+        assert testbench.count('$fwrite(out_file_0, "%c%c%c%c", partition_out_word[31:24]') == 2
+    # The marker of the files, checked for the inputs and written first to the outputs
+    assert "if (chunk !== 32'h686C7334) begin" in testbench
+    assert '$fwrite(out_file_0, "%c%c%c%c", chunk[31:24], chunk[23:16], chunk[15:8], chunk[7:0]);' in testbench
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from hls4ml.model.profiling import array_to_summary
+from hls4ml.utils.streaming_stats import Log2Histogram, QuantileSketch, StreamingSummary
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(42)
+    return rng.normal(0, 4, size=200000)
+
+
+def test_quantile_sketch_exact_for_small_inputs():
+    x = np.random.default_rng(0).lognormal(size=100)
+    sketch = QuantileSketch(compression=200)
+    sketch.update(x[:40])
+    sketch.update(x[40:])
+    q = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(sketch.quantile(q), np.quantile(x, q))
+
+
+@pytest.mark.parametrize('n_workers', [1, 4])
+def test_streaming_summary(data, n_workers):
+    # Accumulate in batches on several "workers", then merge
+    summaries = [StreamingSummary() for _ in range(n_workers)]
+    for summary, chunk in zip(summaries, np.array_split(data, n_workers)):
+        for batch in np.array_split(chunk, 10):
+            summary.update(batch)
+    summary = summaries[0]
+    for other in summaries[1:]:
+        summary.merge(other)
+
+    assert len(summary.quantiles.means) <= 2 * summary.quantiles.compression
+
+    y = np.abs(data[data != 0])
+    exact = array_to_summary(y, fmt='boxplot')
+    approx = array_to_summary(summary, fmt='boxplot')
+    assert approx['whislo'] == exact['whislo']
+    assert approx['whishi'] == exact['whishi']
+    for key in ('q1', 'med', 'q3'):
+        assert approx[key] == pytest.approx(exact[key], rel=1e-2)
+
+    hist = summary.summary(fmt='histogram')
+    exponents = np.floor(np.log2(y)).astype(int)
+    low, high = exponents.min(), exponents.max() + 1
+    np.testing.assert_array_equal(hist['b'], np.arange(low - 1, high + 2))
+    expected = np.bincount(exponents - low, minlength=high - low) / len(y)
+    np.testing.assert_allclose(hist['h'][1:-1], expected)
+
+
+@pytest.mark.parametrize(
+    'values, signed, expected',
+    [
+        ([3.9, -4], None, 3),
+        ([4, 0.5], None, 3),
+        ([0.75, 0.1], None, 0),
+        ([0.2], True, -1),
+        ([-1.5, 1.0], False, 1),
+    ],
+)
+def test_integer_bits(values, signed, expected):
+    hist = Log2Histogram()
+    hist.update(values)
+    assert hist.integer_bits(signed=signed) == expected
+
+
+@pytest.mark.parametrize('batch_size', [None, 100])
+def test_activation_summaries(batch_size):
+    torch = pytest.importorskip('torch')
+    from hls4ml.model.profiling import activations_torch
+
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(8, 16), torch.nn.ReLU())
+    X = np.random.default_rng(0).normal(size=(1000, 8)).astype(np.float32)
+    data = activations_torch(model, X, fmt='summary', batch_size=batch_size)
+
+    with torch.no_grad():
+        y = model[0](torch.Tensor(X)).numpy().flatten()
+    exact = array_to_summary(abs(y[y != 0]), fmt='boxplot')
+    assert data[0]['weight'] == 'Linear'
+    if batch_size is None:
+        # Without batches, the summaries are computed exactly from all the activations
+        for key in ('q1', 'med', 'q3', 'whislo', 'whishi'):
+            assert data[0][key] == exact[key]
+    else:
+        for key in ('q1', 'med', 'q3'):
+            assert data[0][key] == pytest.approx(exact[key], rel=1e-2)
@@ -1,8 +1,10 @@
+import numpy as np
 import pytest
 
 from hls4ml.backends.fpga.fpga_backend import FPGABackend
 from hls4ml.backends.fpga.fpga_types import ACFixedPrecisionDefinition, APFixedPrecisionDefinition
 from hls4ml.model.types import (
+    CompressedWeightVariable,
     ExponentPrecisionType,
     FixedPrecisionType,
     FloatPrecisionType,
@@ -10,6 +12,7 @@ from hls4ml.model.types import (
     RoundingMode,
     SaturationMode,
     StandardFloatPrecisionType,
+    WeightVariable,
     XnorPrecisionType,
 )
 
@@ -184,3 +187,35 @@ def test_ac_float_parsing(prec_tuple):
     assert evalprec.integer == integer
     assert evalprec.exponent == exponent
     assert evalprec.rounding_mode == round_mode
+
+
+def test_sparse_weights():
+    """Test the COO representation of the weights and the formatting of sparse weights"""
+    data = np.zeros((300, 4))
+    data[0, 1] = 0.5
+    data[2, 0] = -1.25
+    data[299, 3] = 3.0
+    data[1, 2] = -0.0
+
+    var = WeightVariable('w', 'w_t', FixedPrecisionType(8, 4), data)
+    sparse = var.sparse
+    assert sparse.indices.dtype == np.uint16
+    assert sparse.indices.tolist() == [[0, 1], [2, 0], [299, 3]]
+    assert sparse.values.tolist() == [0.5, -1.25, 3.0]
+    assert sparse.count_nonzero(axis=1).tolist() == [1, 1, 0, 1]
+    np.testing.assert_array_equal(sparse.to_dense(), data)
+
+    formatted = list(var)
+    assert len(formatted) == data.size
+    assert formatted[:9] == ['0.0000', '0.5000', '0.0000', '0.0000', '0.0000', '0.0000', '-0.0000', '0.0000', '-1.2500']
+    assert formatted[-1] == '3.0000'
+
+    var.data = data * 2
+    assert var.sparse.values.tolist() == [1.0, -2.5, 6.0]
+
+    # Padded with the first zeros (in C order) to a multiple of the reuse factor, sorted by column
+    compressed = CompressedWeightVariable('w', 'w_t', FixedPrecisionType(8, 4), data, reuse_factor=2)
+    assert compressed.nonzeros == 4
+    assert compressed.type.index_precision.width == 9
+    assert list(compressed) == ['{0, 0, 0.0000}', '{2, 0, -1.2500}', '{0, 1, 0.5000}', '{299, 3, 3.0000}']
+    assert compressed.sparse.nnz == 3